@@ -0,0 +1,68 @@
+"""
+Compare throughput of the asyncio client against the sync client run from a
+thread pool, for a burst of concurrent JSON.GET requests.
+
+Requires a redis server with RedisJSON loaded.
+
+    python benchmarks/bench_asyncio.py --requests 1000 --workers 64
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import redis
+import redis.asyncio
+from redisplus import Client
+from redisplus.asyncio import Client as AsyncClient
+
+KEY = "bench:asyncio"
+DOC = {"name": "redisplus", "tags": ["a", "b", "c"], "count": 42}
+
+
+def bench_sync(args):
+    c = Client(redis.Redis(host=args.host, port=args.port))
+    c.json.set(KEY, ".", DOC)
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        st = time.perf_counter()
+        results = list(pool.map(lambda _: c.json.get(KEY), range(args.requests)))
+        elapsed = time.perf_counter() - st
+    assert all(r == DOC for r in results)
+    return elapsed
+
+
+async def bench_async(args):
+    pool = redis.asyncio.BlockingConnectionPool(
+        host=args.host, port=args.port, max_connections=args.workers
+    )
+    c = AsyncClient(redis.asyncio.Redis(connection_pool=pool))
+    await c.json.set(KEY, ".", DOC)
+    st = time.perf_counter()
+    results = await asyncio.gather(*(c.json.get(KEY) for _ in range(args.requests)))
+    elapsed = time.perf_counter() - st
+    assert all(r == DOC for r in results)
+    await pool.disconnect()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=64)
+    args = parser.parse_args()
+
+    for name, elapsed in (
+        ("sync, thread pool", bench_sync(args)),
+        ("asyncio", asyncio.run(bench_async(args))),
+    ):
+        print(
+            "{:<20}{:>10.1f} req/s  ({} requests, {} connections)".format(
+                name, args.requests / elapsed, args.requests, args.workers
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Compare round trips and throughput of concurrent JSON.GET, BF.EXISTS and
+TS.ADD requests, sent one by one or coalesced by Client(autopipeline=True).
+
+Requires a redis server with RedisJSON, RedisBloom and RedisTimeSeries loaded.
+
+    python benchmarks/bench_autopipeline.py --requests 10000 --workers 64
+"""
+
+import argparse
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import redis
+from redisplus import Client
+
+KEY = "bench:autopipeline"
+DOC = {"name": "redisplus", "tags": ["a", "b", "c"], "count": 42}
+
+
+def bench(args, autopipeline):
+    c = Client(redis.Redis(host=args.host, port=args.port), autopipeline=autopipeline)
+    c.flushdb()
+    c.json.set(KEY, ".", DOC)
+    c.bf.create(KEY + ":bf", 0.01, 1000)
+    timestamps = itertools.count(1)
+
+    def request(i):
+        if i % 3 == 0:
+            return c.json.get(KEY) == DOC
+        if i % 3 == 1:
+            return c.bf.exists(KEY + ":bf", "item") == 0
+        return c.tf.add(KEY + ":ts", next(timestamps), i) > 0
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        st = time.perf_counter()
+        results = list(pool.map(request, range(args.requests)))
+        elapsed = time.perf_counter() - st
+    assert all(results)
+    if autopipeline:
+        roundtrips = c.autopipeline.batches
+    else:
+        roundtrips = args.requests
+    return elapsed, roundtrips
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=64)
+    args = parser.parse_args()
+
+    for name, autopipeline in (("one by one", False), ("autopipeline", True)):
+        elapsed, roundtrips = bench(args, autopipeline)
+        print(
+            "{:<20}{:>10.1f} req/s {:>8} round trips  ({} workers)".format(
+                name, args.requests / elapsed, roundtrips, args.workers
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Measure the per-call overhead of reaching a module feature through Client.
+
+The "uncached" figures rebuild the feature object on every access, which is
+what every Client property used to do (including installing the module's
+response callbacks on the connection). The "cached" figures go through the
+Client properties. No redis server is needed, nothing is sent over the wire.
+
+    python benchmarks/bench_features.py
+"""
+import importlib
+import timeit
+
+from redisplus import Client
+
+NUMBER = 100000
+
+
+def bench(name, stmt):
+    best = min(timeit.repeat(stmt, number=NUMBER, repeat=5))
+    usec = best / NUMBER * 1e6
+    print("{:<24}{:>10.3f} usec/call".format(name, usec))
+    return usec
+
+
+def main():
+    c = Client()
+    for name in ("json", "tf", "bf", "ft", "graph"):
+        extras_key, module, clsname = c.__featuremap__[name]
+        cls = getattr(importlib.import_module(module), clsname)
+        before = bench(name + " (uncached)", lambda: cls(c.client))
+        after = bench(name + " (cached)", lambda: getattr(c, name))
+        print("{:<24}{:>10.1f}x".format("speedup", before / after))
+
+
+if __name__ == "__main__":
+    main()
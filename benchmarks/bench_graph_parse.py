@@ -0,0 +1,136 @@
+"""
+Measure the rows per second RedisGraph compact result sets are parsed at:
+wide rows of scalars, and deep rows of nodes, edges, arrays and maps. No
+redis server is needed.
+
+With --columnar, compare the time and the peak memory of parsing a result
+set of numbers, booleans and strings into rows of lists, and into columns
+(redisplus.graph.query_result.ColumnarQueryResult).
+
+    python benchmarks/bench_graph_parse.py
+"""
+
+import argparse
+import tracemalloc
+from time import perf_counter
+
+from redis import Redis
+
+from redisplus.graph import Graph
+from redisplus.graph.query_result import ColumnarQueryResult, QueryResult
+
+STATISTICS = [b"Cached execution: 0", b"Query internal execution time: 1 milliseconds"]
+
+SCALARS = [
+    [3, 42],
+    [2, b"redisplus"],
+    [5, b"0.5"],
+    [4, b"true"],
+    [1, None],
+]
+
+
+def graph():
+    """Return a graph whose schema is known, not to be fetched."""
+    g = Graph(Redis(), "bench")
+    g._labels = ["Person", "City"]
+    g._relationshipTypes = ["KNOWS", "LIVES_IN"]
+    g._properties = ["name", "age", "score", "active", "tags"]
+    return g
+
+
+def wide(rows, columns=20):
+    """Return a result set of `rows` rows of `columns` scalars."""
+    header = [[1, "c{}".format(i).encode()] for i in range(columns)]
+    row = [SCALARS[i % len(SCALARS)] for i in range(columns)]
+    return [header, [list(row) for _ in range(rows)], STATISTICS]
+
+
+def node(node_id):
+    return [
+        node_id,
+        [0],
+        [[0, 2, b"ann"], [1, 3, 33], [2, 5, b"0.5"], [3, 4, b"true"]],
+    ]
+
+
+def deep(rows):
+    """Return a result set of `rows` rows of a node, an edge, an array of
+    maps and a path."""
+    edge = [7, 0, 1, 2, [[1, 3, 2020]]]
+    maps = [6, [[10, [b"name", [2, b"x"], b"age", [3, 1]]]] * 3]
+    path = [9, [[6, [[8, node(1)], [8, node(2)]]], [6, [[7, edge]]]]]
+    header = [[1, b"n"], [1, b"e"], [1, b"maps"], [1, b"p"]]
+    row = [[8, node(1)], [7, edge], maps, path]
+    return [header, [list(row) for _ in range(rows)], STATISTICS]
+
+
+def analytics(rows):
+    """Return a result set of `rows` rows of an integer, two doubles (one of
+    them null at times), a boolean and a string."""
+    header = [[1, name] for name in (b"id", b"score", b"ratio", b"active", b"name")]
+    ratio = [5, b"2"]
+    data = [
+        [[3, i], [5, b"0.5"], ratio if i % 10 else [1, None], [4, b"true"], SCALARS[1]]
+        for i in range(rows)
+    ]
+    return [header, data, STATISTICS]
+
+
+def bench(g, response, rows, repeat, result_class=QueryResult):
+    """Return the rows per second `response` is parsed at."""
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        result_class(g, response)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return rows / best
+
+
+def memory(g, response, result_class):
+    """Return the memory, in bytes, held by the result of `response`, and
+    the peak memory of parsing it."""
+    tracemalloc.start()
+    result = result_class(g, response)  # noqa: F841
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held, peak
+
+
+def compare(g, rows, repeat):
+    """Print the time and memory of parsing rows and columns."""
+    response = analytics(rows)
+    print("{:10}{:>14}{:>10}{:>10}".format("result", "rows/sec", "held MB", "peak MB"))
+    for label, result_class in (
+        ("rows", QueryResult),
+        ("columnar", ColumnarQueryResult),
+    ):
+        rate = bench(g, response, rows, repeat, result_class)
+        held, peak = memory(g, response, result_class)
+        print(
+            "{:10}{:14,.0f}{:10,.1f}{:10,.1f}".format(
+                label, rate, held / 2**20, peak / 2**20
+            )
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--columnar", action="store_true")
+    args = parser.parse_args()
+
+    g = graph()
+    if args.columnar:
+        compare(g, args.rows, args.repeat)
+        return
+    print("{:8}{:>14}".format("result", "rows/sec"))
+    for label, build in (("wide", wide), ("deep", deep)):
+        rate = bench(g, build(args.rows), args.rows, args.repeat)
+        print("{:8}{:14,.0f}".format(label, rate))
+
+
+if __name__ == "__main__":
+    main()
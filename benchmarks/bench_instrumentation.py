@@ -0,0 +1,50 @@
+"""
+Measure the per-command overhead of the instrumentation hook.
+
+Commands go through a JSON feature whose client replies immediately, without
+any network round trip, so that the figures are the client-side cost alone:
+with instrumentation disabled (the default), and with an Instrumentation
+recording every stage of every command.
+
+    python benchmarks/bench_instrumentation.py
+"""
+
+import timeit
+
+from redis import Redis
+
+from redisplus import Client
+from redisplus.instrumentation import Instrumentation
+
+NUMBER = 100000
+
+
+class ImmediateRedis(Redis):
+    """Replies to every command at once, through its response callback if
+    it has one."""
+
+    def execute_command(self, *args, **options):
+        callback = self.response_callbacks.get(args[0])
+        if callback is None:
+            return b'{"a": 1}'
+        return callback(b'{"a": 1}', **options)
+
+
+def bench(name, stmt):
+    best = min(timeit.repeat(stmt, number=NUMBER, repeat=5))
+    usec = best / NUMBER * 1e6
+    print("{:<24}{:>10.3f} usec/call".format(name, usec))
+    return usec
+
+
+def main():
+    client = ImmediateRedis()
+    raw = Client(client).json
+    bench("callback only", lambda: client.execute_command("JSON.GET", "k", "."))
+    bench("disabled", lambda: raw.get("k"))
+    enabled = Client(client, instrumentation=Instrumentation()).json
+    bench("enabled", lambda: enabled.get("k"))
+
+
+if __name__ == "__main__":
+    main()
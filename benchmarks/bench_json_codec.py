@@ -0,0 +1,63 @@
+"""
+Compare the JSON codecs documents are encoded and decoded with, on 1KB,
+100KB and 10MB documents. No redis server is needed.
+
+    python benchmarks/bench_json_codec.py
+"""
+
+import argparse
+import timeit
+
+from redisplus.json.codec import OrjsonCodec, StdlibCodec, default_codec
+
+SIZES = {"1KB": 1024, "100KB": 100 * 1024, "10MB": 10 * 1024 * 1024}
+
+
+def document(size):
+    """Return a document of about `size` bytes, once serialized."""
+    item = {
+        "id": 0,
+        "name": "redisplus",
+        "score": 0.5,
+        "active": True,
+        "tags": ["json", "search", "graph"],
+        "nested": {"a": 1, "b": [1, 2, 3], "c": None},
+    }
+    count = max(1, size // len(StdlibCodec().encode(item)))
+    return {"items": [dict(item, id=i) for i in range(count)]}
+
+
+def bench(codec, doc, seconds):
+    """Return the MB/s codec encodes, and decodes, `doc` at."""
+    encoded = codec.encode(doc)
+    raw = encoded.encode() if isinstance(encoded, str) else encoded
+    number = max(1, int(seconds * 1e8 / len(raw) / 10))
+
+    encode = min(timeit.repeat(lambda: codec.encode(doc), number=number, repeat=3))
+    decode = min(timeit.repeat(lambda: codec.decode(raw), number=number, repeat=3))
+    mb = len(raw) * number / 1e6
+    return mb / encode, mb / decode
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=0.2)
+    args = parser.parse_args()
+
+    codecs = [StdlibCodec()]
+    try:
+        codecs.append(OrjsonCodec())
+    except ImportError:
+        print("orjson is not installed, only the standard library is measured")
+    print("default codec: {}".format(default_codec().name))
+
+    print("{:8}{:8}{:>14}{:>14}".format("size", "codec", "encode MB/s", "decode MB/s"))
+    for label, size in SIZES.items():
+        doc = document(size)
+        for codec in codecs:
+            encode, decode = bench(codec, doc, args.seconds)
+            print("{:8}{:8}{:14.1f}{:14.1f}".format(label, codec.name, encode, decode))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Compare the time, and peak memory, JSON.MGET replies are decoded in, as
+dictionaries or built into a schema (see redisplus.json.schema). No redis
+server is needed.
+
+    python benchmarks/bench_json_schema.py
+"""
+
+import argparse
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from time import perf_counter
+from typing import List, Optional
+
+from redis import Redis
+
+from redisplus import Client
+from redisplus.json.codec import OrjsonCodec, StdlibCodec
+
+
+@dataclass
+class Address:
+    city: str
+    zip: Optional[str] = None
+
+
+@dataclass
+class User:
+    id: int
+    name: str
+    score: float
+    active: bool
+    tags: List[str]
+    address: Address
+
+
+class SlottedAddress:
+    __slots__ = ("city", "zip")
+    city: str
+    zip: Optional[str]
+
+
+class SlottedUser:
+    __slots__ = ("id", "name", "score", "active", "tags", "address")
+    id: int
+    name: str
+    score: float
+    active: bool
+    tags: List[str]
+    address: SlottedAddress
+
+
+SCHEMAS = {"dict": None, "dataclass": User, "__slots__": SlottedUser}
+
+if sys.version_info >= (3, 10):
+
+    @dataclass(slots=True)
+    class SlotsAddress:
+        city: str
+        zip: Optional[str] = None
+
+    @dataclass(slots=True)
+    class SlotsUser:
+        id: int
+        name: str
+        score: float
+        active: bool
+        tags: List[str]
+        address: SlotsAddress
+
+    SCHEMAS["dataclass(slots)"] = SlotsUser
+
+
+def replies(count):
+    """Return a JSON.MGET reply of `count` documents."""
+    return [
+        json.dumps(
+            {
+                "id": i,
+                "name": "user{}".format(i),
+                "score": i / 2,
+                "active": True,
+                "tags": ["json", "search"],
+                "address": {"city": "Paris", "zip": "75001"},
+            }
+        ).encode()
+        for i in range(count)
+    ]
+
+
+def bench(feature, schema, count):
+    """Return (seconds, peak MB) to decode `count` documents into `schema`."""
+    raw = replies(count)
+    start = perf_counter()
+    feature._decode_bulk(list(raw), schema)
+    seconds = perf_counter() - start
+
+    reply = list(raw)
+    tracemalloc.start()
+    docs = feature._decode_bulk(reply, schema)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del docs
+    return seconds, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--codec", choices=["json", "orjson"], default="orjson")
+    args = parser.parse_args()
+
+    codec = OrjsonCodec() if args.codec == "orjson" else StdlibCodec()
+    feature = Client(Redis()).feature("json", codec=codec)
+    print("codec: {}, {} documents".format(feature.codec.name, args.count))
+    print("{:18}{:>12}{:>12}".format("schema", "seconds", "peak MB"))
+    for label, schema in SCHEMAS.items():
+        seconds, peak = bench(feature, schema, args.count)
+        print("{:18}{:12.3f}{:12.1f}".format(label, seconds, peak))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Measure the client-side cost of every module's hot path, with no redis server.
+
+Commands are sent to an in-process RESP server (see resp_server.py) that
+replays canned module replies: JSON documents, FT.SEARCH payloads, TS.MRANGE
+responses, compact graph result sets, AI tensor blobs and bloom filter
+replies. For each case, the figures reported are:
+
+    ops_per_sec       end to end, through the local socket
+    build_us          building the command arguments
+    encode_us         packing those arguments as RESP
+    roundtrip_us      sending the command, reading and parsing the RESP reply
+                      (the local server's own time included)
+    decode_us         module level decoding of the reply (callbacks, Result,
+                      QueryResult, tensors...)
+    decode_mb_per_sec reply bytes decoded per second
+    request_bytes, response_bytes
+
+Results are written as JSON, so that releases can be compared:
+
+    python benchmarks/bench_offline.py --number 2000 --output results.json
+"""
+
+import argparse
+import inspect
+import json
+import platform
+import sys
+import time
+import timeit
+
+import numpy as np
+import redis
+from redis.connection import Connection
+
+import redisplus
+from redisplus import Client
+from redisplus.instrumentation import Instrumentation
+from redisplus.json.path import Path
+
+from resp_server import RESPServer
+
+DOC = {
+    "name": "redisplus",
+    "tags": ["json", "search", "timeseries", "graph", "ai", "bloom"],
+    "versions": [
+        {"version": "0.1.{}".format(i), "downloads": i * 1000} for i in range(20)
+    ],
+    "maintainers": {"count": 3, "active": True},
+}
+
+SEARCH_REPLY = [100]
+for i in range(100):
+    SEARCH_REPLY += [
+        b"doc:%d" % i,
+        [
+            b"title",
+            b"document %d" % i,
+            b"body",
+            b"lorem ipsum " * 20,
+            b"views",
+            b"%d" % i,
+        ],
+    ]
+
+MRANGE_REPLY = [
+    [b"series:%d" % s, [], [[t, b"%f" % (t * 0.5)] for t in range(100)]]
+    for s in range(10)
+]
+
+
+def procedure(column, values):
+    """The compact reply to a `CALL db.labels()` like procedure."""
+    return [[[1, column]], [[[2, v]] for v in values], [b"Cached execution: 0"]]
+
+
+GRAPH_ROWS = 200
+GRAPH_REPLY = [
+    [[1, b"p"], [1, b"p.name"], [1, b"p.age"]],
+    [
+        [
+            [8, [i, [0], [[0, 2, b"person %d" % i], [1, 3, i]]]],
+            [2, b"person %d" % i],
+            [3, i],
+        ]
+        for i in range(GRAPH_ROWS)
+    ],
+    [b"Cached execution: 1", b"Query internal execution time: 0.1 milliseconds"],
+]
+
+
+def graph_query(args):
+    query = args[2]
+    if b"db.labels" in query:
+        return procedure(b"label", [b"Person"])
+    if b"db.propertyKeys" in query:
+        return procedure(b"propertyKey", [b"name", b"age"])
+    if b"db.relationshipTypes" in query:
+        return procedure(b"relationshipType", [])
+    return GRAPH_REPLY
+
+
+TENSOR = np.random.rand(128, 128).astype(np.float32)
+TENSOR_REPLY = [b"dtype", b"FLOAT", b"shape", [128, 128], b"blob", TENSOR.tobytes()]
+
+ITEMS = ["item:{}".format(i) for i in range(1000)]
+
+# name -> (canned replies, call)
+CASES = {
+    "json.get": (
+        {"JSON.GET": json.dumps(DOC).encode()},
+        lambda rc: rc.json.get("doc"),
+    ),
+    "json.set": (
+        {"JSON.SET": "OK"},
+        lambda rc: rc.json.set("doc", Path.rootPath(), DOC),
+    ),
+    "ft.search": (
+        {"FT.SEARCH": SEARCH_REPLY},
+        lambda rc: rc.ft.search("document"),
+    ),
+    "ts.mrange": (
+        {"TS.MRANGE": MRANGE_REPLY},
+        lambda rc: rc.tf.mrange(0, 100, ["type=bench"]),
+    ),
+    "graph.query": (
+        {"GRAPH.QUERY": graph_query, "GRAPH.RO_QUERY": graph_query},
+        lambda rc: rc.graph.query("MATCH (p:Person) RETURN p, p.name, p.age"),
+    ),
+    "ai.tensorset": (
+        {"AI.TENSORSET": "OK"},
+        lambda rc: rc.ai.tensorset("tensor", TENSOR),
+    ),
+    "ai.tensorget": (
+        {"AI.TENSORGET": TENSOR_REPLY},
+        lambda rc: rc.ai.tensorget("tensor"),
+    ),
+    "bf.madd": (
+        {"BF.MADD": [1] * len(ITEMS)},
+        lambda rc: rc.bf.madd("filter", *ITEMS),
+    ),
+    "bf.mexists": (
+        {"BF.MEXISTS": [1] * len(ITEMS)},
+        lambda rc: rc.bf.mexists("filter", *ITEMS),
+    ),
+}
+
+
+class Recording(Instrumentation):
+    """Keeps the arguments of the last command sent."""
+
+    def start(self, args):
+        self.args = args
+        return super().start(args)
+
+
+def connect(port):
+    """A redis-py client for the local server, which only speaks RESP2."""
+    kwargs = {"port": port}
+    if "protocol" in inspect.signature(redis.Redis).parameters:
+        kwargs["protocol"] = 2
+    return redis.Redis(**kwargs)
+
+
+def mean(instrumentation, command, stage):
+    histogram = instrumentation.histograms.get((command, stage))
+    if histogram is None or histogram.count == 0:
+        return 0.0
+    return histogram.sum / histogram.count
+
+
+def bench(server, name, number):
+    replies, call = CASES[name]
+    for command, reply in replies.items():
+        server.register(command, reply)
+
+    instrumentation = Recording()
+    rc = Client(connect(server.port), instrumentation=instrumentation)
+    call(rc)  # warm up: connect, load the graph schema...
+    instrumentation.reset()
+
+    st = time.perf_counter()
+    for _ in range(number):
+        call(rc)
+    elapsed = time.perf_counter() - st
+    rc.client.connection_pool.disconnect()
+
+    args = instrumentation.args
+    command = args[0]
+    conn = Connection()
+    encode = min(timeit.repeat(lambda: conn.pack_command(*args), number=100, repeat=5))
+
+    decode = mean(instrumentation, command, "parse_seconds")
+    response_bytes = mean(instrumentation, command, "response_bytes")
+    roundtrip = instrumentation.histograms[command, "roundtrip_seconds"]
+    return {
+        "command": command,
+        "ops_per_sec": number / elapsed,
+        "build_us": mean(instrumentation, command, "build_seconds") * 1e6,
+        "encode_us": encode / 100 * 1e6,
+        "roundtrip_us": mean(instrumentation, command, "roundtrip_seconds") * 1e6,
+        "roundtrip_p99_us": roundtrip.quantile(0.99) * 1e6,
+        "decode_us": decode * 1e6,
+        "decode_mb_per_sec": response_bytes / decode / 1e6 if decode else None,
+        "request_bytes": mean(instrumentation, command, "request_bytes"),
+        "response_bytes": response_bytes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument(
+        "--case", action="append", choices=sorted(CASES), help="default: all"
+    )
+    parser.add_argument("--output", help="write the results there, not stdout")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "redis-py": redis.__version__,
+            "redisplus": redisplus.version(),
+            "number": args.number,
+        },
+        "cases": {},
+    }
+    with RESPServer() as server:
+        for name in args.case or CASES:
+            results["cases"][name] = bench(server, name, args.number)
+
+    out = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
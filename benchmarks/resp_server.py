@@ -0,0 +1,127 @@
+"""
+An in-process RESP server, replaying canned replies.
+
+It speaks just enough of the redis protocol (RESP2) for a redis-py client to
+connect to it and send commands, or pipelines. Each command is answered with
+the reply registered for its name, or +OK when there is none, so that the
+client-side cost of the module commands can be measured on a machine with no
+redis server, or network.
+
+    with RESPServer({"JSON.GET": b'{"a": 1}'}) as server:
+        rc = Client(redis.Redis(port=server.port))
+        rc.json.get("foo")
+"""
+
+import socketserver
+import threading
+
+
+def encode(reply):
+    """Return `reply` encoded as RESP2.
+
+    bytes are sent as bulk strings, str as simple strings, exceptions as
+    errors, and lists (or tuples) as arrays of encoded replies.
+    """
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, Exception):
+        return b"-" + str(reply).encode() + b"\r\n"
+    if isinstance(reply, str):
+        return b"+" + reply.encode() + b"\r\n"
+    if isinstance(reply, bool):
+        reply = int(reply)
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, float):
+        reply = repr(reply).encode()
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    if isinstance(reply, (list, tuple)):
+        return b"*%d\r\n" % len(reply) + b"".join(encode(r) for r in reply)
+    raise TypeError("Cannot encode {!r}".format(reply))
+
+
+def read_command(rfile):
+    """Read one command (a RESP array of bulk strings), None once closed."""
+    line = rfile.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # inline command
+        return line.split()
+    args = []
+    for _ in range(int(line[1:])):
+        size = int(rfile.readline()[1:])
+        args.append(rfile.read(size + 2)[:-2])
+    return args
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        while True:
+            args = read_command(self.rfile)
+            if args is None:
+                return
+            self.wfile.write(self.server.reply(args))
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class RESPServer(object):
+    """
+    Serve canned replies on localhost, from a background thread.
+
+    :param replies: A dictionary of command name (e.g "JSON.GET") to its
+                    reply, or to a function called with the command
+                    arguments (bytes) and returning the reply. Replies are
+                    encoded by `encode`.
+    """
+
+    def __init__(self, replies=None):
+        self.replies = {}
+        self._encoded = {}
+        for command, reply in (replies or {}).items():
+            self.register(command, reply)
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.reply = self.reply
+        self.port = self._server.server_address[1]
+
+    def register(self, command, reply):
+        """Reply to `command` with `reply`, see RESPServer."""
+        command = command.upper().encode()
+        self.replies[command] = reply
+        self._encoded.pop(command, None)
+        if not callable(reply):
+            self._encoded[command] = encode(reply)
+
+    def reply(self, args):
+        """Return the encoded reply to the command `args`."""
+        command = args[0].upper()
+        try:
+            return self._encoded[command]
+        except KeyError:
+            pass
+        reply = self.replies.get(command)
+        if reply is None:
+            return b"+OK\r\n"
+        return encode(reply(args))
+
+    def start(self):
+        thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -1,13 +1,21 @@
 from .client import Client
-import pkg_resources
 
 
 def version():
     try:
-        __version__ = pkg_resources.get_distribution("redisplus").version
-    except pkg_resources.DistributionNotFound:
-        __version__ = "99.99.99"  # developing
-    return __version__
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:  # python < 3.8
+        import pkg_resources
+
+        try:
+            return pkg_resources.get_distribution("redisplus").version
+        except pkg_resources.DistributionNotFound:
+            return "99.99.99"  # developing
+
+    try:
+        return version("redisplus")
+    except PackageNotFoundError:
+        return "99.99.99"  # developing
 
 
 __all__ = ["Client"]
@@ -1,6 +1,8 @@
-from typing import AnyStr, ByteString, List, Sequence, Union
+import sys
+from typing import TYPE_CHECKING, AnyStr, ByteString, List, Sequence, Union
 
-import numpy as np
+if TYPE_CHECKING:
+    import numpy as np
 
 from . import utils
 
@@ -158,10 +160,12 @@ def modelscan() -> Sequence:
 
 def tensorset(
     key: AnyStr,
-    tensor: Union[np.ndarray, list, tuple],
+    tensor: Union["np.ndarray", list, tuple],
     shape: Sequence[int] = None,
     dtype: str = None,
 ) -> Sequence:
+    # a numpy array can only be passed once numpy was imported
+    np = sys.modules.get("numpy")
     if np and isinstance(tensor, np.ndarray):
         dtype, shape, blob = utils.numpy2blob(tensor)
         args = ["AI.TENSORSET", key, dtype, *shape, "BLOB", blob]
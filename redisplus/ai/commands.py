@@ -1,17 +1,50 @@
 """RedisAi commands."""
 
 import warnings
-from deprecated import deprecated
-import numpy as np
-from typing import AnyStr, ByteString, List, Sequence, Union
+from functools import partial
+from typing import TYPE_CHECKING, AnyStr, ByteString, List, Sequence, Union
 
 from .dag import Dag
 from .postprocessor import Processor
 from . import command_builder as builder
+from ..helpers import deprecated
+
+if TYPE_CHECKING:
+    import numpy as np
 
 processor = Processor()
 
 
+class PipelineMixin:
+    """RedisAI commands mixed into the pipelines of AI.pipeline().
+
+    Only the replies of tensorget are processed, whether enable_postprocess
+    is set or not.
+    """
+
+    def tensorget(self, key, as_numpy=True, as_numpy_mutable=False, meta_only=False):
+        args = builder.tensorget(key, as_numpy, meta_only)
+        return self._execute_and_parse(
+            partial(
+                processor.tensorget,
+                as_numpy=as_numpy,
+                as_numpy_mutable=as_numpy_mutable,
+                meta_only=meta_only,
+            ),
+            *args,
+        )
+
+    def tensorset(
+        self,
+        key: AnyStr,
+        tensor: Union["np.ndarray", list, tuple],
+        shape: Sequence[int] = None,
+        dtype: str = None,
+    ) -> str:
+        args = builder.tensorset(key, tensor, shape, dtype)
+        return self.execute_command(*args)
+
+
 class CommandMixin:
     """RedisAi commands."""
 
@@ -29,12 +62,8 @@ class CommandMixin:
         >>> pipe.execute()
         [True, b'OK']
         """
-        return Pipeline(
-            self.enable_postprocess,
-            self.connection_pool,
-            self.response_callbacks,
-            transaction=transaction,
-            shard_hint=shard_hint,
+        return self._pipeline(
+            cls=PipelineMixin, transaction=transaction, shard_hint=shard_hint
         )
 
     def dag(
@@ -88,7 +117,13 @@ class CommandMixin:
         >>> # You can even chain the operations
         >>> result = dag.tensorset(**akwargs).modelrun(**bkwargs).tensorget(**ckwargs).run()
         """
-        return Dag(load, persist, routing, timeout, self.execute_command, readonly)
+        return Dag(load, persist, routing, timeout, self._execute_and_parse, readonly)
+
+    def _execute_and_process(self, process, *args):
+        """Execute a RedisAI command, post processing the reply if enabled."""
+        if not self.enable_postprocess:
+            return self.execute_command(*args)
+        return self._execute_and_parse(process, *args)
 
     def loadbackend(self, identifier: AnyStr, path: AnyStr) -> str:
         """
@@ -114,8 +149,7 @@ class CommandMixin:
         'OK'
         """
         args = builder.loadbackend(identifier, path)
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.loadbackend(res)
+        return self._execute_and_process(processor.loadbackend, *args)
 
     def modelstore(
         self,
@@ -191,8 +225,7 @@ class CommandMixin:
             inputs,
             outputs,
         )
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.modelstore(res)
+        return self._execute_and_process(processor.modelstore, *args)
 
     @deprecated(version="1.2.0", reason="Use modelstore instead")
     def modelset(
@@ -255,8 +288,7 @@ class CommandMixin:
         args = builder.modelset(
             key, backend, device, data, batch, minbatch, tag, inputs, outputs
         )
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.modelset(res)
+        return self._execute_and_process(processor.modelset, *args)
 
     def modelget(self, key: AnyStr, meta_only=False) -> dict:
         """
@@ -282,8 +314,7 @@ class CommandMixin:
         {'backend': 'TF', 'device': 'cpu', 'tag': 'v1.0'}
         """
         args = builder.modelget(key, meta_only)
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.modelget(res)
+        return self._execute_and_process(processor.modelget, *args)
 
     def modeldel(self, key: AnyStr) -> str:
         """
@@ -306,8 +337,7 @@ class CommandMixin:
         'OK'
         """
         args = builder.modeldel(key)
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.modeldel(res)
+        return self._execute_and_process(processor.modeldel, *args)
 
     def modelexecute(
         self,
@@ -356,8 +386,7 @@ class CommandMixin:
         'OK'
         """
         args = builder.modelexecute(key, inputs, outputs, timeout)
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.modelexecute(res)
+        return self._execute_and_process(processor.modelexecute, *args)
 
     @deprecated(version="1.2.0", reason="Use modelexecute instead")
     def modelrun(
@@ -403,8 +432,7 @@ class CommandMixin:
         'OK'
         """
         args = builder.modelrun(key, inputs, outputs)
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.modelrun(res)
+        return self._execute_and_process(processor.modelrun, *args)
 
     def modelscan(self) -> List[List[AnyStr]]:
         """
@@ -429,13 +457,12 @@ class CommandMixin:
             UserWarning,
         )
         args = builder.modelscan()
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.modelscan(res)
+        return self._execute_and_process(processor.modelscan, *args)
 
     def tensorset(
         self,
         key: AnyStr,
-        tensor: Union[np.ndarray, list, tuple],
+        tensor: Union["np.ndarray", list, tuple],
         shape: Sequence[int] = None,
         dtype: str = None,
     ) -> str:
@@ -468,8 +495,7 @@ class CommandMixin:
         'OK'
         """
         args = builder.tensorset(key, tensor, shape, dtype)
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.tensorset(res)
+        return self._execute_and_process(processor.tensorset, *args)
 
     def tensorget(
         self,
@@ -477,7 +503,7 @@ class CommandMixin:
         as_numpy: bool = True,
         as_numpy_mutable: bool = False,
         meta_only: bool = False,
-    ) -> Union[dict, np.ndarray]:
+    ) -> Union[dict, "np.ndarray"]:
         """
         Retrieve the value of a tensor from the server. By default it returns the numpy
         array but it can be controlled using the `as_type` and `meta_only` argument.
@@ -513,11 +539,14 @@ class CommandMixin:
         {'dtype': 'INT64', 'shape': [3]}
         """
         args = builder.tensorget(key, as_numpy, meta_only)
-        res = self.execute_command(*args)
-        return (
-            res
-            if not self.enable_postprocess
-            else processor.tensorget(res, as_numpy, as_numpy_mutable, meta_only)
+        return self._execute_and_process(
+            partial(
+                processor.tensorget,
+                as_numpy=as_numpy,
+                as_numpy_mutable=as_numpy_mutable,
+                meta_only=meta_only,
+            ),
+            *args,
         )
 
     def scriptstore(
@@ -580,8 +609,7 @@ class CommandMixin:
         'OK'
         """
         args = builder.scriptstore(key, device, script, entry_points, tag)
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.scriptstore(res)
+        return self._execute_and_process(processor.scriptstore, *args)
 
     @deprecated(version="1.2.0", reason="Use scriptstore instead")
     def scriptset(
@@ -627,8 +655,7 @@ class CommandMixin:
         'OK'
         """
         args = builder.scriptset(key, device, script, tag)
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.scriptset(res)
+        return self._execute_and_process(processor.scriptset, *args)
 
     def scriptget(self, key: AnyStr, meta_only=False) -> dict:
         """
@@ -653,8 +680,7 @@ class CommandMixin:
         {'device': 'cpu'}
         """
         args = builder.scriptget(key, meta_only)
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.scriptget(res)
+        return self._execute_and_process(processor.scriptget, *args)
 
     def scriptdel(self, key: AnyStr) -> str:
         """
@@ -677,8 +703,7 @@ class CommandMixin:
         'OK'
         """
         args = builder.scriptdel(key)
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.scriptdel(res)
+        return self._execute_and_process(processor.scriptdel, *args)
 
     @deprecated(version="1.2.0", reason="Use scriptexecute instead")
     def scriptrun(
@@ -717,8 +742,7 @@ class CommandMixin:
         'OK'
         """
         args = builder.scriptrun(key, function, inputs, outputs)
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.scriptrun(res)
+        return self._execute_and_process(processor.scriptrun, *args)
 
     def scriptexecute(
         self,
@@ -776,8 +800,7 @@ class CommandMixin:
         args = builder.scriptexecute(
             key, function, keys, inputs, args, outputs, timeout
         )
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.scriptexecute(res)
+        return self._execute_and_process(processor.scriptexecute, *args)
 
     def scriptscan(self) -> List[List[AnyStr]]:
         """
@@ -801,8 +824,7 @@ class CommandMixin:
             UserWarning,
         )
         args = builder.scriptscan()
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.scriptscan(res)
+        return self._execute_and_process(processor.scriptscan, *args)
 
     def infoget(self, key: AnyStr) -> dict:
         """
@@ -832,8 +854,7 @@ class CommandMixin:
         'duration': 0, 'samples': 0, 'calls': 0, 'errors': 0}
         """
         args = builder.infoget(key)
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.infoget(res)
+        return self._execute_and_process(processor.infoget, *args)
 
     def inforeset(self, key: AnyStr) -> str:
         """
@@ -856,5 +877,4 @@ class CommandMixin:
         'OK'
         """
         args = builder.inforeset(key)
-        res = self.execute_command(*args)
-        return res if not self.enable_postprocess else processor.inforeset(res)
+        return self._execute_and_process(processor.inforeset, *args)
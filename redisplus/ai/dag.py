@@ -1,18 +1,26 @@
 from functools import partial
-from typing import Any, AnyStr, List, Sequence, Union
-
-import numpy as np
+from typing import TYPE_CHECKING, Any, AnyStr, List, Sequence, Union
 
 from . import utils
 from . import command_builder as builder
 from .postprocessor import Processor
-from deprecated import deprecated
+from ..helpers import deprecated
 import warnings
 
+if TYPE_CHECKING:
+    import numpy as np
+
 processor = Processor()
 
 
 class Dag:
+    """
+    A RedisAI DAG, executed as a single command.
+
+    ``executor`` is called as ``executor(parse, *command)`` and is expected
+    to return the reply passed through ``parse``.
+    """
+
     def __init__(self, load, persist, routing, timeout, executor, readonly=False):
         self.result_processors = []
         self.enable_postprocess = True
@@ -64,7 +72,7 @@ class Dag:
     def tensorset(
         self,
         key: AnyStr,
-        tensor: Union[np.ndarray, list, tuple],
+        tensor: Union["np.ndarray", list, tuple],
         shape: Sequence[int] = None,
         dtype: str = None,
     ) -> Any:
@@ -157,7 +165,9 @@ class Dag:
 
     def execute(self):
         commands = self.commands[:-1]  # removing the last "|>"
-        results = self.executor(*commands)
+        return self.executor(self._process, *commands)
+
+    def _process(self, results):
         if self.enable_postprocess:
             out = []
             for res, fn in zip(results, self.result_processors):
@@ -1,5 +1,7 @@
-from typing import AnyStr, ByteString, Callable, List, Sequence, Union
-import numpy as np
+from typing import TYPE_CHECKING, AnyStr, ByteString, Callable, List, Sequence, Union
+
+if TYPE_CHECKING:
+    import numpy as np
 
 dtype_dict = {
     "float": "FLOAT",
@@ -20,7 +22,7 @@ allowed_devices = {"CPU", "GPU"}
 allowed_backends = {"TF", "TFLITE", "TORCH", "ONNX"}
 
 
-def numpy2blob(tensor: np.ndarray) -> tuple:
+def numpy2blob(tensor: "np.ndarray") -> tuple:
     """Convert the numpy input from user to `Tensor`."""
     try:
         dtype = dtype_dict[str(tensor.dtype)]
@@ -33,8 +35,10 @@ def numpy2blob(tensor: np.ndarray) -> tuple:
 
 def blob2numpy(
     value: ByteString, shape: Union[list, tuple], dtype: str, mutable: bool
-) -> np.ndarray:
+) -> "np.ndarray":
     """Convert `BLOB` result from RedisAI to `np.ndarray`."""
+    import numpy as np
+
     mm = {"FLOAT": "float32", "DOUBLE": "float64"}
     dtype = mm.get(dtype, dtype.lower())
     if mutable:
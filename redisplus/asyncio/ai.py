@@ -0,0 +1,6 @@
+from .. import ai
+from .feature import AsyncFeatureMixin
+
+
+class AI(AsyncFeatureMixin, ai.AI):
+    """Asyncio client for the RedisAI module."""
@@ -0,0 +1,96 @@
+import asyncio
+
+from redis.exceptions import ResponseError
+
+from ..autopipeline import parse, raw_pipeline
+
+
+class AutoPipeline(object):
+    """
+    Coalesce the commands of concurrent asyncio tasks into shared pipelines.
+
+    Commands issued within the same event loop iteration (or within `window`
+    seconds of the first one) are sent as a single, non transactional
+    pipeline, as soon as the loop gets to it. Each task awaits the reply to
+    its own command, passed through the client's response callbacks, and
+    errors (replied by the server, or raised parsing the reply) are raised
+    in the task whose command failed.
+
+    :param client: The redis.asyncio client commands are sent through.
+    :param window: Seconds a batch waits for more commands, before being sent.
+    :param max_size: The most commands sent in one pipeline, a full batch is
+                     sent without waiting for the window to end.
+    """
+
+    def __init__(self, client, window=0, max_size=1000):
+        self.client = client
+        self.window = window
+        self.max_size = max_size
+
+        # number of pipelines sent, and of commands they held
+        self.batches = 0
+        self.commands = 0
+
+        self._pending = []
+        self._flush_handle = None
+        # the batches in flight, referenced until they are done
+        self._sending = set()
+
+    def execute_command(self, *args, **options):
+        """Queue the command, returning a future of its reply."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((args, options, future))
+
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._flush_handle is None:
+            if self.window:
+                self._flush_handle = loop.call_later(self.window, self._flush)
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+        return future
+
+    def _flush(self):
+        """Send every queued command, in the background."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._pending:
+            batch = self._pending[: self.max_size]
+            del self._pending[: self.max_size]
+            self.batches += 1
+            self.commands += len(batch)
+            task = asyncio.ensure_future(self._send(batch))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch):
+        """Send `batch` as one pipeline, and resolve every future."""
+        try:
+            pipe = raw_pipeline(self.client)
+            for args, options, _ in batch:
+                pipe.execute_command(*args, **options)
+            replies = await pipe.execute(raise_on_error=False)
+        except Exception as e:
+            # e.g a connection error, every command of the batch failed
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (args, options, future), reply in zip(batch, replies):
+            if not future.done():
+                # else the caller was cancelled
+                self._resolve(future, args, options, reply)
+
+    def _resolve(self, future, args, options, reply):
+        """Resolve `future` with the `reply` to `args`, passed through the
+        client's response callback, or with the error it stands for."""
+        if isinstance(reply, ResponseError):
+            future.set_exception(reply)
+            return
+        callback = self.client.response_callbacks.get(args[0])
+        try:
+            future.set_result(parse(callback, reply, options))
+        except Exception as e:
+            future.set_exception(e)
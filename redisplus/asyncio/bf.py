@@ -0,0 +1,22 @@
+from .. import bf
+from .feature import AsyncFeatureMixin
+
+
+class CMSBloom(AsyncFeatureMixin, bf.CMSBloom):
+    """Asyncio client for Count-Min Sketch commands."""
+
+
+class TOPKBloom(AsyncFeatureMixin, bf.TOPKBloom):
+    """Asyncio client for TopK commands."""
+
+
+class CFBloom(AsyncFeatureMixin, bf.CFBloom):
+    """Asyncio client for Cuckoo Filter commands."""
+
+
+class TDigestBloom(AsyncFeatureMixin, bf.TDigestBloom):
+    """Asyncio client for T-Digest commands."""
+
+
+class BFBloom(AsyncFeatureMixin, bf.BFBloom):
+    """Asyncio client for Bloom Filter commands."""
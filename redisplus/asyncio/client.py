@@ -0,0 +1,73 @@
+from typing import Dict, List, Optional, Union
+from redis.asyncio import Redis
+from redis.commands.core import AsyncCoreCommands
+
+from ..client import Client as SyncClient
+from ..instrumentation import Instrumentation
+from .autopipeline import AutoPipeline
+from .feature import PipelineInstrumentation
+from .pipeline import Pipeline
+from .replicas import ReplicaRouter
+
+
+class Client(AsyncCoreCommands, SyncClient):
+    """
+    General client to be used for redis modules, from asyncio code.
+
+    Module commands return awaitables, and run on redis-py's asyncio
+    connection pool.
+    """
+
+    # feature name -> (extras key, module, class name)
+    __featuremap__ = {
+        "json": ("json", "redisplus.asyncio.json", "JSON"),
+        "bf": ("bf", "redisplus.asyncio.bf", "BFBloom"),
+        "cms": ("cms", "redisplus.asyncio.bf", "CMSBloom"),
+        "topk": ("topk", "redisplus.asyncio.bf", "TOPKBloom"),
+        "cf": ("cf", "redisplus.asyncio.bf", "CFBloom"),
+        "tdigest": ("cf", "redisplus.asyncio.bf", "TDigestBloom"),
+        "tf": ("ts", "redisplus.asyncio.ts", "TimeSeries"),
+        "ai": ("ai", "redisplus.asyncio.ai", "AI"),
+        "ft": ("search", "redisplus.asyncio.search", "Search"),
+        "graph": ("graph", "redisplus.asyncio.graph", "Graph"),
+    }
+
+    autopipeline_class = AutoPipeline
+    router_class = ReplicaRouter
+    pipeline_class = Pipeline
+    pipeline_instrumentation = PipelineInstrumentation
+
+    def __init__(
+        self,
+        client: Optional[Redis] = None,
+        extras: Optional[Dict] = {},
+        instrumentation: Optional[Instrumentation] = None,
+        autopipeline: Union[bool, Dict] = False,
+        replicas: Optional[List[Redis]] = None,
+        routing: str = "round_robin",
+    ):
+        """
+        General client to be used for redis modules, from asyncio code.
+
+        :param client: An optional redis.asyncio.Redis. If defined
+                       this client will be used for all redis connections.
+                       If this is not defined, one will be created.
+        :type client: Redis
+        :param instrumentation: An optional Instrumentation, recording the
+                       latency and size of every module command sent.
+        :type instrumentation: Instrumentation
+        :param autopipeline: If set, module commands issued by concurrent
+                       tasks are sent together, as one pipeline. Either True,
+                       or a dictionary of AutoPipeline options.
+        :type autopipeline: bool or dict
+        :param replicas: Optional redis.asyncio clients of replicas of
+                       `client`, read-only module commands are sent to.
+        :type replicas: list
+        :param routing: "round_robin" or "least_outstanding".
+        :type routing: str
+        """
+        if client is None:
+            client = Redis()
+        super().__init__(
+            client, extras, instrumentation, autopipeline, replicas, routing
+        )
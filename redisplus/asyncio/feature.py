@@ -0,0 +1,47 @@
+from time import perf_counter
+
+from ..instrumentation import PipelineInstrumentationMixin
+from .pipeline import Pipeline
+
+
+class PipelineInstrumentation(PipelineInstrumentationMixin):
+    """Mixed into asyncio pipelines built by an instrumented feature."""
+
+    async def execute(self, *args, **kwargs):
+        st = perf_counter()
+        try:
+            return await super().execute(*args, **kwargs)
+        finally:
+            self.instrumentation.observe(
+                "PIPELINE", "roundtrip_seconds", perf_counter() - st
+            )
+
+
+class AsyncFeatureMixin:
+    """Run a module feature over a redis.asyncio client.
+
+    Mixed in ahead of the synchronous feature class, so that the feature's
+    argument builders and response parsers are reused as they are: commands
+    return the client's awaitable, and replies parsed outside of a response
+    callback are awaited first.
+    """
+
+    pipeline_class = Pipeline
+    pipeline_instrumentation = PipelineInstrumentation
+
+    def execute_command(self, *args, **kwargs):
+        """Execute redis command, returning an awaitable."""
+        if self.router is not None and self.router.routes(args):
+            execute = self.router.execute_command
+        elif self.autopipeline is None:
+            execute = self.__client__.execute_command
+        else:
+            execute = self.autopipeline.execute_command
+        execute = self._parsing(execute, args[0])
+        if self.instrumentation is None:
+            return execute(*args, **kwargs)
+        return self.instrumentation.execute_async(execute, args, kwargs)
+
+    async def _parse_reply(self, reply, parse):
+        """Await `reply`, and return it passed through `parse`."""
+        return parse(await reply)
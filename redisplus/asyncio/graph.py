@@ -0,0 +1,170 @@
+from time import perf_counter
+
+from redis.exceptions import ResponseError
+
+from .. import graph
+from ..graph import bulk
+from ..graph.exceptions import VersionMismatchException
+from ..graph.query_result import QueryResult
+from .feature import AsyncFeatureMixin
+
+
+class _SchemaOutOfDate(IndexError):
+    """Raised while parsing a result that refers to an unknown schema entry."""
+
+
+class Graph(AsyncFeatureMixin, graph.Graph):
+    """
+    Asyncio graph, collection of nodes and edges.
+
+    The local view of the graph schema (labels, relationship types and
+    properties) is refreshed with awaited procedure calls whenever a result
+    refers to an entry it does not know yet.
+    """
+
+    async def query(
+        self,
+        q,
+        params=None,
+        timeout=None,
+        read_only=False,
+        profile=False,
+        columnar=False,
+        entities=None,
+    ):
+        """
+        Executes a query against the graph.
+        See `redisplus.graph.commands.CommandMixin.query` for the arguments,
+        results are always parsed at once (there is no `lazy` argument).
+        """
+        command = self._query_command(q, params, timeout, read_only, profile)
+        result_class = self._result_class(profile, False, columnar)
+
+        try:
+            response = await self.execute_command(*command)
+            return await self._query_result(response, profile, result_class, entities)
+        except ResponseError as e:
+            if "wrong number of arguments" in str(e):
+                print("Note: RedisGraph Python requires server version 2.2.8 or above")
+            if "unknown command" in str(e) and read_only:
+                # `GRAPH.RO_QUERY` is unavailable in older versions.
+                return await self.query(
+                    q,
+                    params,
+                    timeout,
+                    read_only=False,
+                    columnar=columnar,
+                    entities=entities,
+                )
+            raise e
+        except VersionMismatchException as e:
+            # client view over the graph schema is out of sync
+            # set client version and refresh local schema
+            self.version = e.version
+            await self._refresh_schema()
+            # re-issue query
+            return await self.query(
+                q, params, timeout, read_only, columnar=columnar, entities=entities
+            )
+
+    async def bulk_create(self, nodes=None, edges=None, batch_size=1000, report=None):
+        """
+        Create `nodes`, then `edges`, in batches of `batch_size`, see
+        redisplus.graph.commands.CommandMixin.bulk_create.
+        """
+        if nodes is None and edges is None:
+            nodes, edges = self.nodes.values(), self.edges
+        if report is None:
+            report = bulk.LoadReport()
+        start = perf_counter()
+        try:
+            for batch in bulk.batches(nodes or (), edges or (), batch_size, report):
+                report.add(batch, await self.query(batch.query, batch.params))
+        finally:
+            report.seconds += perf_counter() - start
+        return report
+
+    async def paginate(
+        self, q, params=None, page_size=10000, timeout=None, read_only=True
+    ):
+        """
+        Yield the records of the query `q`, read in pages of `page_size`,
+        see redisplus.graph.commands.CommandMixin.paginate.
+
+        Each page is parsed at once, as parsing may need to await a refresh
+        of the schema.
+        """
+        if not isinstance(page_size, int) or page_size <= 0:
+            raise ValueError("page_size must be a positive integer")
+        skip = 0
+        while True:
+            page = await self.query(
+                "{} SKIP {} LIMIT {}".format(q, skip, page_size),
+                params,
+                timeout,
+                read_only=read_only,
+            )
+            for record in page.result_set:
+                yield record
+            if len(page.result_set) < page_size:
+                return
+            skip += page_size
+
+    async def _query_result(
+        self, response, profile, result_class=QueryResult, entities=None
+    ):
+        try:
+            return result_class(self, response, profile, entities)
+        except _SchemaOutOfDate:
+            await self._refresh_schema()
+            return result_class(self, response, profile, entities)
+
+    async def commit(self):
+        """
+        Create entire graph.
+        """
+        if len(self.nodes) == 0 and len(self.edges) == 0:
+            return None
+        return await super().commit()
+
+    async def flush(self):
+        """
+        Commit the graph and reset the edges and the nodes to zero length.
+        """
+        await self.commit()
+        self.nodes = {}
+        self.edges = []
+
+    async def labels(self):
+        res = await self.call_procedure("db.labels", read_only=True)
+        return res.result_set
+
+    async def relationshipTypes(self):
+        res = await self.call_procedure("db.relationshipTypes", read_only=True)
+        return res.result_set
+
+    async def propertyKeys(self):
+        res = await self.call_procedure("db.propertyKeys", read_only=True)
+        return res.result_set
+
+    async def _refresh_schema(self):
+        self._clear_schema()
+        self._labels = [lbl[0] for lbl in await self.labels()]
+        self._relationshipTypes = [rel[0] for rel in await self.relationshipTypes()]
+        self._properties = [prop[0] for prop in await self.propertyKeys()]
+
+    def get_label(self, idx):
+        return self._lookup(self._labels, idx)
+
+    def get_relation(self, idx):
+        return self._lookup(self._relationshipTypes, idx)
+
+    def get_property(self, idx):
+        return self._lookup(self._properties, idx)
+
+    @staticmethod
+    def _lookup(entries, idx):
+        try:
+            return entries[idx]
+        except IndexError:
+            raise _SchemaOutOfDate(idx)
@@ -0,0 +1,23 @@
+from .. import json
+from ..json.path import Path, jsonpath
+from .feature import AsyncFeatureMixin
+
+
+class JSON(AsyncFeatureMixin, json.JSON):
+    """Asyncio client for talking to json."""
+
+    async def iter_array(self, name, path=Path.rootPath(), window=1000):
+        """Yield the items of the JSON array under `path` at key `name`,
+        `window` at a time, see redisplus.json.JSON.iter_array."""
+        length = self._single_match(path, await self.arrlen(name, path))
+        if not length:
+            return
+        path = jsonpath(path)
+        for start in range(0, length, window):
+            items = await self.get(
+                name, "{}[{}:{}]".format(path, start, start + window)
+            )
+            if not items:
+                return
+            for item in items:
+                yield item
@@ -0,0 +1,19 @@
+from redis.asyncio.client import Pipeline as RedisPipeline
+
+from ..pipeline import PipelineMixin
+
+
+class Pipeline(PipelineMixin, RedisPipeline):
+    """A redis-py asyncio pipeline, parsing the replies of module commands."""
+
+    async def _parse_reply(self, reply, parse):
+        return parse(await reply)
+
+    async def reset(self):
+        self.postprocessors = []
+        await super().reset()
+
+    async def execute(self, raise_on_error=True):
+        postprocessors = self.postprocessors
+        replies = await super().execute(raise_on_error)
+        return self._postprocess(replies, postprocessors)
@@ -0,0 +1,22 @@
+from ..replicas import FALLBACK_ERRORS, ReplicaRouterMixin
+
+
+class ReplicaRouter(ReplicaRouterMixin):
+    """
+    Send the read-only module commands to replicas, from asyncio code.
+
+    See redisplus.replicas.ReplicaRouter, `primary` and `replicas` being
+    redis.asyncio clients.
+    """
+
+    async def execute_command(self, *args, **options):
+        """Send the read `args` to a replica, or to the primary on failure."""
+        i = self._choose()
+        self.outstanding[i] += 1
+        try:
+            return await self.replicas[i].execute_command(*args, **options)
+        except FALLBACK_ERRORS:
+            self.fallbacks += 1
+            return await self.primary.execute_command(*args, **options)
+        finally:
+            self.outstanding[i] -= 1
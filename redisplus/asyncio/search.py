@@ -0,0 +1,47 @@
+from .. import search
+from .feature import AsyncFeatureMixin
+
+
+class Search(AsyncFeatureMixin, search.Search):
+    """Asyncio client for talking to search."""
+
+    class BatchIndexer(search.Search.BatchIndexer):
+        """
+        A batch indexer allows you to automatically batch
+        document indexing in pipelines, flushing it every N documents.
+
+        Pending documents are not flushed when the indexer is garbage
+        collected, await `commit` once the last document was added.
+        """
+
+        def __del__(self):
+            pass
+
+        async def add_document(self, doc_id, **kwargs):
+            """
+            Add a document to the batch query
+            """
+            self.client._add_document(doc_id, conn=self.pipeline, **kwargs)
+            await self._added()
+
+        async def add_document_hash(self, doc_id, score=1.0, replace=False):
+            """
+            Add a hash to the batch query
+            """
+            self.client._add_document_hash(
+                doc_id, conn=self.pipeline, score=score, replace=replace
+            )
+            await self._added()
+
+        async def _added(self):
+            self.current_chunk += 1
+            self.total += 1
+            if self.current_chunk >= self.chunk_size:
+                await self.commit()
+
+        async def commit(self):
+            """
+            Manually commit and flush the batch indexing query
+            """
+            await self.pipeline.execute()
+            self.current_chunk = 0
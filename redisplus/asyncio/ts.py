@@ -0,0 +1,6 @@
+from .. import ts
+from .feature import AsyncFeatureMixin
+
+
+class TimeSeries(AsyncFeatureMixin, ts.TimeSeries):
+    """Asyncio client for RedisTimeSeries commands."""
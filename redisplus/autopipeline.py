@@ -0,0 +1,145 @@
+import threading
+import time
+
+from redis.client import EMPTY_RESPONSE, NEVER_DECODE
+from redis.exceptions import ResponseError
+
+# options read by redis-py itself, rather than passed to response callbacks
+_READ_OPTIONS = (EMPTY_RESPONSE, NEVER_DECODE, "keys")
+
+
+def parse(callback, reply, options):
+    """Return `reply` passed through the response `callback` (if any) with
+    `options`, as redis-py would."""
+    if callback is None:
+        return reply
+    options = {k: v for k, v in options.items() if k not in _READ_OPTIONS}
+    return callback(reply, **options)
+
+
+def raw_pipeline(client):
+    """Return a non transactional pipeline of `client`, replying without
+    going through the response callbacks."""
+    pipe = client.pipeline(transaction=False)
+    pipe.response_callbacks = {}
+    return pipe
+
+
+class AutoPipeline(object):
+    """
+    Coalesce the commands of concurrent callers into shared pipelines.
+
+    Every caller queues its command, and waits for its reply. Whenever no
+    batch is in flight, one of the callers sends every queued command (up to
+    `max_size`) as a single, non transactional pipeline, and hands each reply
+    back to the thread that issued it. Commands issued while a batch is in
+    flight are therefore sent together, in the next one.
+
+    Replies go through the client's response callbacks, exactly as they would
+    have been without pipelining, each in the thread of its caller: errors,
+    be they replied by the server or raised parsing the reply, are raised in
+    the caller whose command failed.
+
+    :param client: The redis client commands are sent through.
+    :param window: Seconds a batch waits for more commands, before being
+                   sent. The default sends right away, any batching comes
+                   from commands issued while the previous batch is in flight.
+    :param max_size: The most commands sent in one pipeline.
+    :param max_inflight: The most pipelines in flight at once.
+    """
+
+    def __init__(self, client, window=0, max_size=1000, max_inflight=1):
+        self.client = client
+        self.window = window
+        self.max_size = max_size
+        self.max_inflight = max_inflight
+
+        # number of pipelines sent, and of commands they held
+        self.batches = 0
+        self.commands = 0
+
+        self._pending = []
+        self._inflight = 0
+        self._cond = threading.Condition()
+
+    def execute_command(self, *args, **options):
+        """Queue the command, and return its reply once it was sent."""
+        callback = self.client.response_callbacks.get(args[0])
+        request = _Request(args, options, callback)
+        with self._cond:
+            self._pending.append(request)
+            if len(self._pending) >= self.max_size:
+                self._cond.notify_all()
+
+        while True:
+            with self._cond:
+                while not request.done and (
+                    not self._pending or self._inflight >= self.max_inflight
+                ):
+                    self._cond.wait()
+                if request.done:
+                    break
+                self._inflight += 1
+                if self.window:
+                    deadline = time.monotonic() + self.window
+                    while len(self._pending) < self.max_size:
+                        timeout = deadline - time.monotonic()
+                        if timeout <= 0:
+                            break
+                        self._cond.wait(timeout)
+                batch = self._pending[: self.max_size]
+                del self._pending[: self.max_size]
+                self.batches += 1
+                self.commands += len(batch)
+            try:
+                self._send(batch)
+            finally:
+                with self._cond:
+                    self._inflight -= 1
+                    self._cond.notify_all()
+
+        return request.result()
+
+    def _send(self, batch):
+        """Send `batch` as one pipeline, and fill in every request."""
+        try:
+            pipe = raw_pipeline(self.client)
+            for request in batch:
+                pipe.execute_command(*request.args, **request.options)
+            replies = pipe.execute(raise_on_error=False)
+        except BaseException as e:
+            # e.g a connection error, every command of the batch failed
+            for request in batch:
+                request.fail(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        for request, reply in zip(batch, replies):
+            if isinstance(reply, ResponseError):
+                request.fail(reply)
+            else:
+                request.reply = reply
+                request.done = True
+
+
+class _Request(object):
+    """A command queued by an AutoPipeline, and eventually its reply."""
+
+    __slots__ = ("args", "options", "callback", "reply", "error", "done")
+
+    def __init__(self, args, options, callback=None):
+        self.args = args
+        self.options = options
+        self.callback = callback
+        self.reply = None
+        self.error = None
+        self.done = False
+
+    def fail(self, error):
+        self.error = error
+        self.done = True
+
+    def result(self):
+        if self.error is not None:
+            raise self.error
+        return parse(self.callback, self.reply, self.options)
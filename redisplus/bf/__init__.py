@@ -84,92 +84,88 @@ class AbstractBloom(AbstractFeature, object):
 
 
 class CMSBloom(CMSCommandMixin, AbstractBloom):
+    # The module commands' callbacks
+    MODULE_CALLBACKS = {
+        CMS_INITBYDIM: bool_ok,
+        CMS_INITBYPROB: bool_ok,
+        # CMS_INCRBY: spaceHolder,
+        # CMS_QUERY: spaceHolder,
+        CMS_MERGE: bool_ok,
+        CMS_INFO: CMSInfo,
+    }
+
     def __init__(self, client, **kwargs):
         """Create a new RedisBloom client."""
-        # Set the module commands' callbacks
-        MODULE_CALLBACKS = {
-            CMS_INITBYDIM: bool_ok,
-            CMS_INITBYPROB: bool_ok,
-            # CMS_INCRBY: spaceHolder,
-            # CMS_QUERY: spaceHolder,
-            CMS_MERGE: bool_ok,
-            CMS_INFO: CMSInfo,
-        }
-
         self.client = client
         self.commandmixin = CMSCommandMixin
 
-        for k, v in MODULE_CALLBACKS.items():
-            self.client.set_response_callback(k, v)
+        self._install_callbacks(self.MODULE_CALLBACKS)
 
 
 class TOPKBloom(TOPKCommandMixin, AbstractBloom):
+    # The module commands' callbacks
+    MODULE_CALLBACKS = {
+        TOPK_RESERVE: bool_ok,
+        TOPK_ADD: parseToList,
+        TOPK_INCRBY: parseToList,
+        # TOPK_QUERY: spaceHolder,
+        # TOPK_COUNT: spaceHolder,
+        TOPK_LIST: parseToList,
+        TOPK_INFO: TopKInfo,
+    }
+
     def __init__(self, client, **kwargs):
         """Create a new RedisBloom client."""
-        # Set the module commands' callbacks
-        MODULE_CALLBACKS = {
-            TOPK_RESERVE: bool_ok,
-            TOPK_ADD: parseToList,
-            TOPK_INCRBY: parseToList,
-            # TOPK_QUERY: spaceHolder,
-            # TOPK_COUNT: spaceHolder,
-            TOPK_LIST: parseToList,
-            TOPK_INFO: TopKInfo,
-        }
-
         self.client = client
         self.commandmixin = TOPKCommandMixin
 
-        for k, v in MODULE_CALLBACKS.items():
-            self.client.set_response_callback(k, v)
+        self._install_callbacks(self.MODULE_CALLBACKS)
 
 
 class CFBloom(CFCommandMixin, AbstractBloom):
+    # The module commands' callbacks
+    MODULE_CALLBACKS = {
+        CF_RESERVE: bool_ok,
+        # CF_ADD: spaceHolder,
+        # CF_ADDNX: spaceHolder,
+        # CF_INSERT: spaceHolder,
+        # CF_INSERTNX: spaceHolder,
+        # CF_EXISTS: spaceHolder,
+        # CF_DEL: spaceHolder,
+        # CF_COUNT: spaceHolder,
+        # CF_SCANDUMP: spaceHolder,
+        # CF_LOADCHUNK: spaceHolder,
+        CF_INFO: CFInfo,
+    }
+
     def __init__(self, client, **kwargs):
         """Create a new RedisBloom client."""
-        # Set the module commands' callbacks
-        MODULE_CALLBACKS = {
-            CF_RESERVE: bool_ok,
-            # CF_ADD: spaceHolder,
-            # CF_ADDNX: spaceHolder,
-            # CF_INSERT: spaceHolder,
-            # CF_INSERTNX: spaceHolder,
-            # CF_EXISTS: spaceHolder,
-            # CF_DEL: spaceHolder,
-            # CF_COUNT: spaceHolder,
-            # CF_SCANDUMP: spaceHolder,
-            # CF_LOADCHUNK: spaceHolder,
-            CF_INFO: CFInfo,
-        }
-
         self.client = client
         self.commandmixin = CFCommandMixin
 
-        for k, v in MODULE_CALLBACKS.items():
-            self.client.set_response_callback(k, v)
+        self._install_callbacks(self.MODULE_CALLBACKS)
 
 
 class TDigestBloom(TDigestCommandMixin, AbstractBloom):
+    # The module commands' callbacks
+    MODULE_CALLBACKS = {
+        TDIGEST_CREATE: bool_ok,
+        # TDIGEST_RESET: bool_ok,
+        # TDIGEST_ADD: spaceHolder,
+        # TDIGEST_MERGE: spaceHolder,
+        TDIGEST_CDF: float,
+        TDIGEST_QUANTILE: float,
+        TDIGEST_MIN: float,
+        TDIGEST_MAX: float,
+        TDIGEST_INFO: TDigestInfo,
+    }
+
     def __init__(self, client, **kwargs):
         """Create a new RedisBloom client."""
-        # Set the module commands' callbacks
-        MODULE_CALLBACKS = {
-            TDIGEST_CREATE: bool_ok,
-            # TDIGEST_RESET: bool_ok,
-            # TDIGEST_ADD: spaceHolder,
-            # TDIGEST_MERGE: spaceHolder,
-            TDIGEST_CDF: float,
-            TDIGEST_QUANTILE: float,
-            TDIGEST_MIN: float,
-            TDIGEST_MAX: float,
-            TDIGEST_INFO: TDigestInfo,
-        }
-
         self.client = client
         self.commandmixin = TDigestCommandMixin
 
-        for k, v in MODULE_CALLBACKS.items():
-            self.client.set_response_callback(k, v)
+        self._install_callbacks(self.MODULE_CALLBACKS)
 
 
 class BFBloom(BFCommandMixin, AbstractBloom):
@@ -186,23 +182,22 @@ class BFBloom(BFCommandMixin, AbstractBloom):
     - TDIGEST for estimate rank statistics
     """
 
+    # The module commands' callbacks
+    MODULE_CALLBACKS = {
+        BF_RESERVE: bool_ok,
+        # BF_ADD: spaceHolder,
+        # BF_MADD: spaceHolder,
+        # BF_INSERT: spaceHolder,
+        # BF_EXISTS: spaceHolder,
+        # BF_MEXISTS: spaceHolder,
+        # BF_SCANDUMP: spaceHolder,
+        # BF_LOADCHUNK: spaceHolder,
+        BF_INFO: BFInfo,
+    }
+
     def __init__(self, client, **kwargs):
         """Create a new RedisBloom client."""
-        # Set the module commands' callbacks
-        MODULE_CALLBACKS = {
-            BF_RESERVE: bool_ok,
-            # BF_ADD: spaceHolder,
-            # BF_MADD: spaceHolder,
-            # BF_INSERT: spaceHolder,
-            # BF_EXISTS: spaceHolder,
-            # BF_MEXISTS: spaceHolder,
-            # BF_SCANDUMP: spaceHolder,
-            # BF_LOADCHUNK: spaceHolder,
-            BF_INFO: BFInfo,
-        }
-
         self.client = client
         self.commandmixin = BFCommandMixin
 
-        for k, v in MODULE_CALLBACKS.items():
-            self.client.set_response_callback(k, v)
+        self._install_callbacks(self.MODULE_CALLBACKS)
@@ -377,8 +377,10 @@ class TDigestCommandMixin:
     def merge(self, toKey, fromKey):
         """
         Merge all of the values from 'fromKey' to 'toKey' sketch.
+        On a cluster, both keys must hash to the same slot.
         For more information see `TDIGEST.MERGE <https://oss.redis.com/redisbloom/master/TDigest_Commands/#tdigestmerge>`_.
         """
+        self._check_same_slot(TDIGEST_MERGE, toKey, fromKey)
         params = [toKey, fromKey]
         return self.execute_command(TDIGEST_MERGE, *params)
 
@@ -470,8 +472,10 @@ class CMSCommandMixin:
         All sketches must have identical width and depth.
         `Weights` can be used to multiply certain sketches. Default weight is 1.
         Both `srcKeys` and `weights` are lists.
+        On a cluster, `destKey` and `srcKeys` must hash to the same slot.
         For more information see `CMS.MERGE <https://oss.redis.com/redisbloom/master/CountMinSketch_Commands/#cmsmerge>`_.
         """
+        self._check_same_slot(CMS_MERGE, destKey, *srcKeys)
         params = [destKey, numKeys]
         params += srcKeys
         self.appendWeights(params, weights)
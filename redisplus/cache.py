@@ -0,0 +1,464 @@
+import copy
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from redis.cluster import RedisCluster
+
+# the channel tracking invalidations are published to, over RESP2
+INVALIDATE_CHANNEL = "__redis__:invalidate"
+
+
+def _first_key(args):
+    return args[1:2]
+
+
+def _document_keys(args):
+    # FT.GET index doc, FT.MGET index doc...
+    return args[2:]
+
+
+def _mget_keys(args):
+    # JSON.MGET key... path
+    return args[1:-1]
+
+
+# the read-only module commands cached -> function returning their keys, or
+# None for commands that read no key, cached only if entries expire
+CACHEABLE = {
+    "JSON.GET": _first_key,
+    "JSON.MGET": _mget_keys,
+    "JSON.TYPE": _first_key,
+    "JSON.STRLEN": _first_key,
+    "JSON.ARRLEN": _first_key,
+    "JSON.ARRINDEX": _first_key,
+    "JSON.OBJKEYS": _first_key,
+    "JSON.OBJLEN": _first_key,
+    "JSON.RESP": _first_key,
+    "TS.GET": _first_key,
+    "TS.INFO": _first_key,
+    "TS.RANGE": _first_key,
+    "TS.REVRANGE": _first_key,
+    "FT.INFO": None,
+    "FT.GET": _document_keys,
+    "FT.MGET": _document_keys,
+    "FT.SUGGET": _first_key,
+    "FT.SUGLEN": _first_key,
+    "BF.EXISTS": _first_key,
+    "BF.MEXISTS": _first_key,
+    "BF.INFO": _first_key,
+    "CF.EXISTS": _first_key,
+    "CF.COUNT": _first_key,
+    "CF.INFO": _first_key,
+    "CMS.QUERY": _first_key,
+    "CMS.INFO": _first_key,
+    "TOPK.QUERY": _first_key,
+    "TOPK.COUNT": _first_key,
+    "TOPK.LIST": _first_key,
+    "TOPK.INFO": _first_key,
+    "TDIGEST.MIN": _first_key,
+    "TDIGEST.MAX": _first_key,
+    "TDIGEST.QUANTILE": _first_key,
+    "TDIGEST.CDF": _first_key,
+    "TDIGEST.INFO": _first_key,
+}
+
+
+def _second_key(args):
+    # FT.ADD index doc ...
+    return args[2:3]
+
+
+def _first_keys(args):
+    # TS.CREATERULE source destination ...
+    return args[1:3]
+
+
+def _madd_keys(args):
+    # TS.MADD key timestamp value...
+    return args[1::3]
+
+
+def _keys(args):
+    # DEL key...
+    return args[1:]
+
+
+# the commands writing keys whose replies may be cached -> function
+# returning them, see NearCache.drop_written. Other commands (reads not
+# cached, such as FT.SEARCH, or writes of keys never cached) drop nothing:
+# the server's invalidations still cover every key written.
+WRITTEN = {
+    "DEL": _keys,
+    "UNLINK": _keys,
+    "JSON.SET": _first_key,
+    "JSON.DEL": _first_key,
+    "JSON.FORGET": _first_key,
+    "JSON.CLEAR": _first_key,
+    "JSON.TOGGLE": _first_key,
+    "JSON.NUMINCRBY": _first_key,
+    "JSON.NUMMULTBY": _first_key,
+    "JSON.STRAPPEND": _first_key,
+    "JSON.ARRAPPEND": _first_key,
+    "JSON.ARRINSERT": _first_key,
+    "JSON.ARRPOP": _first_key,
+    "JSON.ARRTRIM": _first_key,
+    "TS.CREATE": _first_key,
+    "TS.ALTER": _first_key,
+    "TS.ADD": _first_key,
+    "TS.MADD": _madd_keys,
+    "TS.INCRBY": _first_key,
+    "TS.DECRBY": _first_key,
+    "TS.DEL": _first_key,
+    "TS.CREATERULE": _first_keys,
+    "TS.DELETERULE": _first_keys,
+    "FT.ADD": _second_key,
+    "FT.ADDHASH": _second_key,
+    "FT.DEL": _second_key,
+    "FT.SUGADD": _first_key,
+    "FT.SUGDEL": _first_key,
+    "BF.RESERVE": _first_key,
+    "BF.ADD": _first_key,
+    "BF.MADD": _first_key,
+    "BF.INSERT": _first_key,
+    "BF.LOADCHUNK": _first_key,
+    "CF.RESERVE": _first_key,
+    "CF.ADD": _first_key,
+    "CF.ADDNX": _first_key,
+    "CF.INSERT": _first_key,
+    "CF.INSERTNX": _first_key,
+    "CF.DEL": _first_key,
+    "CF.LOADCHUNK": _first_key,
+    "CMS.INITBYDIM": _first_key,
+    "CMS.INITBYPROB": _first_key,
+    "CMS.INCRBY": _first_key,
+    "CMS.MERGE": _first_key,
+    "TOPK.RESERVE": _first_key,
+    "TOPK.ADD": _first_key,
+    "TOPK.INCRBY": _first_key,
+    "TDIGEST.CREATE": _first_key,
+    "TDIGEST.RESET": _first_key,
+    "TDIGEST.ADD": _first_key,
+    "TDIGEST.MERGE": _first_key,
+}
+
+# replies returned as they are, rather than copied
+_IMMUTABLE = (str, bytes, int, float, type(None))
+
+
+def _copy(reply):
+    return reply if isinstance(reply, _IMMUTABLE) else copy.deepcopy(reply)
+
+
+def _encoded(key):
+    if isinstance(key, bytes):
+        return key
+    return str(key).encode()
+
+
+def sizeof(value):
+    """Return an estimate of the memory held by `value`, in bytes."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(sizeof(v) for v in value)
+    elif hasattr(value, "__dict__"):
+        size += sizeof(vars(value))
+    return size
+
+
+class NearCache(object):
+    """
+    Keep the replies to read-only module commands in memory, until the keys
+    they read are modified.
+
+    Replies are cached by command and arguments, and evicted least recently
+    used first, once there are more than `max_entries` of them, or they hold
+    more than `max_bytes` (estimated by `sizeof`).
+
+    Invalidations come from the server: a dedicated connection enables
+    `CLIENT TRACKING` in broadcasting mode, for the keys starting with one
+    of `prefixes`, redirected to itself, and listens to the invalidation
+    messages from a background thread. Replies reading any key modified (by
+    any client) are dropped. Should the
+    connection be lost, the cache is emptied and bypassed until tracking is
+    enabled again.
+
+    Writes sent by the features of the client (or by the pipelines they
+    build) drop the replies reading the keys written once they are done,
+    without waiting for the server, see WRITTEN.
+
+    Cached replies are shared by every caller, which must treat them as
+    read-only, unless `copy` is set: they are then copied (which is costly
+    for large documents), and every caller is free to change the one it
+    gets.
+
+    :param client: The redis client invalidations are tracked on.
+    :param max_entries: The most replies kept.
+    :param max_bytes: The most memory replies may hold.
+    :param ttl: Seconds after which replies expire, None to keep them until
+                invalidated. Commands that read no key (e.g FT.INFO) are only
+                cached once set. Set it too when reads are sent to replicas,
+                which may serve a value that was already invalidated.
+    :param prefixes: The prefixes of the keys tracked, required: the server
+                     sends an invalidation for every key written starting
+                     with one of them, read or not. Only replies reading
+                     such keys may be cached. The empty prefix tracks every
+                     key, at the cost of a message for every write.
+    :param commands: The commands cached, see CACHEABLE.
+    :param copy: Hand every caller its own copy of the replies cached.
+    """
+
+    def __init__(
+        self,
+        client,
+        max_entries=10000,
+        max_bytes=64 * 1024 * 1024,
+        ttl=None,
+        prefixes=(),
+        commands=CACHEABLE,
+        copy=False,
+    ):
+        if isinstance(client, RedisCluster):
+            raise ValueError("NearCache does not support RedisCluster")
+        if not prefixes:
+            raise ValueError("NearCache needs the prefixes of the keys tracked")
+        self.client = client
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.prefixes = list(prefixes)
+        self._prefixes = tuple(_encoded(p) for p in self.prefixes)
+        self.commands = commands
+        self.copy = copy
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        # memory held by the replies cached, see sizeof
+        self.bytes = 0
+
+        # cache key -> (reply, size, keys, expiry)
+        self._entries = OrderedDict()
+        # redis key -> cache keys of the replies reading it, fetched or not
+        self._index = {}
+        # cache key -> keys, of the replies being fetched, dropped if
+        # invalidated meanwhile
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._tracking = False
+        self._closed = False
+        self._conn = None
+        self._start()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def execute(self, execute_command, args, kwargs):
+        """Return the reply to `args`, from the cache when possible, from
+        `execute_command` otherwise."""
+        if args[0] in WRITTEN:
+            try:
+                return execute_command(*args, **kwargs)
+            finally:
+                self.drop_written([args])
+        key = self._key(args, kwargs)
+        if key is None:
+            return execute_command(*args, **kwargs)
+        with self._lock:
+            hit, found = self._lookup(key)
+        if hit:
+            return _copy(found) if self.copy else found
+        if found is None:
+            # already being fetched, by another thread
+            return execute_command(*args, **kwargs)
+
+        keys = found
+        try:
+            reply = execute_command(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                if self._pending.get(key) is keys:
+                    del self._pending[key]
+                    self._unindex(key, keys)
+            raise
+        self._store(key, reply, keys)
+        return reply
+
+    def _key(self, args, kwargs):
+        """Return the cache key of the command `args`, None if uncached."""
+        if not self._tracking or args[0] not in self.commands:
+            return None
+        keys = self.commands[args[0]]
+        if keys is None and self.ttl is None:
+            return None
+        if keys is not None and not self._tracked(keys(args)):
+            # never invalidated by the server
+            return None
+        key = (args, frozenset(kwargs.items()))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _tracked(self, keys):
+        """Tell whether every one of `keys` starts with a prefix tracked."""
+        return all(_encoded(k).startswith(self._prefixes) for k in keys)
+
+    def _lookup(self, key):
+        """Return (True, reply) if `key` is cached. Otherwise, (False, the
+        keys it reads) once it is registered as being fetched, or (False,
+        None) if it already was. The lock held."""
+        entry = self._entries.get(key)
+        if entry is not None and (entry[3] is None or entry[3] > time.monotonic()):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+        self.misses += 1
+        if entry is not None:
+            self._drop(key)
+        if key in self._pending:
+            return False, None
+
+        args = key[0]
+        keys = self.commands[args[0]]
+        keys = [] if keys is None else [_encoded(k) for k in keys(args)]
+        self._pending[key] = keys
+        for k in keys:
+            self._index.setdefault(k, set()).add(key)
+        return False, keys
+
+    def _store(self, key, reply, keys):
+        if self.copy:
+            # the caller is handed `reply`, and may change it
+            reply = _copy(reply)
+        size = sizeof(reply)
+        with self._lock:
+            if self._pending.get(key) is not keys:
+                # invalidated, or the cache emptied, while being fetched
+                return
+            del self._pending[key]
+            if size > self.max_bytes:
+                self._unindex(key, keys)
+                return
+            expiry = None if self.ttl is None else time.monotonic() + self.ttl
+            self._entries[key] = (reply, size, keys, expiry)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        """Forget the cached reply `key`, the lock held."""
+        _, size, keys, _ = self._entries.pop(key)
+        self.bytes -= size
+        self._unindex(key, keys)
+
+    def _unindex(self, key, keys):
+        for k in keys:
+            cached = self._index.get(k)
+            if cached is not None:
+                cached.discard(key)
+                if not cached:
+                    del self._index[k]
+
+    def invalidate(self, keys=None):
+        """Drop the replies reading any of `keys`, every reply if None."""
+        with self._lock:
+            if keys is None:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                self._index.clear()
+                self._pending.clear()
+                self.bytes = 0
+                return
+            for k in keys:
+                for key in self._index.pop(_encoded(k), ()):
+                    fetching = self._pending.pop(key, None)
+                    if fetching is not None:
+                        self._unindex(key, fetching)
+                    elif key in self._entries:
+                        self._drop(key)
+                        self.invalidations += 1
+
+    def drop_written(self, commands):
+        """Drop the replies reading the keys the `commands` (their argument
+        tuples) may have written, see WRITTEN."""
+        keys = []
+        for args in commands:
+            written = WRITTEN.get(args[0])
+            if written is not None:
+                keys += written(args)
+        if keys:
+            self.invalidate(keys)
+
+    def clear(self):
+        """Drop every cached reply."""
+        self.invalidate(None)
+
+    def close(self):
+        """Stop tracking invalidations, and empty the cache."""
+        self._closed = True
+        self._tracking = False
+        if self._conn is not None:
+            self._conn.disconnect()
+        self.clear()
+
+    def _start(self):
+        self._conn = self._connect()
+        self._tracking = True
+        thread = threading.Thread(target=self._listen, daemon=True)
+        thread.start()
+
+    def _connect(self):
+        """Return a new connection, receiving the invalidation messages."""
+        pool = self.client.connection_pool
+        kwargs = dict(pool.connection_kwargs, socket_timeout=None)
+        if "protocol" in kwargs:
+            # invalidations are read as pubsub messages
+            kwargs["protocol"] = 2
+        conn = pool.connection_class(**kwargs)
+        try:
+            conn.connect()
+            conn.send_command("CLIENT", "ID")
+            client_id = conn.read_response()
+            command = ["CLIENT", "TRACKING", "ON", "REDIRECT", client_id, "BCAST"]
+            for prefix in self.prefixes:
+                command += ["PREFIX", prefix]
+            conn.send_command(*command)
+            conn.read_response()
+            conn.send_command("SUBSCRIBE", INVALIDATE_CHANNEL)
+            conn.read_response()
+        except BaseException:
+            conn.disconnect()
+            raise
+        return conn
+
+    def _listen(self):
+        """Apply the invalidation messages, reconnecting when needed."""
+        backoff = 0.1
+        while not self._closed:
+            conn = self._conn
+            try:
+                if conn is None:
+                    conn = self._conn = self._connect()
+                    self._tracking = True
+                    backoff = 0.1
+                while True:
+                    message = conn.read_response()
+                    if _encoded(message[0]) == b"message":
+                        self.invalidate(message[2])
+            except Exception:
+                self._tracking = False
+                self._conn = None
+                if conn is not None:
+                    conn.disconnect()
+                # invalidations may have been missed meanwhile
+                self.clear()
+                if not self._closed:
+                    time.sleep(backoff)
+                    backoff = min(backoff * 2, 5)
@@ -1,7 +1,14 @@
-from typing import Dict, Optional
+import importlib
+from typing import Dict, List, Optional, Union
 from redis.client import Redis
 from redis.commands import Commands
 
+from .autopipeline import AutoPipeline
+from .cache import NearCache
+from .instrumentation import Instrumentation, PipelineInstrumentationMixin
+from .pipeline import Pipeline, composed
+from .replicas import ReplicaRouter
+
 
 class Client(Commands, object):
     """General client to be used for redis modules."""
@@ -9,10 +16,39 @@ class Client(Commands, object):
     # list of active commands
     __commands__ = []
 
+    # feature name -> (extras key, module, class name)
+    __featuremap__ = {
+        "json": ("json", "redisplus.json", "JSON"),
+        "bf": ("bf", "redisplus.bf", "BFBloom"),
+        "cms": ("cms", "redisplus.bf", "CMSBloom"),
+        "topk": ("topk", "redisplus.bf", "TOPKBloom"),
+        "cf": ("cf", "redisplus.bf", "CFBloom"),
+        "tdigest": ("cf", "redisplus.bf", "TDigestBloom"),
+        "tf": ("ts", "redisplus.ts", "TimeSeries"),
+        "ai": ("ai", "redisplus.ai", "AI"),
+        "ft": ("search", "redisplus.search", "Search"),
+        "graph": ("graph", "redisplus.graph", "Graph"),
+    }
+
+    # coalesces the module commands of concurrent callers, see autopipeline
+    autopipeline_class = AutoPipeline
+    # sends reads to replicas, see replicas
+    router_class = ReplicaRouter
+    # keeps the replies to reads, see cache
+    cache_class = NearCache
+    # the pipelines returned by pipeline(), see redisplus.pipeline
+    pipeline_class = Pipeline
+    pipeline_instrumentation = PipelineInstrumentationMixin
+
     def __init__(
         self,
         client: Optional[Redis] = None,
         extras: Optional[Dict] = {},
+        instrumentation: Optional[Instrumentation] = None,
+        autopipeline: Union[bool, Dict] = False,
+        replicas: Optional[List[Redis]] = None,
+        routing: str = "round_robin",
+        cache: Union[bool, Dict] = False,
     ):
         """
         General client to be used for redis modules.
@@ -21,12 +57,55 @@ class Client(Commands, object):
                        this client will be used for all redis connections.
                        If this is not defined, one will be created.
         :type client: Redis
+        :param instrumentation: An optional Instrumentation, recording the
+                       latency and size of every module command sent.
+        :type instrumentation: Instrumentation
+        :param autopipeline: If set, module commands issued concurrently are
+                       sent together, as one pipeline. Either True, or a
+                       dictionary of AutoPipeline options (e.g window,
+                       max_size).
+        :type autopipeline: bool or dict
+        :param replicas: Optional redis clients of replicas of `client`. If
+                       set, read-only module commands (e.g JSON.GET,
+                       FT.SEARCH, TS.MRANGE) are balanced across them, and
+                       sent to `client` if a replica fails. Pipelines always
+                       run on `client`.
+        :type replicas: list
+        :param routing: How reads are balanced across replicas, either
+                       "round_robin" or "least_outstanding" (to the replica
+                       with the fewest commands in flight).
+        :type routing: str
+        :param cache: If set, the replies to read-only module commands
+                       (e.g JSON.GET, TS.INFO, BF.EXISTS) are kept in memory,
+                       until the server reports the keys they read were
+                       modified. A dictionary of NearCache options: the
+                       prefixes of the keys tracked, required, and e.g
+                       max_entries, max_bytes, ttl. Cached replies are
+                       shared, and must not be changed, unless the copy
+                       option is set.
+        :type cache: dict
         """
         if client is None:
             client = Redis()
         self.client = client
+        self.instrumentation = instrumentation
+        if autopipeline:
+            options = autopipeline if isinstance(autopipeline, dict) else {}
+            self.autopipeline = self.autopipeline_class(client, **options)
+        else:
+            self.autopipeline = None
+        if replicas:
+            self.router = self.router_class(client, replicas, routing)
+        else:
+            self.router = None
+        if cache:
+            options = cache if isinstance(cache, dict) else {}
+            self.cache = self.cache_class(client, **options)
+        else:
+            self.cache = None
 
         self.__extras__ = extras
+        self.__features__ = {}
 
     @property
     def __client__(self):
@@ -34,90 +113,125 @@ class Client(Commands, object):
         used for this connection. This is not public."""
         return self.client
 
+    def feature(self, name, **kwargs):
+        """
+        Return the feature `name` (e.g json, ft, graph), built with `kwargs`.
+
+        Features are built once per client and set of kwargs, and the
+        same object is returned on every subsequent call. If no kwargs are
+        passed, the ones given in `extras` at construction time are used.
+        Features built with unhashable kwargs are not cached.
+        """
+        if kwargs:
+            try:
+                key = (name, frozenset(kwargs.items()))
+                hash(key)
+            except TypeError:
+                key = None
+        else:
+            key = name
+
+        try:
+            return self.__features__[key]
+        except KeyError:
+            pass
+
+        try:
+            extras_key, module, clsname = self.__featuremap__[name]
+        except KeyError:
+            raise AttributeError("Unknown feature {}".format(name))
+        if not kwargs:
+            kwargs = self.__extras__.get(extras_key, {})
+        cls = getattr(importlib.import_module(module), clsname)
+
+        feature = self._attach(cls(self.client, **kwargs))
+        if key is not None:
+            self.__features__[key] = feature
+        return feature
+
+    def _attach(self, feature):
+        """Return `feature`, sharing the client's instrumentation,
+        autopipeline, replicas and near cache, those set."""
+        if self.instrumentation is not None:
+            feature.instrument(self.instrumentation)
+        if self.autopipeline is not None:
+            feature.autopipeline = self.autopipeline
+        if self.router is not None:
+            feature.router = self.router
+        if self.cache is not None:
+            feature.cache = self.cache
+        return feature
+
     @property
     def json(self):
         """For running json commands."""
-        kwargs = self.__extras__.get("json", {})
-        import redisplus.json
-
-        return redisplus.json.JSON(self.client, **kwargs)
+        return self.feature("json")
 
     @property
     def bf(self):
         """For running bloom commands."""
-        import redisplus.bf
-
-        kwargs = self.__extras__.get("bf", {})
-        return redisplus.bf.BFBloom(self.client, **kwargs)
+        return self.feature("bf")
 
     @property
     def cms(self):
         """For running bloom commands."""
-        import redisplus.bf
-
-        kwargs = self.__extras__.get("cms", {})
-        return redisplus.bf.CMSBloom(self.client, **kwargs)
+        return self.feature("cms")
 
     @property
     def topk(self):
         """For running bloom commands."""
-        import redisplus.bf
-
-        kwargs = self.__extras__.get("topk", {})
-        return redisplus.bf.TOPKBloom(self.client, **kwargs)
+        return self.feature("topk")
 
     @property
     def cf(self):
         """For running bloom commands."""
-        import redisplus.bf
-
-        kwargs = self.__extras__.get("cf", {})
-        return redisplus.bf.CFBloom(self.client, **kwargs)
+        return self.feature("cf")
 
     @property
     def tdigest(self):
         """For running bloom commands."""
-        import redisplus.bf
-
-        kwargs = self.__extras__.get("cf", {})
-        return redisplus.bf.TDigestBloom(self.client, **kwargs)
+        return self.feature("tdigest")
 
     @property
     def tf(self):
         """For running timeseries commands."""
-        kwargs = self.__extras__.get("ts", {})
-        import redisplus.ts
-
-        return redisplus.ts.TimeSeries(self.client, **kwargs)
+        return self.feature("tf")
 
     @property
     def ai(self):
         """For running ai commands."""
-        kwargs = self.__extras__.get("ai", {})
-        import redisplus.ai
-
-        return redisplus.ai.AI(self.client, **kwargs)
+        return self.feature("ai")
 
     @property
     def ft(self):
         """For running search commands."""
-        kwargs = self.__extras__.get("search", {})
-        import redisplus.search
-
-        return redisplus.search.Search(self.client, **kwargs)
+        return self.feature("ft")
 
     @property
     def graph(self):
         """For running graph commands."""
-        kwargs = self.__extras__.get("graph", {})
-        import redisplus.graph
-
-        return redisplus.graph.Graph(self.client, **kwargs)
+        return self.feature("graph")
 
     def execute_command(self, *args, **kwargs):
         """Pull in and execute the redis commands"""
         return self.__client__.execute_command(*args, **kwargs)
 
-    def pipeline(self, *args, **kwargs):
-        """Pipelines"""
-        return self.__client__.pipeline(*args, **kwargs)
+    def pipeline(self, transaction=True, shard_hint=None):
+        """
+        Return a pipeline, for native redis commands as well as the commands
+        of every module, queued through the same namespaces as on the client
+        (e.g pipe.json, pipe.ft). Each reply is parsed as it would be by the
+        feature itself.
+        """
+        bases = (self.pipeline_class,)
+        if self.instrumentation is not None:
+            bases = (self.pipeline_instrumentation,) + bases
+        p = composed("Pipeline", bases)(
+            self.client.connection_pool,
+            self.client.response_callbacks,
+            transaction,
+            shard_hint,
+        )
+        p._client = self
+        p.instrumentation = self.instrumentation
+        return p
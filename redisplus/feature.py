@@ -1,5 +1,10 @@
 from abc import ABC
-from redis.client import Pipeline
+from redis.cluster import RedisCluster
+from redis.exceptions import RedisClusterException
+
+from .autopipeline import parse
+from .instrumentation import PipelineInstrumentationMixin
+from .pipeline import Pipeline, Queued, composed
 
 
 class AbstractFeature(ABC):
@@ -9,15 +14,160 @@ class AbstractFeature(ABC):
     the appropriate internal redis client objects.
     """
 
+    # the redis-py pipeline class, module commands are mixed into
+    pipeline_class = Pipeline
+    # mixed into pipelines built by an instrumented feature
+    pipeline_instrumentation = PipelineInstrumentationMixin
+    # the Instrumentation recording the commands sent, None when disabled
+    instrumentation = None
+    # the AutoPipeline coalescing commands sent, None to send them one by one
+    autopipeline = None
+    # the ReplicaRouter reads are sent through, None to send them all to
+    # the client
+    router = None
+
+    # the NearCache replies to reads are kept in, None to always send them
+    cache = None
+    # command -> the response callback its replies are parsed with, the
+    # feature's own rather than the client's, see _install_callbacks
+    _callbacks = {}
+
     def execute_command(self, *args, **kwargs):
         """Execute redis command."""
-        return self.__client__.execute_command(*args, **kwargs)
+        if self.cache is not None:
+            return self.cache.execute(self._send_command, args, kwargs)
+        return self._send_command(*args, **kwargs)
+
+    def _send_command(self, *args, **kwargs):
+        """Send redis command, to a replica, the autopipeline or the client."""
+        if self.router is not None and self.router.routes(args):
+            execute = self.router.execute_command
+        elif self.autopipeline is None:
+            execute = self.__client__.execute_command
+        else:
+            execute = self.autopipeline.execute_command
+        execute = self._parsing(execute, args[0])
+        if self.instrumentation is None:
+            return execute(*args, **kwargs)
+        return self.instrumentation.execute(execute, args, kwargs)
+
+    def _parsing(self, execute, command):
+        """Return `execute`, its reply to `command` passed through the
+        feature's response callback, if it has one."""
+        callback = self._callbacks.get(command)
+        if callback is None:
+            return execute
+
+        def parsed(*args, **options):
+            reply = execute(*args, **options)
+            return self._parse_reply(reply, lambda r: parse(callback, r, options))
+
+        return parsed
+
+    def _execute_and_parse(self, parse, *args, **kwargs):
+        """Execute redis command, returning the reply passed through `parse`."""
+        if self.instrumentation is not None:
+            parse = self.instrumentation.parser(args[0], parse)
+        return self._parse_reply(self.execute_command(*args, **kwargs), parse)
+
+    def _parse_reply(self, reply, parse):
+        """Return `reply` passed through `parse`.
+
+        Every command whose reply is post-processed outside of a response
+        callback goes through here, so that features backed by an asyncio
+        client can await the reply before parsing it.
+        """
+        return parse(reply)
+
+    def _execute_by_slot(self, command, keys, build, **options):
+        """Execute the multi-key `command` over `keys`.
+
+        On a RedisCluster, `keys` are grouped by hash slot and one
+        sub-command is sent per slot, as a single cluster pipeline that
+        writes to every node before reading any reply. Otherwise the command
+        is sent as is.
+
+        `build` is called with a list of positions in `keys`, and returns
+        the command arguments covering those keys. The per key replies are
+        returned in the order of `keys`. `options` are passed to the
+        response callback of every sub-command.
+        """
+        if not isinstance(self.client, RedisCluster):
+            return self.execute_command(command, *build(range(len(keys))), **options)
+
+        slots = {}
+        for pos, key in enumerate(keys):
+            slots.setdefault(self.client.keyslot(key), []).append(pos)
+        groups = list(slots.values())
+
+        pipe = self.client.pipeline()
+        for positions in groups:
+            node = self.client.get_node_from_key(keys[positions[0]])
+            pipe.execute_command(
+                command, *build(positions), target_nodes=node, **options
+            )
+
+        replies = [None] * len(keys)
+        for positions, reply in zip(groups, pipe.execute()):
+            for pos, value in zip(positions, reply):
+                replies[pos] = value
+        callback = self._callbacks.get(command)
+        return replies if callback is None else parse(callback, replies, options)
+
+    def _check_same_slot(self, command, *keys):
+        """Fail before sending `command`, if a RedisCluster cannot serve
+        it because `keys` hash to different slots."""
+        if not isinstance(self.client, RedisCluster):
+            return
+        if len({self.client.keyslot(k) for k in keys}) > 1:
+            raise RedisClusterException(
+                "{} - all keys must map to the same key slot, "
+                "use a hash tag such as {{tag}}".format(command)
+            )
 
     @property
     def __client__(self):
         """Get the client instance set by the redis module class."""
         return self.client
 
+    def instrument(self, instrumentation):
+        """Record every command sent by this feature, and the pipelines it
+        builds, with `instrumentation` (see redisplus.instrumentation).
+
+        Replies are parsed by timed callbacks of the feature's own: other
+        features sharing the client are left as they are.
+        """
+        self.instrumentation = instrumentation
+        for name, method in instrumentation.commands(self.commandmixin).items():
+            setattr(self, name, method.__get__(self))
+        self._callbacks = self._timed_callbacks(getattr(self, "MODULE_CALLBACKS", {}))
+
+    def _piped(self, pipeline):
+        """Return this feature's commands, queued to `pipeline` (see
+        redisplus.pipeline) and parsed once it is executed."""
+        timed = self.commandmixin if self.instrumentation is not None else None
+        cls = composed("Queued", (Queued, self.commandmixin), timed)
+        return cls(pipeline, self)
+
+    def _install_callbacks(self, callbacks):
+        """Parse the replies to the module's commands with `callbacks`.
+
+        They are the feature's own, applied to the replies it reads (see
+        _parsing), rather than set on the client: features sharing a client
+        (e.g JSON features with different codecs) each parse their replies
+        their own way.
+        """
+        self._callbacks = self._timed_callbacks(callbacks)
+
+    def _timed_callbacks(self, callbacks):
+        """Return `callbacks`, timed once the feature is instrumented."""
+        if self.instrumentation is None:
+            return callbacks
+        return {
+            command: self.instrumentation.callback(command, callback)
+            for command, callback in callbacks.items()
+        }
+
     def _pipeline(self, **kwargs):
         """Build and return a pipeline object.
         By implementing a pipeline, the individual
@@ -38,7 +188,8 @@ class AbstractFeature(ABC):
             "connection_pool", self.client.connection_pool
         )
         kwargs["response_callbacks"] = kwargs.get(
-            "response_callbacks", self.client.response_callbacks
+            "response_callbacks",
+            dict(self.client.response_callbacks, **self._callbacks),
         )
         cls = kwargs.get("cls", self.commandmixin)
         if "cls" in kwargs.keys():
@@ -54,8 +205,14 @@ class AbstractFeature(ABC):
 
         # construct an internal class (Piper) that is effectively as redis
         # pipeline, and ensure we mix in, the commands for the associated module
-        class Piper(cls, Pipeline):
-            pass
+        bases = (cls, self.pipeline_class)
+        if self.instrumentation is not None:
+            bases = (self.pipeline_instrumentation,) + bases
+            internals["instrumentation"] = self.instrumentation
+        timed = cls if self.instrumentation is not None else None
+        Piper = composed("Piper", bases, timed)
+        # the state the mixed in commands read is the feature's
+        internals["_feature"] = self
 
         p = Piper(**sanitized)
         for k, v in internals.items():
@@ -1,6 +1,7 @@
 from .node import Node  # noqa
 from .edge import Edge  # noqa
 from .path import Path  # noqa
+from .query_result import EntityMap  # noqa
 
 from redis.client import Redis
 from ..feature import AbstractFeature
@@ -19,6 +20,7 @@ class Graph(CommandMixin, AbstractFeature, object):
         """
         self.NAME = name  # Graph key
         self.client = client
+        self.commandmixin = CommandMixin
 
         self.nodes = {}
         self.edges = []
@@ -0,0 +1,156 @@
+from itertools import chain
+
+from .node import Node
+
+
+class LoadReport(object):
+    """
+    The outcome of a bulk load, see redisplus.graph.Graph.bulk_create.
+
+    nodes: The number of nodes created.
+    edges: The number of edges created.
+    batches: The number of batches loaded, a load given this report
+        resuming after them.
+    seconds: The time the load took.
+    ids: Per node alias, the id of the node created.
+    """
+
+    def __init__(self):
+        self.nodes = 0
+        self.edges = 0
+        self.batches = 0
+        self.seconds = 0.0
+        self.ids = {}
+
+    @property
+    def nodes_per_sec(self):
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    @property
+    def edges_per_sec(self):
+        return self.edges / self.seconds if self.seconds else 0.0
+
+    def add(self, batch, result):
+        """Account for a batch loaded, `result` the result of its query."""
+        if batch.aliases is None:
+            self.edges += len(batch.rows)
+        else:
+            self.nodes += len(batch.rows)
+            for alias, row in zip(batch.aliases, result.result_set):
+                if alias is not None:
+                    self.ids[alias] = row[0]
+        self.batches += 1
+
+    def __repr__(self):
+        return (
+            "LoadReport(nodes={}, edges={}, batches={}, "
+            "nodes_per_sec={:.0f}, edges_per_sec={:.0f})".format(
+                self.nodes,
+                self.edges,
+                self.batches,
+                self.nodes_per_sec,
+                self.edges_per_sec,
+            )
+        )
+
+
+class Batch(object):
+    """A query creating nodes (or edges) of a label (or relation type), and
+    its rows, sent as the $rows parameter. `aliases` are the aliases of the
+    nodes, None for edges."""
+
+    __slots__ = ("query", "rows", "aliases")
+
+    def __init__(self, query, rows, aliases=None):
+        self.query = query
+        self.rows = rows
+        self.aliases = aliases
+
+    @property
+    def params(self):
+        return {"rows": self.rows}
+
+
+def _name(name):
+    return "`" + name.replace("`", "``") + "`"
+
+
+def _properties(row, rows):
+    """Return the properties map of the entities of `rows`, read from `row`:
+    the keys missing from a row are null, and not set."""
+    keys = sorted({key for properties in rows for key in properties})
+    if not keys:
+        return ""
+    return " {" + ", ".join(_name(k) + ": " + row + "." + _name(k) for k in keys) + "}"
+
+
+def _group(items, key, batch_size):
+    """Yield (key, items) groups of the `items` sharing a `key`, of
+    `batch_size` items at most."""
+    groups = {}
+    for item in items:
+        group_key = key(item)
+        group = groups.setdefault(group_key, [])
+        group.append(item)
+        if len(group) == batch_size:
+            yield group_key, groups.pop(group_key)
+    yield from groups.items()
+
+
+def node_batches(nodes, batch_size):
+    """Yield the Batches creating `nodes`, grouped by label."""
+    for label, group in _group(nodes, lambda node: node.label, batch_size):
+        rows = [node.properties for node in group]
+        query = "UNWIND $rows AS r CREATE (n{}{}) RETURN id(n)".format(
+            ":" + _name(label) if label else "", _properties("r", rows)
+        )
+        yield Batch(query, rows, [node.alias for node in group])
+
+
+def _node_id(node, ids):
+    if not isinstance(node, Node):
+        return int(node)
+    if node.alias in ids:
+        return ids[node.alias]
+    if node.id is None:
+        raise ValueError(
+            "{} is neither created by the load, nor has an id".format(node)
+        )
+    return node.id
+
+
+def edge_batches(edges, batch_size, ids):
+    """Yield the Batches creating `edges`, grouped by relation type, their
+    nodes either created by the load (their id read from `ids`), or given
+    by id."""
+    for relation, group in _group(edges, lambda edge: edge.relation, batch_size):
+        if not relation:
+            raise ValueError("Edges need a relation type to be created")
+        rows = [
+            [_node_id(e.src_node, ids), _node_id(e.dest_node, ids), e.properties]
+            for e in group
+        ]
+        query = (
+            "UNWIND $rows AS r MATCH (a), (b) WHERE id(a) = r[0] AND id(b) = r[1] "
+            "CREATE (a)-[:{}{}]->(b)".format(
+                _name(relation), _properties("r[2]", [row[2] for row in rows])
+            )
+        )
+        yield Batch(query, rows)
+
+
+def batches(nodes, edges, batch_size, report):
+    """
+    Yield the Batches creating `nodes`, then `edges`, of `batch_size`
+    entities at most, skipping the ones `report` has loaded already. Edges
+    are grouped once every node is created (i.e its batch accounted for in
+    `report`).
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    loaded = chain(
+        node_batches(nodes, batch_size), edge_batches(edges, batch_size, report.ids)
+    )
+    for index, batch in enumerate(loaded):
+        if index >= report.batches:
+            yield batch
@@ -1,14 +1,19 @@
+from time import perf_counter
+
 from redis import DataError
 from redis.exceptions import ResponseError
+from . import bulk
 from .exceptions import VersionMismatchException
-from .query_result import QueryResult
+from .query_result import ColumnarQueryResult, LazyQueryResult, QueryResult
 
 
 class CommandMixin:
     def commit(self):
         """
-        Create entire graph.
+        Create entire graph, as a single query.
         For more information see `CREATE <https://oss.redis.com/redisgraph/master/commands/#create>`_.
+
+        See bulk_create, for large graphs.
         """
         if len(self.nodes) == 0 and len(self.edges) == 0:
             return None
@@ -25,7 +30,55 @@ class CommandMixin:
 
         return self.query(query)
 
-    def query(self, q, params=None, timeout=None, read_only=False, profile=False):
+    def bulk_create(self, nodes=None, edges=None, batch_size=1000, report=None):
+        """
+        Create `nodes`, then `edges` (by default, the nodes and the edges of
+        the graph) in batches of `batch_size`, one parameterized query
+        each: `UNWIND $rows AS r CREATE ...` per label, and `UNWIND $rows
+        AS r MATCH ... CREATE ...` per relation type, for the server to
+        reuse the plans of queries it already parsed.
+
+        Return a redisplus.graph.bulk.LoadReport: the number of entities
+        created, their rate, and the ids of the nodes created.
+
+        Args:
+
+        -------
+        nodes : iterable of Node
+            The nodes to create.
+        edges : iterable of Edge
+            The edges to create, between nodes created by the load (the ones
+            given by alias), or by id.
+        batch_size : int
+            The number of entities per query.
+        report : LoadReport
+            The report of a load to resume, after its last batch loaded: a
+            load failing (e.g on a connection error) is resumed when given
+            its report again, and the same entities, in the same order.
+        """
+        if nodes is None and edges is None:
+            nodes, edges = self.nodes.values(), self.edges
+        if report is None:
+            report = bulk.LoadReport()
+        start = perf_counter()
+        try:
+            for batch in bulk.batches(nodes or (), edges or (), batch_size, report):
+                report.add(batch, self.query(batch.query, batch.params))
+        finally:
+            report.seconds += perf_counter() - start
+        return report
+
+    def query(
+        self,
+        q,
+        params=None,
+        timeout=None,
+        read_only=False,
+        profile=False,
+        lazy=False,
+        columnar=False,
+        entities=None,
+    ):
         """
         Executes a query against the graph.
         For more information see `GRAPH.QUERY <https://oss.redis.com/redisgraph/master/commands/#graphquery>`_.
@@ -43,8 +96,101 @@ class CommandMixin:
             Executes a readonly query if set to True.
         profile : bool
             Return details on results produced by and time spent in each operation.
+        lazy : bool
+            Return a LazyQueryResult, an iterator parsing the records on
+            demand, instead of all at once.
+        columnar : bool
+            Return a ColumnarQueryResult, holding a column of values per
+            returned field (a numpy array for numbers and booleans), instead
+            of a list of records.
+        entities : EntityMap
+            The identity map of nodes and edges to share with other results,
+            e.g the ones of a session: a node or an edge already read is
+            then returned as is. Each result has a map of its own otherwise
+            (lazy results have none).
         """
+        command = self._query_command(q, params, timeout, read_only, profile)
+        result_class = self._result_class(profile, lazy, columnar)
 
+        # issue query
+        try:
+            return self._execute_and_parse(
+                lambda response: result_class(self, response, profile, entities),
+                *command,
+            )
+        except ResponseError as e:
+            if "wrong number of arguments" in str(e):
+                print("Note: RedisGraph Python requires server version 2.2.8 or above")
+            if "unknown command" in str(e) and read_only:
+                # `GRAPH.RO_QUERY` is unavailable in older versions.
+                return self.query(
+                    q,
+                    params,
+                    timeout,
+                    read_only=False,
+                    lazy=lazy,
+                    columnar=columnar,
+                    entities=entities,
+                )
+            raise e
+        except VersionMismatchException as e:
+            # client view over the graph schema is out of sync
+            # set client version and refresh local schema
+            self.version = e.version
+            self._refresh_schema()
+            # re-issue query
+            return self.query(
+                q,
+                params,
+                timeout,
+                read_only,
+                lazy=lazy,
+                columnar=columnar,
+                entities=entities,
+            )
+
+    def paginate(self, q, params=None, page_size=10000, timeout=None, read_only=True):
+        """
+        Yield the records of the query `q`, read in pages of `page_size`
+        records, one query each: `q` is sent with SKIP and LIMIT appended,
+        and must end with a RETURN clause (with ORDER BY, for the pages to
+        be read in a stable order) without SKIP or LIMIT of its own.
+
+        Each page is parsed as it is iterated over (see query(lazy=True)).
+        Records changed between two pages may be skipped or repeated.
+        """
+        if not isinstance(page_size, int) or page_size <= 0:
+            raise ValueError("page_size must be a positive integer")
+        skip = 0
+        while True:
+            page = self.query(
+                "{} SKIP {} LIMIT {}".format(q, skip, page_size),
+                params,
+                timeout,
+                read_only=read_only,
+                lazy=True,
+            )
+            count = 0
+            for record in page:
+                count += 1
+                yield record
+            if count < page_size:
+                return
+            skip += page_size
+
+    @staticmethod
+    def _result_class(profile, lazy, columnar):
+        """Return the class of the result of a query."""
+        if lazy and columnar:
+            raise ValueError("lazy and columnar are mutually exclusive")
+        if profile:
+            return QueryResult
+        if lazy:
+            return LazyQueryResult
+        return ColumnarQueryResult if columnar else QueryResult
+
+    def _query_command(self, q, params, timeout, read_only, profile):
+        """Build the GRAPH.QUERY (or RO_QUERY, PROFILE) command for query `q`."""
         # maintain original 'q'
         query = q
 
@@ -66,25 +212,7 @@ class CommandMixin:
             if not isinstance(timeout, int):
                 raise Exception("Timeout argument must be a positive integer")
             command += ["timeout", timeout]
-
-        # issue query
-        try:
-            response = self.execute_command(*command)
-            return QueryResult(self, response, profile)
-        except ResponseError as e:
-            if "wrong number of arguments" in str(e):
-                print("Note: RedisGraph Python requires server version 2.2.8 or above")
-            if "unknown command" in str(e) and read_only:
-                # `GRAPH.RO_QUERY` is unavailable in older versions.
-                return self.query(q, params, timeout, read_only=False)
-            raise e
-        except VersionMismatchException as e:
-            # client view over the graph schema is out of sync
-            # set client version and refresh local schema
-            self.version = e.version
-            self._refresh_schema()
-            # re-issue query
-            return self.query(q, params, timeout, read_only)
+        return command
 
     def merge(self, pattern):
         """
@@ -130,8 +258,7 @@ class CommandMixin:
         if params is not None:
             query = self._build_params_header(params) + query
 
-        plan = self.execute_command("GRAPH.EXPLAIN", self.name, query)
-        return "\n".join(plan)
+        return self._execute_and_parse("\n".join, "GRAPH.EXPLAIN", self.name, query)
 
     def bulk(self, **kwargs):
         """Internal only. Not supported."""
@@ -7,6 +7,8 @@ class Edge:
     An edge connecting two nodes.
     """
 
+    __slots__ = ("id", "relation", "properties", "src_node", "dest_node")
+
     def __init__(self, src_node, relation, dest_node, edge_id=None, properties=None):
         """
         Create a new edge.
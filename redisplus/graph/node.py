@@ -6,6 +6,8 @@ class Node:
     A node within the graph.
     """
 
+    __slots__ = ("id", "alias", "label", "properties")
+
     def __init__(self, node_id=None, alias=None, label=None, properties=None):
         """
         Create a new node.
@@ -3,6 +3,8 @@ from .edge import Edge
 
 
 class Path:
+    __slots__ = ("_nodes", "_edges", "append_type")
+
     def __init__(self, nodes, edges):
         if not (isinstance(nodes, list) and isinstance(edges, list)):
             raise TypeError("nodes and edges must be list")
@@ -6,6 +6,7 @@ from .exceptions import VersionMismatchException
 # from prettytable import PrettyTable
 from redis import ResponseError
 from collections import OrderedDict
+import warnings
 
 LABELS_ADDED = "Labels added"
 NODES_CREATED = "Nodes created"
@@ -32,6 +33,22 @@ STATS = [
 ]
 
 
+_BOOLEANS = {"true": True, "false": False, b"true": True, b"false": False}
+
+
+def _parse_string(cell):
+    if isinstance(cell, bytes):
+        return cell.decode()
+    elif not isinstance(cell, str):
+        return str(cell)
+    else:
+        return cell
+
+
+def _parse_boolean(value):
+    return _BOOLEANS.get(value)
+
+
 class ResultSetColumnTypes:
     COLUMN_UNKNOWN = 0
     COLUMN_SCALAR = 1
@@ -58,8 +75,35 @@ class ResultSetScalarTypes:
     VALUE_POINT = 11
 
 
+class EntityMap:
+    """
+    An identity map of the nodes and edges read by queries, by id: a node
+    (or an edge) met again is the object first parsed, rather than a copy.
+
+    A result has one of its own, unless given one to share with other
+    results, e.g for the queries of a session. Entities are then kept as
+    first read: clear the map to read them again.
+    """
+
+    __slots__ = ("nodes", "edges")
+
+    def __init__(self):
+        self.nodes = {}
+        self.edges = {}
+
+    def clear(self):
+        self.nodes.clear()
+        self.edges.clear()
+
+    def __len__(self):
+        return len(self.nodes) + len(self.edges)
+
+
 class QueryResult:
-    def __init__(self, graph, response, profile=False):
+    # whether the result has an EntityMap of its own, when not given one
+    interned = True
+
+    def __init__(self, graph, response, profile=False, entities=None):
         """
         A class that represents a result of the query operation.
 
@@ -71,10 +115,19 @@ class QueryResult:
             The response from the server.
         profile:
             A boolean indicating if the query command was "GRAPH.PROFILE"
+        entities:
+            An EntityMap shared with other results, for nodes and edges
+            read again to be the same objects.
         """
         self.graph = graph
         self.header = []
         self.result_set = []
+        self.scalar_parsers = self._scalar_parsers()
+        # property names, per offset in the graph schema
+        self._property_names = {}
+        if entities is None and self.interned:
+            entities = EntityMap()
+        self.entities = entities
 
         # in case of an error an exception will be raised
         self._check_for_errors(response)
@@ -128,52 +181,100 @@ class QueryResult:
         return header
 
     def parse_records(self, raw_result_set):
-        records = []
-        result_set = raw_result_set[1]
-        for row in result_set:
-            record = []
-            for idx, cell in enumerate(row):
-                if self.header[idx][0] == ResultSetColumnTypes.COLUMN_SCALAR:
-                    record.append(self.parse_scalar(cell))
-                elif self.header[idx][0] == ResultSetColumnTypes.COLUMN_NODE:
-                    record.append(self.parse_node(cell))
-                elif self.header[idx][0] == ResultSetColumnTypes.COLUMN_RELATION:
-                    record.append(self.parse_edge(cell))
-                else:
-                    print("Unknown column type.\n")
-            records.append(record)
-
-        return records
+        parse = self._row_parser()
+        return [parse(row) for row in raw_result_set[1]]
+
+    def _row_parser(self):
+        """Return the parser of a row, compiled from the header."""
+        # the parser of each column, looked up once rather than per cell
+        parsers = [self._column_parser(column[0]) for column in self.header]
+        if all(parse == self.parse_scalar for parse in parsers):
+            # parse_scalar, inlined
+            get = self.scalar_parsers.get
+            scalar_parser = self._scalar_parser
+            return lambda row: [
+                (get(cell[0]) or scalar_parser(cell[0]))(cell[1]) for cell in row
+            ]
+        return lambda row: [parse(cell) for parse, cell in zip(parsers, row)]
+
+    def _column_parser(self, column_type):
+        """Return the parser of the cells of a column of `column_type`."""
+        if column_type == ResultSetColumnTypes.COLUMN_SCALAR:
+            return self.parse_scalar
+        if column_type == ResultSetColumnTypes.COLUMN_NODE:
+            return self.parse_node
+        if column_type == ResultSetColumnTypes.COLUMN_RELATION:
+            return self.parse_edge
+        warnings.warn("Unknown column type {}".format(column_type))
+        return self.parse_unknown
+
+    def _scalar_parsers(self):
+        """Return the parser of each scalar type, per type code."""
+        return {
+            ResultSetScalarTypes.VALUE_UNKNOWN: self.parse_unknown,
+            ResultSetScalarTypes.VALUE_NULL: self.parse_unknown,
+            ResultSetScalarTypes.VALUE_STRING: _parse_string,
+            ResultSetScalarTypes.VALUE_INTEGER: int,
+            ResultSetScalarTypes.VALUE_BOOLEAN: _parse_boolean,
+            ResultSetScalarTypes.VALUE_DOUBLE: float,
+            ResultSetScalarTypes.VALUE_ARRAY: self.parse_array,
+            ResultSetScalarTypes.VALUE_EDGE: self.parse_edge,
+            ResultSetScalarTypes.VALUE_NODE: self.parse_node,
+            ResultSetScalarTypes.VALUE_PATH: self.parse_path,
+            ResultSetScalarTypes.VALUE_MAP: self.parse_map,
+            ResultSetScalarTypes.VALUE_POINT: self.parse_point,
+        }
+
+    def _scalar_parser(self, scalar_type):
+        """Return the parser of `scalar_type`, an integer or its string."""
+        parse = self.scalar_parsers.get(scalar_type)
+        if parse is None:
+            # sent as a string, or unknown to this client
+            parse = self.scalar_parsers.get(int(scalar_type), self.parse_unknown)
+        return parse
 
     def parse_entity_properties(self, props):
         # [[name, value type, value] X N]
+        names = self._property_names
+        parsers = self.scalar_parsers
         properties = {}
-        for prop in props:
-            prop_name = self.graph.get_property(prop[0])
-            prop_value = self.parse_scalar(prop[1:])
-            properties[prop_name] = prop_value
-
+        for name, scalar_type, value in props:
+            key = names.get(name)
+            if key is None:
+                key = names[name] = self.graph.get_property(name)
+            parse = parsers.get(scalar_type) or self._scalar_parser(scalar_type)
+            properties[key] = parse(value)
         return properties
 
     def parse_string(self, cell):
-        if isinstance(cell, bytes):
-            return cell.decode()
-        elif not isinstance(cell, str):
-            return str(cell)
-        else:
-            return cell
+        return _parse_string(cell)
+
+    def parse_boolean(self, value):
+        return _parse_boolean(value)
+
+    def parse_array(self, value):
+        parse = self.parse_scalar
+        return [parse(item) for item in value]
+
+    def parse_unknown(self, value):
+        return None
 
     def parse_node(self, cell):
         # Node ID (integer),
         # [label string offset (integer)],
         # [[name, value type, value] X N]
 
-        node_id = int(cell[0])
-        label = None
-        if len(cell[1]) != 0:
-            label = self.graph.get_label(cell[1][0])
-        properties = self.parse_entity_properties(cell[2])
-        return Node(node_id=node_id, label=label, properties=properties)
+        node_id, labels, props = cell
+        if self.entities is not None:
+            node = self.entities.nodes.get(node_id)
+            if node is not None:
+                return node
+        label = self.graph.get_label(labels[0]) if labels else None
+        properties = self.parse_entity_properties(props)
+        node = Node(node_id=int(node_id), label=label, properties=properties)
+        if self.entities is not None:
+            self.entities.nodes[node_id] = node
+        return node
 
     def parse_edge(self, cell):
         # Edge ID (integer),
@@ -182,14 +283,21 @@ class QueryResult:
         # dest node ID offset (integer),
         # [[name, value, value type] X N]
 
-        edge_id = int(cell[0])
-        relation = self.graph.get_relation(cell[1])
-        src_node_id = int(cell[2])
-        dest_node_id = int(cell[3])
-        properties = self.parse_entity_properties(cell[4])
-        return Edge(
-            src_node_id, relation, dest_node_id, edge_id=edge_id, properties=properties
+        edge_id, relation, src_node_id, dest_node_id, props = cell
+        if self.entities is not None:
+            edge = self.entities.edges.get(edge_id)
+            if edge is not None:
+                return edge
+        edge = Edge(
+            int(src_node_id),
+            self.graph.get_relation(relation),
+            int(dest_node_id),
+            edge_id=int(edge_id),
+            properties=self.parse_entity_properties(props),
         )
+        if self.entities is not None:
+            self.entities.edges[edge_id] = edge
+        return edge
 
     def parse_path(self, cell):
         nodes = self.parse_scalar(cell[0])
@@ -198,14 +306,13 @@ class QueryResult:
 
     def parse_map(self, cell):
         m = OrderedDict()
-        n_entries = len(cell)
+        parse = self.parse_scalar
 
         # A map is an array of key value pairs.
         # 1. key (string)
         # 2. array: (value type, value)
-        for i in range(0, n_entries, 2):
-            key = self.parse_string(cell[i])
-            m[key] = self.parse_scalar(cell[i + 1])
+        for i in range(0, len(cell), 2):
+            m[_parse_string(cell[i])] = parse(cell[i + 1])
 
         return m
 
@@ -218,56 +325,11 @@ class QueryResult:
         return p
 
     def parse_scalar(self, cell):
-        scalar_type = int(cell[0])
-        value = cell[1]
-        scalar = None
-
-        if scalar_type == ResultSetScalarTypes.VALUE_NULL:
-            scalar = None
-
-        elif scalar_type == ResultSetScalarTypes.VALUE_STRING:
-            scalar = self.parse_string(value)
-
-        elif scalar_type == ResultSetScalarTypes.VALUE_INTEGER:
-            scalar = int(value)
-
-        elif scalar_type == ResultSetScalarTypes.VALUE_BOOLEAN:
-            value = value.decode() if isinstance(value, bytes) else value
-            if value == "true":
-                scalar = True
-            elif value == "false":
-                scalar = False
-            else:
-                print("Unknown boolean type\n")
-
-        elif scalar_type == ResultSetScalarTypes.VALUE_DOUBLE:
-            scalar = float(value)
-
-        elif scalar_type == ResultSetScalarTypes.VALUE_ARRAY:
-            # array variable is introduced only for readability
-            scalar = array = value
-            for i in range(len(array)):
-                scalar[i] = self.parse_scalar(array[i])
-
-        elif scalar_type == ResultSetScalarTypes.VALUE_NODE:
-            scalar = self.parse_node(value)
-
-        elif scalar_type == ResultSetScalarTypes.VALUE_EDGE:
-            scalar = self.parse_edge(value)
-
-        elif scalar_type == ResultSetScalarTypes.VALUE_PATH:
-            scalar = self.parse_path(value)
-
-        elif scalar_type == ResultSetScalarTypes.VALUE_MAP:
-            scalar = self.parse_map(value)
-
-        elif scalar_type == ResultSetScalarTypes.VALUE_POINT:
-            scalar = self.parse_point(value)
-
-        elif scalar_type == ResultSetScalarTypes.VALUE_UNKNOWN:
-            print("Unknown scalar type\n")
-
-        return scalar
+        # [value type, value], dispatched on the type code
+        parse = self.scalar_parsers.get(cell[0])
+        if parse is None:
+            parse = self._scalar_parser(cell[0])
+        return parse(cell[1])
 
     def parse_profile(self, response):
         self.result_set = [x[0 : x.index(",")].strip() for x in response]
@@ -356,3 +418,97 @@ class QueryResult:
     @property
     def run_time_ms(self):
         return self._get_stat(INTERNAL_EXECUTION_TIME)
+
+
+class LazyQueryResult(QueryResult):
+    """
+    A result of a query, whose records are parsed as they are iterated
+    over, rather than all at once: each raw row is released once parsed.
+
+    The result is iterated over once, and its `result_set` is left empty.
+    Nodes and edges are not interned, unless given an EntityMap, for the
+    memory the result holds not to grow as it is iterated over.
+    """
+
+    interned = False
+    _rows = ()
+    _next = 0
+
+    def parse_results(self, raw_result_set):
+        self.header = self.parse_header(raw_result_set)
+        if len(self.header) != 0:
+            self._rows = raw_result_set[1]
+            self._parse_row = self._row_parser()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        index = self._next
+        if index >= len(self._rows):
+            raise StopIteration
+        row = self._rows[index]
+        self._rows[index] = None
+        self._next = index + 1
+        return self._parse_row(row)
+
+    def is_empty(self):
+        return self._next >= len(self._rows)
+
+
+_DOUBLE_OR_NULL = {ResultSetScalarTypes.VALUE_DOUBLE, ResultSetScalarTypes.VALUE_NULL}
+
+
+class ColumnarQueryResult(QueryResult):
+    """
+    A result of a query, as a column of values per field returned, rather
+    than a list of records, filled from the reply column by column.
+
+    `columns` maps the name of every column to its values: a numpy array
+    for a column of integers (int64), doubles (float64, nulls as NaN) or
+    booleans, and a list otherwise (e.g strings, or values of mixed types).
+    `result_set` is left empty.
+    """
+
+    _count = 0
+
+    def __init__(self, graph, response, profile=False, entities=None):
+        self.columns = OrderedDict()
+        super().__init__(graph, response, profile, entities)
+
+    def parse_results(self, raw_result_set):
+        self.header = self.parse_header(raw_result_set)
+        rows = raw_result_set[1] if len(self.header) != 0 else []
+        self._count = len(rows)
+        cells = zip(*rows) if rows else [[] for _ in self.header]
+        for column, column_cells in zip(self.header, cells):
+            name = _parse_string(column[1])
+            if column[0] == ResultSetColumnTypes.COLUMN_SCALAR:
+                self.columns[name] = self.parse_column(column_cells)
+            else:
+                parse = self._column_parser(column[0])
+                self.columns[name] = [parse(cell) for cell in column_cells]
+
+    def parse_column(self, cells):
+        """Return the values of the scalar `cells` of a column, as an array
+        if they are all numbers, or all booleans."""
+        import numpy as np
+
+        if not cells:
+            return []
+        codes = {cell[0] for cell in cells}
+        count = len(cells)
+        if codes == {ResultSetScalarTypes.VALUE_INTEGER}:
+            return np.fromiter((cell[1] for cell in cells), np.int64, count)
+        if ResultSetScalarTypes.VALUE_DOUBLE in codes and codes <= _DOUBLE_OR_NULL:
+            values = (np.nan if cell[1] is None else float(cell[1]) for cell in cells)
+            return np.fromiter(values, np.float64, count)
+        if codes == {ResultSetScalarTypes.VALUE_BOOLEAN}:
+            values = (_BOOLEANS[cell[1]] for cell in cells)
+            return np.fromiter(values, np.bool_, count)
+        if codes == {ResultSetScalarTypes.VALUE_STRING}:
+            return [_parse_string(cell[1]) for cell in cells]
+        return [self.parse_scalar(cell) for cell in cells]
+
+    def is_empty(self):
+        return self._count == 0
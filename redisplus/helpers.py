@@ -1,6 +1,8 @@
 import copy
+import functools
 import random
 import string
+import warnings
 
 
 def bulk_of_jsons(d):
@@ -15,6 +17,19 @@ def bulk_of_jsons(d):
     return _f
 
 
+def per_match(f):
+    """Apply `f` to a reply, or to every reply in the array a JSONPath ($)
+    is replied to with, one per value matching. None (e.g for the values the
+    command does not apply to) is returned as is."""
+
+    def _f(r):
+        if isinstance(r, list):
+            return [None if item is None else f(item) for item in r]
+        return None if r is None else f(r)
+
+    return _f
+
+
 def nativestr(x):
     """Return the decoded binary string, or a string, depending on type."""
     return x.decode("utf-8", "replace") if isinstance(x, bytes) else x
@@ -106,3 +121,24 @@ def stringify_param_value(value):
         return f'{{{",".join(f"{k}:{stringify_param_value(v)}" for k, v in value.items())}}}'
     else:
         return str(value)
+
+
+def deprecated(version, reason):
+    """
+    Decorate a function, warning on every call that it is deprecated since
+    `version` (see the deprecated package, whose messages this mirrors).
+    """
+
+    def decorator(func):
+        message = "Call to deprecated function {}. ({}) -- Deprecated since version {}.".format(
+            func.__qualname__, reason, version
+        )
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            warnings.warn(message, category=DeprecationWarning, stacklevel=2)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,351 @@
+import inspect
+import math
+import threading
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+# when the feature method that builds the current command was entered
+_call_start = ContextVar("redisplus_call_start", default=None)
+# seconds spent in response callbacks, for the command being executed
+_parse_seconds = ContextVar("redisplus_parse_seconds", default=None)
+# raw reply size, as seen by the response callback of the current command
+_response_bytes = ContextVar("redisplus_response_bytes", default=None)
+
+STAGES = (
+    ("build_seconds", "Client-side time spent building the command arguments."),
+    ("roundtrip_seconds", "Time spent sending the command and reading its reply."),
+    ("parse_seconds", "Client-side time spent parsing the reply."),
+    ("request_bytes", "Size of the command, as sent over the wire."),
+    ("response_bytes", "Size of the reply, as read from the wire."),
+)
+
+
+def nativecommand(command):
+    """Return the command name as an upper case string."""
+    if isinstance(command, bytes):
+        command = command.decode()
+    return str(command).upper()
+
+
+def vars_of(cls):
+    """Return the attributes defined by `cls` and its bases, the most
+    derived definition winning."""
+    attrs = {}
+    for klass in reversed(cls.__mro__):
+        attrs.update(vars(klass))
+    return attrs
+
+
+def timed_command(method):
+    """Wrap the feature `method`, so commands it sends report build time to
+    the instrumentation recording them."""
+
+    if inspect.iscoroutinefunction(method):
+
+        @wraps(method)
+        async def wrapper(*args, **kwargs):
+            previous = _call_start.get()
+            _call_start.set(perf_counter())
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                _call_start.set(previous)
+
+    else:
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            previous = _call_start.get()
+            _call_start.set(perf_counter())
+            try:
+                return method(*args, **kwargs)
+            finally:
+                _call_start.set(previous)
+
+    return wrapper
+
+
+def timed_commands(cls):
+    """Return the public methods of the command mixin `cls`, wrapped by
+    `timed_command`."""
+    return {
+        name: timed_command(method)
+        for name, method in vars_of(cls).items()
+        if not name.startswith("_") and inspect.isfunction(method)
+    }
+
+
+def _bulk_size(arg):
+    """Size of `arg` once encoded as a RESP bulk string."""
+    if isinstance(arg, bytes):
+        n = len(arg)
+    elif isinstance(arg, str):
+        n = len(arg.encode())
+    else:
+        n = len(repr(arg))
+    return n + len(str(n)) + 5
+
+
+def request_size(args):
+    """Size of the command `args`, once encoded as a RESP array."""
+    return len(str(len(args))) + 3 + sum(_bulk_size(arg) for arg in args)
+
+
+def response_size(reply):
+    """Approximate size of the RESP `reply` a parsed python object came from."""
+    if reply is None:
+        return 5
+    if isinstance(reply, (bytes, str)):
+        return _bulk_size(reply)
+    if isinstance(reply, (list, tuple)):
+        return len(str(len(reply))) + 3 + sum(response_size(r) for r in reply)
+    if isinstance(reply, dict):
+        return (
+            len(str(len(reply)))
+            + 3
+            + sum(response_size(k) + response_size(v) for k, v in reply.items())
+        )
+    return len(str(reply)) + 3
+
+
+class Histogram(object):
+    """
+    A histogram of positive values, in logarithmic buckets.
+
+    Quantiles are reported as the middle of the bucket they fall in, within
+    about 2% of the recorded values.
+    """
+
+    # 16 buckets for every doubling
+    LOG_BASE = math.log(2) / 16
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.sum = 0.0
+
+    def record(self, value):
+        """Record `value`, values at or below zero all go to one bucket."""
+        bucket = math.floor(math.log(value) / self.LOG_BASE) if value > 0 else None
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Return the value below which a `q` fraction (0..1) of values fall."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = self.counts.get(None, 0)
+        if seen >= rank and seen > 0:
+            return 0.0
+        buckets = sorted(b for b in self.counts if b is not None)
+        for bucket in buckets:
+            seen += self.counts[bucket]
+            if seen >= rank:
+                break
+        return math.exp((bucket + 0.5) * self.LOG_BASE)
+
+
+class Instrumentation(object):
+    """
+    Record, per command name, where the time and bytes of redis commands go.
+
+    For every command sent by an instrumented feature, `observe` is called
+    once per stage (see `STAGES`): argument build time, round trip time,
+    response parse time, request and response bytes. By default values are
+    kept in one `Histogram` per command and stage, override `observe` to
+    send them elsewhere.
+
+    Pipelines are recorded as a single `PIPELINE` command for the round
+    trip, while the commands they hold still report their own build, parse
+    and request size.
+
+    Example:
+
+    >>> instrumentation = Instrumentation()
+    >>> rc = Client(instrumentation=instrumentation)
+    >>> rc.json.get("foo")
+    >>> instrumentation.percentiles("JSON.GET")
+    >>> print(instrumentation.prometheus())
+    """
+
+    def __init__(self, quantiles=(0.5, 0.99)):
+        self.quantiles = quantiles
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, command, stage, value):
+        """Record `value` for the `stage` of `command`."""
+        key = (nativecommand(command), stage)
+        with self._lock:
+            try:
+                histogram = self.histograms[key]
+            except KeyError:
+                histogram = self.histograms[key] = Histogram()
+            histogram.record(value)
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        with self._lock:
+            self.histograms = {}
+
+    def percentiles(self, command):
+        """
+        Return the quantiles recorded for `command`, as a dictionary of
+        stage to dictionary of quantile to value.
+        """
+        with self._lock:
+            histograms = list(self.histograms.items())
+        return {
+            stage: {q: histogram.quantile(q) for q in self.quantiles}
+            for (cmd, stage), histogram in histograms
+            if cmd == command
+        }
+
+    def prometheus(self, prefix="redisplus_command"):
+        """Return a snapshot of every histogram, in the Prometheus text format."""
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+        lines = []
+        for stage, help in STAGES:
+            name = "{}_{}".format(prefix, stage)
+            samples = [(cmd, h) for (cmd, s), h in histograms if s == stage]
+            if not samples:
+                continue
+            lines.append("# HELP {} {}".format(name, help))
+            lines.append("# TYPE {} summary".format(name))
+            for command, histogram in samples:
+                label = 'command="{}"'.format(command.replace('"', '\\"'))
+                for q in self.quantiles:
+                    lines.append(
+                        '{}{{{},quantile="{}"}} {!r}'.format(
+                            name, label, q, histogram.quantile(q)
+                        )
+                    )
+                lines.append("{}_sum{{{}}} {!r}".format(name, label, histogram.sum))
+                lines.append("{}_count{{{}}} {}".format(name, label, histogram.count))
+        return "\n".join(lines) + "\n"
+
+    def command(self, method):
+        """Wrap the feature `method`, so commands it sends report build time."""
+        return timed_command(method)
+
+    def commands(self, cls):
+        """Return the public methods of the command mixin `cls`, wrapped by
+        `command`."""
+        return timed_commands(cls)
+
+    def callback(self, command, callback):
+        """Wrap the response `callback` of `command`, to time reply parsing."""
+
+        def wrapper(response, **options):
+            nbytes = response_size(response)
+            st = perf_counter()
+            try:
+                return callback(response, **options)
+            finally:
+                elapsed = perf_counter() - st
+                spent = _parse_seconds.get()
+                if spent is None:
+                    # parsed within a pipeline, not by execute()
+                    self.observe(command, "parse_seconds", elapsed)
+                    self.observe(command, "response_bytes", nbytes)
+                else:
+                    _parse_seconds.set(spent + elapsed)
+                    _response_bytes.set(nbytes)
+
+        wrapper.__wrapped__ = callback
+        return wrapper
+
+    def parser(self, command, parse):
+        """Wrap `parse`, post processing the reply of `command` outside of
+        a response callback."""
+
+        def wrapper(reply):
+            st = perf_counter()
+            try:
+                return parse(reply)
+            finally:
+                self.observe(command, "parse_seconds", perf_counter() - st)
+
+        return wrapper
+
+    def built(self, args, now):
+        """Record the build time and size of the command `args`, sent or
+        queued at `now`."""
+        start = _call_start.get()
+        if start is not None:
+            self.observe(args[0], "build_seconds", now - start)
+        self.observe(args[0], "request_bytes", request_size(args))
+
+    def start(self, args):
+        """Called as the command `args` is sent, returns when it was sent."""
+        now = perf_counter()
+        self.built(args, now)
+        return now
+
+    def stop(self, command, st, reply):
+        """Called once the reply to `command`, sent at `st`, was read and
+        parsed by its response callback."""
+        elapsed = perf_counter() - st
+        parse = _parse_seconds.get()
+        nbytes = _response_bytes.get()
+        _parse_seconds.set(None)
+        _response_bytes.set(None)
+
+        if parse:
+            self.observe(command, "parse_seconds", parse)
+        self.observe(command, "roundtrip_seconds", elapsed - (parse or 0.0))
+        if nbytes is None:
+            nbytes = response_size(reply)
+        self.observe(command, "response_bytes", nbytes)
+
+    def execute(self, execute_command, args, kwargs):
+        """Run `execute_command` for `args`, recording every stage."""
+        st = self.start(args)
+        _parse_seconds.set(0.0)
+        _response_bytes.set(None)
+        reply = None
+        try:
+            reply = execute_command(*args, **kwargs)
+            return reply
+        finally:
+            self.stop(args[0], st, reply)
+
+    def execute_async(self, execute_command, args, kwargs):
+        """Return an awaitable running `execute_command` for `args`,
+        recording every stage."""
+        st = self.start(args)
+        return self._await(execute_command(*args, **kwargs), args[0], st)
+
+    async def _await(self, pending, command, st):
+        # set from within the task awaiting the reply, where callbacks run
+        _parse_seconds.set(0.0)
+        _response_bytes.set(None)
+        reply = None
+        try:
+            reply = await pending
+            return reply
+        finally:
+            self.stop(command, st, reply)
+
+
+class PipelineInstrumentationMixin:
+    """Mixed into pipelines built by an instrumented feature."""
+
+    instrumentation = None
+
+    def pipeline_execute_command(self, *args, **options):
+        self.instrumentation.built(args, perf_counter())
+        return super().pipeline_execute_command(*args, **options)
+
+    def execute(self, *args, **kwargs):
+        st = perf_counter()
+        try:
+            return super().execute(*args, **kwargs)
+        finally:
+            self.instrumentation.observe(
+                "PIPELINE", "roundtrip_seconds", perf_counter() - st
+            )
@@ -3,8 +3,13 @@ import json
 
 from redis.client import Redis
 
-from ..helpers import bulk_of_jsons, delist, nativestr
+from ..helpers import bulk_of_jsons, delist, nativestr, per_match
+from . import bulk, memory, optimistic, pipeline, projection
+from .codec import StdlibCodec, default_codec
 from .commands import CommandMixin
+from .diff import diff
+from .path import Path, compile_path, jsonpath, str_path
+from .schema import decode
 from ..feature import AbstractFeature
 
 
@@ -17,22 +22,38 @@ class JSON(CommandMixin, AbstractFeature, object):
 
     :param encoder:
     :type json.JSONEncoder: An instance of json.JSONEncoder
+
+    :param codec:
+    :type codec: An object with encode(obj) and decode(bytes or str) methods,
+                 see redisplus.json.codec
     """
 
+    # decodes the documents read once executed, see JSON.pipeline
+    pipeline_class = pipeline.Pipeline
+
     def __init__(
         self,
         client: Redis,
-        decoder: Optional[json.JSONDecoder] = json.JSONDecoder(),
-        encoder: Optional[json.JSONEncoder] = json.JSONEncoder(),
+        decoder: Optional[json.JSONDecoder] = None,
+        encoder: Optional[json.JSONEncoder] = None,
+        codec=None,
     ):
         """
         Create a client for talking to json.
 
+        Documents are encoded and decoded by `codec`. If none is set, and
+        neither is an encoder or decoder, orjson is used when installed, and
+        the standard library otherwise.
+
         :param decoder:
         :type json.JSONDecoder: An instance of json.JSONDecoder
 
         :param encoder:
         :type json.JSONEncoder: An instance of json.JSONEncoder
+
+        :param codec:
+        :type codec: An object with encode(obj) and decode(bytes or str)
+                     methods, see redisplus.json.codec
         """
         # Set the module commands' callbacks
         self.MODULE_CALLBACKS = {
@@ -40,54 +61,268 @@ class JSON(CommandMixin, AbstractFeature, object):
             "JSON.DEL": int,
             "JSON.FORGET": int,
             "JSON.GET": self._decode,
-            "JSON.MGET": bulk_of_jsons(self._decode),
+            "JSON.MGET": self._decode_bulk,
             "JSON.SET": lambda r: r and nativestr(r) == "OK",
             "JSON.NUMINCRBY": self._decode,
             "JSON.NUMMULTBY": self._decode,
-            "JSON.TOGGLE": lambda b: b == b"true",
-            "JSON.STRAPPEND": int,
-            "JSON.STRLEN": int,
-            "JSON.ARRAPPEND": int,
-            "JSON.ARRINDEX": int,
-            "JSON.ARRINSERT": int,
-            "JSON.ARRLEN": int,
-            "JSON.ARRPOP": self._decode,
-            "JSON.ARRTRIM": int,
-            "JSON.OBJLEN": int,
-            "JSON.OBJKEYS": delist,
+            "JSON.TOGGLE": per_match(lambda b: b == b"true" or b == 1),
+            "JSON.STRAPPEND": per_match(int),
+            "JSON.STRLEN": per_match(int),
+            "JSON.ARRAPPEND": per_match(int),
+            "JSON.ARRINDEX": per_match(int),
+            "JSON.ARRINSERT": per_match(int),
+            "JSON.ARRLEN": per_match(int),
+            "JSON.ARRPOP": per_match(self._decode),
+            "JSON.ARRTRIM": per_match(int),
+            "JSON.OBJLEN": per_match(int),
+            "JSON.OBJKEYS": self._objkeys,
             # "JSON.RESP": delist,
-            "JSON.DEBUG": int,
+            "JSON.DEBUG": per_match(int),
         }
 
         self.client = client
         self.commandmixin = CommandMixin
 
-        for key, value in self.MODULE_CALLBACKS.items():
-            self.client.set_response_callback(key, value)
+        self._install_callbacks(self.MODULE_CALLBACKS)
 
+        if codec is None:
+            if encoder is not None or decoder is not None:
+                codec = StdlibCodec(encoder, decoder)
+            else:
+                codec = default_codec()
+        self.codec = codec
+        # the conflicts met by update()
+        self.update_stats = optimistic.UpdateStats()
         self.__encoder__ = encoder
         self.__decoder__ = decoder
 
         # # the encoding happens on the client object
 
-    def _decode(self, obj):
-        """Get the decoder."""
+    def _decode(self, obj, schema=None, **options):
+        """Get the decoder.
+
+        If a `schema` is set (see redisplus.json.schema), the decoded value
+        is built into it.
+        """
         if obj is None:
             return obj
+        if schema is None:
+            return self.codec.decode(obj)
+        return decode(self.codec, obj, schema)
 
-        try:
-            return self.__decoder__.decode(obj)
-        except TypeError:
-            return self.__decoder__.decode(obj.decode())
+    def _decode_bulk(self, replies, schema=None, **options):
+        """Decode the replies of a JSON.MGET in place, one document after the
+        other, so that only one is held decoded when built into a `schema`."""
+        return bulk_of_jsons(lambda r: self._decode(r, schema))(replies)
+
+    @staticmethod
+    def _objkeys(reply):
+        """Decode the keys replied, per value matching for a JSONPath ($)."""
+        if reply and all(r is None or isinstance(r, list) for r in reply):
+            return [None if r is None else delist(r) for r in reply]
+        return None if reply is None else delist(reply)
 
     def _encode(self, obj):
         """Get the encoder."""
-        return self.__encoder__.encode(obj)
+        return self.codec.encode(obj)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        """
+        Return a pipeline of JSON commands, a transaction unless
+        `transaction` is False.
+
+        Replies are parsed with this feature's callbacks and codec, as are
+        the replies to the commands it sends outside pipelines, even if
+        another JSON feature, with another codec, shares the client.
+        Documents read are decoded at once when the pipeline executes.
+        """
+        callbacks = dict(self.client.response_callbacks, **self._callbacks)
+        deferred = getattr(self.pipeline_class, "deferred_callbacks", {})
+        callbacks.update(self._timed_callbacks(deferred))
+        return self._pipeline(
+            transaction=transaction,
+            shard_hint=shard_hint,
+            response_callbacks=callbacks,
+        )
 
-    def pipeline(self, **kwargs):
-        p = self._pipeline(
-            __encode__=self.__encoder__,
-            _encode=self._encode,
-            __decoder__=self.__decoder__,
+    def patch(self, name, old, new, path=Path.rootPath()):
+        """
+        Turn the JSON value under `path` at key `name` from `old` into `new`,
+        sending only what changed (see redisplus.json.diff), in a single
+        transaction.
+
+        `old` must be the value currently stored, e.g as read by get().
+        Return the replies to the commands sent, an empty list if `old` and
+        `new` are equal.
+        """
+        commands = diff(old, new, path)
+        if not commands:
+            return []
+        pipe = self.pipeline()
+        for method, args in commands:
+            getattr(pipe, method)(name, *args)
+        return pipe.execute()
+
+    def update(self, name, fn, paths=None, retries=10, backoff=0.001, max_backoff=0.1):
+        """
+        Update the JSON value at key `name` with the function `fn`, retrying
+        when the key is changed concurrently (optimistic concurrency).
+
+        Only `paths` (a path, or a list of legacy paths) are read, the whole
+        document if None, and `fn` is called with their value, or with a
+        dictionary of path to value for several paths. It returns the new
+        value (or dictionary), or None if it changed its argument in place.
+        The changes alone are then written (see redisplus.json.diff), in a
+        transaction watching `name`.
+
+        If `name` changed in between, the update is tried again, up to
+        `retries` times, after sleeping a random delay of up to `backoff`
+        seconds, doubled after every conflict (at most `max_backoff`), and
+        WatchError is raised after the last one. Conflicts are counted in
+        `update_stats` (see redisplus.json.optimistic.UpdateStats).
+
+        Return the new value. `fn` may be called several times.
+        """
+        return optimistic.update(
+            self,
+            self.update_stats,
+            name,
+            fn,
+            paths,
+            retries,
+            backoff,
+            max_backoff,
+        )
+
+    def bulk_set(
+        self,
+        docs,
+        key=None,
+        path=Path.rootPath(),
+        chunk_size=1000,
+        workers=1,
+        processes=False,
+        nx=False,
+        xx=False,
+    ):
+        """
+        Set many JSON documents, sending them in non transactional pipelines
+        of `chunk_size` commands.
+
+        docs : a mapping of key to document, an iterable of (key, document)
+            pairs, or NDJSON, as a file, an iterable of lines, or the path
+            to a file. NDJSON lines are sent as they are.
+        key : if set, `docs` are documents (or NDJSON lines), and their key
+            is the value of this field, or the result of this function of
+            the document.
+        workers : the number of chunks sent at once, each over its own
+            connection, from threads, or from processes if `processes` is
+            True (which then encode the documents, with a copy of the
+            codec).
+        nx, xx : only set documents that do not, or do, exist already.
+
+        Failures do not stop the load, be they errors of the server, or
+        documents that cannot be encoded, or whose key cannot be read: a
+        BulkReport is returned, counting the documents sent, per second,
+        and holding the error of every key that failed.
+        """
+        return bulk.bulk_set(
+            self.client,
+            self.codec,
+            docs,
+            key=key,
+            path=str_path(path),
+            chunk_size=chunk_size,
+            workers=workers,
+            processes=processes,
+            nx=nx,
+            xx=xx,
+        )
+
+    def iter_array(self, name, path=Path.rootPath(), window=1000):
+        """
+        Yield the items of the JSON array under `path` at key `name`, reading
+        `window` of them at a time (with JSON.GET of an array slice), rather
+        than the whole array at once.
+
+        The array is read as it is when each window is fetched: items
+        inserted or removed while iterating may be skipped, or repeated.
+        A JSONPath (`$`) must match a single array.
+        Requires JSONPath support (RedisJSON 2.0).
+        """
+        length = self._single_match(path, self.arrlen(name, path))
+        if not length:
+            return
+        path = jsonpath(path)
+        for start in range(0, length, window):
+            items = self.get(name, "{}[{}:{}]".format(path, start, start + window))
+            if not items:
+                return
+            yield from items
+
+    @staticmethod
+    def _single_match(path, reply):
+        """Return the per match `reply` to a command reading the JSONPath
+        `path` for its single match, or `reply` itself for a legacy path."""
+        if reply is None or not compile_path(path).multi:
+            return reply
+        if len(reply) > 1:
+            raise ValueError(
+                "{} matches {} values, a single one is expected".format(
+                    compile_path(path).strPath, len(reply)
+                )
+            )
+        return reply[0] if reply else None
+
+    def project(self, keys, paths, columnar=False):
+        """
+        Read the JSON values under each of `paths` from each of `keys`, in a
+        single round trip.
+
+        Either one JSON.MGET is sent per path, or one JSON.GET of every path
+        per key, whichever is the smallest (see redisplus.json.projection),
+        and every value is decoded once.
+
+        Return a list with, per key, a dictionary of path to value (None for
+        keys that do not exist), or if `columnar` is True, a dictionary of
+        path to the list of its values, per key. Values read with a legacy
+        path are None where the path does not exist, JSONPaths ($) read the
+        list of values matching. Requires JSONPath support (RedisJSON 2.0).
+        """
+        return projection.project(self, keys, paths, columnar)
+
+    def profile_memory(
+        self,
+        match=None,
+        sample=1,
+        subpaths=True,
+        batch_size=500,
+        workers=1,
+        rate=None,
+        separator=":",
+    ):
+        """
+        Profile the memory used by the JSON documents of the keyspace, to
+        find the ones using the most.
+
+        Keys of type ReJSON-RL are SCANned (those matching the pattern
+        `match`, if set), and one in every `sample` is read with JSON.DEBUG
+        MEMORY, of its root and, if `subpaths`, of its top-level paths. Keys
+        are read in non transactional pipelines of `batch_size`, `workers`
+        of them at once, and at most `rate` keys per second when set, to
+        profile a production server.
+
+        Return a MemoryReport, aggregating memory per key prefix (the key up
+        to its last `separator`) and per prefix and top-level path: see
+        MemoryReport.top.
+        """
+        return memory.profile_memory(
+            self,
+            match=match,
+            sample=sample,
+            subpaths=subpaths,
+            batch_size=batch_size,
+            workers=workers,
+            rate=rate,
+            separator=separator,
         )
-        return p
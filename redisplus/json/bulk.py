@@ -0,0 +1,272 @@
+import os
+from collections.abc import Mapping
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import partial
+from itertools import chain
+from time import perf_counter
+
+from redis import ConnectionPool, Redis
+from redis.cluster import RedisCluster
+
+# the client and codec of a worker process, see _init_process
+_process_client = None
+_process_codec = None
+
+
+class BulkReport(object):
+    """
+    The outcome of a bulk load.
+
+    docs: The number of documents read, failures included.
+    bytes: The size of the documents sent, serialized.
+    seconds: The time the load took.
+    skipped: The number of documents not set, because of nx or xx.
+    failures: Per key, the error setting its document. Documents whose key
+        could not be read are reported by their position in the documents
+        loaded (their line, counted from 0, for NDJSON).
+    """
+
+    def __init__(self):
+        self.docs = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.skipped = 0
+        self.failures = {}
+
+    @property
+    def docs_per_sec(self):
+        return self.docs / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_sec(self):
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+    def add(self, docs, size, skipped, failures):
+        """Account for a chunk, see load_chunk."""
+        self.docs += docs
+        self.bytes += size
+        self.skipped += skipped
+        self.failures.update(failures)
+
+    def __repr__(self):
+        return (
+            "BulkReport(docs={}, failures={}, skipped={}, "
+            "docs_per_sec={:.0f}, bytes_per_sec={:.0f})".format(
+                self.docs,
+                len(self.failures),
+                self.skipped,
+                self.docs_per_sec,
+                self.bytes_per_sec,
+            )
+        )
+
+
+def pairs(docs, key, codec):
+    """
+    Return an iterator of (key, document) over `docs`.
+
+    `docs` is either a mapping of key to document, a path to an NDJSON file,
+    a file (or any iterable of lines) of NDJSON, or an iterable of (key,
+    document) pairs. If `key` is set (a field name, or a function of the
+    document), `docs` are documents, their key read from them.
+
+    NDJSON lines are only decoded to read their key, and are sent as they
+    are, as bytes. A document whose key cannot be read is paired with its
+    position, and the error reading it, in place of the document.
+    """
+    if isinstance(docs, Mapping):
+        return iter(docs.items())
+    if isinstance(docs, (str, os.PathLike)):
+        return _ndjson_file(docs, key, codec)
+    if hasattr(docs, "readline"):
+        return _ndjson(docs, key, codec)
+    docs, lines = _lines(docs)
+    if lines:
+        return _ndjson(docs, key, codec)
+    if key is None:
+        return iter(docs)
+    return _keyed(docs, _getter(key))
+
+
+def _lines(docs):
+    """Return an iterator of `docs`, and whether they are lines (str or
+    bytes) of NDJSON, as told by the first of them."""
+    docs = iter(docs)
+    for first in docs:
+        return chain([first], docs), isinstance(first, (str, bytes))
+    return docs, False
+
+
+def _getter(key):
+    if key is None:
+        raise ValueError("NDJSON documents need a key, field name or function")
+    if callable(key):
+        return key
+    return lambda doc: doc[key]
+
+
+def _keyed(docs, getter):
+    for position, doc in enumerate(docs):
+        try:
+            yield getter(doc), doc
+        except Exception as e:
+            yield position, e
+
+
+def _ndjson_file(path, key, codec):
+    with open(path, "rb") as f:
+        yield from _ndjson(f, key, codec)
+
+
+def _ndjson(lines, key, codec):
+    getter = _getter(key)
+    for position, line in enumerate(lines):
+        if isinstance(line, str):
+            line = line.encode()
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield getter(codec.decode(line)), line
+        except Exception as e:
+            yield position, e
+
+
+def chunks(iterable, size):
+    """Return lists of `size` items of `iterable`, the last one shorter."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def load_chunk(client, codec, path, flags, chunk):
+    """
+    Set the (key, document) pairs of `chunk`, as one non transactional
+    pipeline. Documents are encoded with `codec`, bytes taken as already
+    encoded. Documents that cannot be encoded (or whose key could not be
+    read, see pairs) are failures, left out of the pipeline.
+
+    Return (docs, bytes, skipped, failures), for BulkReport.add.
+    """
+    pipe = client.pipeline(transaction=False)
+    failures = {}
+    size, sent = _queue(pipe, codec, path, flags, chunk, failures)
+    if not sent:
+        return len(chunk), size, 0, failures
+    try:
+        replies = pipe.execute(raise_on_error=False)
+    except Exception as e:
+        # e.g a connection error, the whole chunk failed
+        failures.update((key, e) for key in sent)
+        return len(chunk), size, 0, failures
+
+    skipped = 0
+    for key, reply in zip(sent, replies):
+        if isinstance(reply, Exception):
+            failures[key] = reply
+        elif reply is None:
+            skipped += 1
+    return len(chunk), size, skipped, failures
+
+
+def _queue(pipe, codec, path, flags, chunk, failures):
+    """Queue JSON.SET commands for the documents of `chunk` to `pipe`, the
+    ones failing added to `failures`. Return (bytes, keys queued)."""
+    size = 0
+    sent = []
+    for key, doc in chunk:
+        if isinstance(doc, Exception):
+            failures[key] = doc
+            continue
+        if not isinstance(doc, bytes):
+            try:
+                doc = codec.encode(doc)
+            except (TypeError, ValueError) as e:
+                failures[key] = e
+                continue
+        size += len(doc)
+        sent.append(key)
+        pipe.execute_command("JSON.SET", key, path, doc, *flags)
+    return size, sent
+
+
+def _init_process(connection_class, connection_kwargs, codec):
+    global _process_client, _process_codec
+    pool = ConnectionPool(connection_class=connection_class, **connection_kwargs)
+    _process_client = Redis(connection_pool=pool)
+    _process_codec = codec
+
+
+def _load_chunk_in_process(path, flags, chunk):
+    return load_chunk(_process_client, _process_codec, path, flags, chunk)
+
+
+def bulk_set(
+    client,
+    codec,
+    docs,
+    key=None,
+    path=".",
+    chunk_size=1000,
+    workers=1,
+    processes=False,
+    nx=False,
+    xx=False,
+):
+    """Load `docs` with JSON.SET, see redisplus.json.JSON.bulk_set."""
+    if nx and xx:
+        raise ValueError("nx and xx are mutually exclusive")
+    flags = ("NX",) if nx else ("XX",) if xx else ()
+
+    if workers <= 1:
+        executor = None
+        load = partial(load_chunk, client, codec, path, flags)
+    elif processes:
+        if isinstance(client, RedisCluster):
+            raise ValueError("Loading from processes does not support RedisCluster")
+        pool = client.connection_pool
+        executor = ProcessPoolExecutor(
+            workers,
+            initializer=_init_process,
+            initargs=(pool.connection_class, pool.connection_kwargs, codec),
+        )
+        load = partial(_load_chunk_in_process, path, flags)
+    else:
+        executor = ThreadPoolExecutor(workers)
+        load = partial(load_chunk, client, codec, path, flags)
+
+    report = BulkReport()
+    start = perf_counter()
+    batches = chunks(pairs(docs, key, codec), chunk_size)
+    if executor is None:
+        for chunk in batches:
+            report.add(*load(chunk))
+    else:
+        with executor:
+            _fan_out(executor, load, batches, workers * 2, report)
+    report.seconds = perf_counter() - start
+    return report
+
+
+def _fan_out(executor, load, batches, inflight, report):
+    """Load `batches` from `executor`, with at most `inflight` chunks read
+    ahead of the ones loaded."""
+    pending = set()
+    for chunk in batches:
+        if len(pending) >= inflight:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                report.add(*future.result())
+        pending.add(executor.submit(load, chunk))
+    for future in wait(pending).done:
+        report.add(*future.result())
@@ -0,0 +1,128 @@
+import json
+
+# replies this long, on average, or shorter, are decoded as a single array
+BATCH_BYTES = 1024
+
+
+class StdlibCodec(object):
+    """
+    Encode and decode JSON with the standard library.
+
+    :param encoder: The json.JSONEncoder objects are serialized with.
+    :param decoder: The json.JSONDecoder replies are parsed with.
+    """
+
+    name = "json"
+
+    def __init__(self, encoder=None, decoder=None):
+        self.encoder = encoder if encoder is not None else json.JSONEncoder()
+        self.decoder = decoder if decoder is not None else json.JSONDecoder()
+        # decodes objects as tuples of (key, value) pairs, None if `decoder`
+        # has hooks of its own, see decode_pairs
+        self.pairs_decoder = _pairs_decoder(self.decoder)
+
+    def encode(self, obj):
+        """Return `obj` serialized, as a str."""
+        return self.encoder.encode(obj)
+
+    def decode(self, data):
+        """Return the object serialized in `data`, bytes or str."""
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data).decode("utf-8")
+        return self.decoder.decode(data)
+
+    def decode_pairs(self, data):
+        """Return the object serialized in `data`, its objects decoded as
+        tuples of (key, value) pairs rather than dictionaries (see
+        redisplus.json.schema)."""
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data).decode("utf-8")
+        return self.pairs_decoder.decode(data)
+
+
+def _pairs_decoder(decoder):
+    """Return a copy of `decoder` decoding objects as tuples of pairs, through
+    its object_pairs_hook, None if `decoder` has hooks of its own."""
+    if type(decoder) is not json.JSONDecoder:
+        return None
+    if decoder.object_hook is not None or decoder.object_pairs_hook is not None:
+        return None
+    return json.JSONDecoder(
+        parse_float=decoder.parse_float,
+        parse_int=decoder.parse_int,
+        parse_constant=decoder.parse_constant,
+        strict=decoder.strict,
+        object_pairs_hook=tuple,
+    )
+
+
+class OrjsonCodec(object):
+    """
+    Encode and decode JSON with orjson, reading and writing bytes as they
+    come from, and go to, the socket.
+
+    Values orjson does not handle (e.g integers over 64 bits, or objects of
+    unsupported types) go through `fallback`, a StdlibCodec by default.
+    """
+
+    name = "orjson"
+
+    def __init__(self, fallback=None):
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+        self._option = orjson.OPT_NON_STR_KEYS
+        self._errors = (orjson.JSONEncodeError, orjson.JSONDecodeError)
+        self.fallback = fallback if fallback is not None else StdlibCodec()
+
+    def encode(self, obj):
+        """Return `obj` serialized, as bytes."""
+        try:
+            return self._dumps(obj, option=self._option)
+        except self._errors:
+            return self.fallback.encode(obj)
+
+    def decode(self, data):
+        """Return the object serialized in `data`, bytes or str."""
+        try:
+            return self._loads(data)
+        except self._errors:
+            return self.fallback.decode(data)
+
+
+def _joined(replies):
+    """Return `replies` as a single JSON array, None if they are neither all
+    bytes nor all str."""
+    if all(isinstance(r, bytes) for r in replies):
+        return b"[" + b",".join(replies) + b"]"
+    if all(isinstance(r, str) for r in replies):
+        return "[" + ",".join(replies) + "]"
+    return None
+
+
+def decode_many(codec, replies):
+    """
+    Return the objects serialized in `replies`, decoded by `codec`.
+
+    Small replies are decoded together, as one array, saving the cost of a
+    decode call per reply (most of the time it takes the standard library
+    to decode a small document). Large ones are decoded one by one, rather
+    than copied into an array first.
+    """
+    if len(replies) > 1 and sum(map(len, replies)) <= BATCH_BYTES * len(replies):
+        joined = _joined(replies)
+        decoded = None if joined is None else codec.decode(joined)
+        # a decoder may not return arrays as lists
+        if isinstance(decoded, list) and len(decoded) == len(replies):
+            return decoded
+    return [codec.decode(r) for r in replies]
+
+
+def default_codec():
+    """Return the fastest codec available: orjson if installed, the standard
+    library otherwise."""
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        return StdlibCodec()
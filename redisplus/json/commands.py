@@ -126,11 +126,13 @@ class CommandMixin:
         """
         return self.execute_command("JSON.FORGET", name, str_path(path))
 
-    def get(self, name, *args, no_escape=False):
+    def get(self, name, *args, no_escape=False, schema=None):
         """
         Get the object stored as a JSON value at key `name`.
         `args` is zero or more paths, and defaults to root path `no_escape` is
         a boolean flag to add no_escape option to get non-ascii characters.
+        `schema` is a class (e.g a dataclass) the value is built into, instead
+        of dictionaries, see redisplus.json.schema.
         For more information see `JSON.GET <https://oss.redis.com/redisjson/master/commands/#jsonget>`_.
         """
         pieces = [name]
@@ -146,20 +148,27 @@ class CommandMixin:
 
         # Handle case where key doesn't exist. The JSONDecoder would raise a
         # TypeError exception since it can't decode None
+        options = {} if schema is None else {"schema": schema}
         try:
-            return self.execute_command("JSON.GET", *pieces)
+            return self.execute_command("JSON.GET", *pieces, **options)
         except TypeError:
             return None
 
-    def mget(self, path, *args):
+    def mget(self, path, *args, schema=None):
         """
         Get the objects stored as a JSON values under `path` from keys `args`.
+        On a cluster, keys are fetched with one JSON.MGET per hash slot.
+        `schema` is a class each value is built into, as by get().
         For more information see `JSON.MGET <https://oss.redis.com/redisjson/master/commands/#jsonmget>`_.
         """
-        pieces = []
-        pieces.extend(args)
-        pieces.append(str_path(path))
-        return self.execute_command("JSON.MGET", *pieces)
+        path = str_path(path)
+        options = {} if schema is None else {"schema": schema}
+        return self._execute_by_slot(
+            "JSON.MGET",
+            args,
+            lambda positions: [args[i] for i in positions] + [path],
+            **options,
+        )
 
     def set(self, name, path, obj, nx=False, xx=False, decode_keys=False):
         """
@@ -0,0 +1,96 @@
+import json
+import re
+
+from .path import Path, str_path
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def child_path(path, key, index=False):
+    """Return the path of `key` in the JSON value under `path`: an array
+    index if `index`, a dictionary key otherwise (encoded as JSON keys are,
+    e.g "1" for 1)."""
+    path = str_path(path)
+    if not index and not isinstance(key, str):
+        key = json.dumps(key)
+    if index:
+        step = "[{}]".format(key)
+    elif _IDENTIFIER.match(key):
+        step = "." + key
+    else:
+        step = "[{}]".format(json.dumps(key))
+    if path == Path.rootPath():
+        return step
+    return path + step
+
+
+def _same(old, new):
+    # True == 1 and 1 == 1.0, but they are different JSON values, so
+    # containers are compared item by item
+    if isinstance(old, (dict, list)):
+        return False
+    return type(old) is type(new) and old == new
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def diff(old, new, path=Path.rootPath()):
+    """
+    Return the JSON commands turning the value `old`, under `path`, into `new`.
+
+    Each command is a (JSON method, arguments) tuple, the arguments following
+    the key name: e.g ("set", (".a", 1)) for `json.set(name, ".a", 1)`.
+    Unchanged values are skipped, appended to arrays or strings appended to,
+    integers incremented, and dictionaries and arrays of the same length
+    changed one item at a time. A container is set as a whole instead, once
+    more than half of its items changed.
+    """
+    path = str_path(path)
+    if _same(old, new):
+        return []
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        return _diff_dict(old, new, path)
+    if isinstance(old, list) and isinstance(new, list):
+        return _diff_list(old, new, path)
+    if isinstance(old, str) and isinstance(new, str) and new.startswith(old):
+        size = len(old)
+        return [("strappend", (new[size:], path))]
+
+    if _is_int(old) and _is_int(new):
+        return [("numincrby", (path, new - old))]
+
+    return [("set", (path, new))]
+
+
+def _diff_dict(old, new, path):
+    commands = []
+    for key in old:
+        if key not in new:
+            commands.append(("delete", (child_path(path, key),)))
+    for key, value in new.items():
+        if key in old:
+            commands += diff(old[key], value, child_path(path, key))
+        else:
+            commands.append(("set", (child_path(path, key), value)))
+    return _cheapest(commands, path, new)
+
+
+def _diff_list(old, new, path):
+    size = len(old)
+    if len(new) > size and not _diff_list(old, new[:size], path):
+        return [("arrappend", (path,) + tuple(new[size:]))]
+    if len(new) != size:
+        return [("set", (path, new))]
+    commands = []
+    for index, (before, after) in enumerate(zip(old, new)):
+        commands += diff(before, after, child_path(path, index, index=True))
+    return _cheapest(commands, path, new)
+
+
+def _cheapest(commands, path, new):
+    if len(commands) > max(1, len(new) // 2):
+        return [("set", (path, new))]
+    return commands
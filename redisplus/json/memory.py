@@ -0,0 +1,192 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic, perf_counter, sleep
+
+from .bulk import _fan_out, chunks
+from .diff import child_path
+from .path import Path
+
+# the type SCAN filters JSON keys with
+JSON_TYPE = "ReJSON-RL"
+
+
+class MemoryReport(object):
+    """
+    The memory used by the JSON documents of a keyspace, as profiled by
+    profile_memory.
+
+    keys: The number of keys scanned.
+    sampled: The number of keys profiled, one in `sample`.
+    bytes: The memory used by the keys profiled.
+    seconds: The time the profile took.
+    prefixes: Per key prefix, [keys profiled, bytes].
+    paths: Per (key prefix, top-level path), [keys profiled, bytes], the
+        root path standing for the whole document.
+    """
+
+    def __init__(self, sample=1):
+        self.sample = sample
+        self.keys = 0
+        self.sampled = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.prefixes = {}
+        self.paths = {}
+
+    @property
+    def estimated_bytes(self):
+        """The memory used by every key scanned, extrapolated from the keys
+        profiled."""
+        return self.bytes * self.sample
+
+    def add(self, scanned, sizes):
+        """Account for a batch of keys, see profile_batch."""
+        self.keys += scanned
+        for prefix, path, size in sizes:
+            entry = self.paths.setdefault((prefix, path), [0, 0])
+            entry[0] += 1
+            entry[1] += size
+            if path == Path.rootPath():
+                self.sampled += 1
+                self.bytes += size
+                entry = self.prefixes.setdefault(prefix, [0, 0])
+                entry[0] += 1
+                entry[1] += size
+
+    def top(self, n=10, paths=False):
+        """
+        Return the `n` key prefixes using the most memory, as (prefix, keys,
+        bytes) tuples, or if `paths` is True the `n` top-level paths, as
+        ((prefix, path), keys, bytes).
+        """
+        entries = self.paths if paths else self.prefixes
+        rows = sorted(entries.items(), key=lambda item: item[1][1], reverse=True)
+        return [(name, keys, size) for name, (keys, size) in rows[:n]]
+
+    def __repr__(self):
+        return "MemoryReport(keys={}, sampled={}, bytes={}, prefixes={})".format(
+            self.keys, self.sampled, self.bytes, len(self.prefixes)
+        )
+
+
+class Throttle(object):
+    """Pace the keys profiled, to `rate` per second at most, across
+    threads. A `rate` of None does not wait."""
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self, count):
+        """Wait until `count` more keys may be profiled."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = monotonic()
+            start = max(now, self._next)
+            self._next = start + count * self.interval
+        if start > now:
+            sleep(start - now)
+
+
+def key_prefix(key, separator=":"):
+    """Return the prefix of `key`, up to its last `separator`, e.g 'app:user'
+    for 'app:user:1', or the key itself if it has none."""
+    if isinstance(key, bytes):
+        key = key.decode("utf-8", "replace")
+    prefix, found, _ = key.rpartition(separator)
+    return prefix if found else key
+
+
+def profile_batch(feature, throttle, subpaths, separator, batch):
+    """
+    Read the memory of the keys in `batch`, with JSON.DEBUG MEMORY, sent as
+    non transactional pipelines of the JSON `feature`: one for the root of
+    every key (and its top-level keys, if `subpaths`), one for the top-level
+    paths.
+
+    Return (keys, sizes), for MemoryReport.add: `sizes` are (prefix, path,
+    bytes) tuples, keys deleted since scanned skipped.
+    """
+    scanned, keys = batch
+    throttle.wait(len(keys))
+    sizes, children = _profile_roots(feature, keys, subpaths, separator)
+    if children:
+        pipe = feature.pipeline(transaction=False)
+        for key, _, path in children:
+            pipe.execute_command("JSON.DEBUG", "MEMORY", key, path)
+        replies = pipe.execute(raise_on_error=False)
+        for (_, prefix, path), size in zip(children, replies):
+            if not isinstance(size, Exception) and size:
+                sizes.append((prefix, path, size))
+    return scanned, sizes
+
+
+def _profile_roots(feature, keys, subpaths, separator):
+    """Return the (prefix, root, bytes) of `keys`, and the (key, prefix,
+    path) of their top-level paths."""
+    root = Path.rootPath()
+    pipe = feature.pipeline(transaction=False)
+    for key in keys:
+        pipe.execute_command("JSON.DEBUG", "MEMORY", key, root)
+        if subpaths:
+            pipe.execute_command("JSON.OBJKEYS", key, root)
+    replies = pipe.execute(raise_on_error=False)
+    if subpaths:
+        roots, objkeys = replies[::2], replies[1::2]
+    else:
+        roots, objkeys = replies, [None] * len(keys)
+
+    sizes = []
+    children = []
+    for key, size, names in zip(keys, roots, objkeys):
+        if isinstance(size, Exception) or not size:
+            continue
+        prefix = key_prefix(key, separator)
+        sizes.append((prefix, root, size))
+        if isinstance(names, list):
+            # the root is not an object otherwise
+            children += [(key, prefix, child_path(root, n)) for n in names]
+    return sizes, children
+
+
+def _batches(keys, batch_size, sample):
+    """Yield (keys scanned, keys sampled) batches of `keys`, keeping one key
+    in every `sample`."""
+    for chunk in chunks(keys, batch_size * sample):
+        yield len(chunk), chunk[::sample]
+
+
+def profile_memory(
+    feature,
+    match=None,
+    sample=1,
+    subpaths=True,
+    batch_size=500,
+    scan_count=1000,
+    workers=1,
+    rate=None,
+    separator=":",
+):
+    """Profile the JSON keys of a keyspace, see
+    redisplus.json.JSON.profile_memory."""
+    if sample < 1:
+        raise ValueError("sample must be at least 1, one key in every sample")
+    report = MemoryReport(sample)
+    throttle = Throttle(rate)
+    start = perf_counter()
+    keys = feature.client.scan_iter(match=match, count=scan_count, _type=JSON_TYPE)
+    batches = _batches(keys, batch_size, sample)
+
+    def profile(batch):
+        return profile_batch(feature, throttle, subpaths, separator, batch)
+
+    if workers <= 1:
+        for batch in batches:
+            report.add(*profile(batch))
+    else:
+        with ThreadPoolExecutor(workers) as executor:
+            _fan_out(executor, profile, batches, workers * 2, report)
+    report.seconds = perf_counter() - start
+    return report
@@ -0,0 +1,121 @@
+import copy
+import random
+import threading
+from collections import Counter
+from time import sleep
+
+from redis.exceptions import WatchError
+
+from .diff import diff
+from .path import Path, compile_path
+
+
+class UpdateStats(object):
+    """
+    The contention met by JSON.update.
+
+    updates: The number of updates committed.
+    conflicts: The number of attempts aborted, the key having changed
+        since it was read.
+    failures: The number of updates given up, after too many conflicts.
+    keys: Per key, its number of conflicts.
+    """
+
+    def __init__(self):
+        self.updates = 0
+        self.conflicts = 0
+        self.failures = 0
+        self.keys = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def retries(self):
+        """The number of attempts made after a conflict."""
+        return self.conflicts - self.failures
+
+    def record(self, name, conflicts, committed):
+        """Account for an update of key `name`."""
+        with self._lock:
+            if committed:
+                self.updates += 1
+            else:
+                self.failures += 1
+            if conflicts:
+                self.conflicts += conflicts
+                self.keys[name] += conflicts
+
+    def hot_keys(self, n=10):
+        """Return the `n` keys with the most conflicts, as (key, conflicts)."""
+        with self._lock:
+            return self.keys.most_common(n)
+
+    def __repr__(self):
+        return "UpdateStats(updates={}, conflicts={}, failures={})".format(
+            self.updates, self.conflicts, self.failures
+        )
+
+
+def _paths(paths):
+    if paths is None:
+        return [Path.rootPath()]
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+    compiled = [compile_path(p) for p in paths]
+    if not compiled:
+        raise ValueError("At least one path is required")
+    for path in compiled:
+        if path.multi:
+            raise ValueError(
+                "{!r} is a JSONPath, updates read and write legacy paths, "
+                "each with a single value".format(path.strPath)
+            )
+    return [path.strPath for path in compiled]
+
+
+def _attempt(pipe, name, fn, paths):
+    """Read `paths` of `name`, and write the changes `fn` makes to them, in a
+    transaction aborted if `name` changed in between."""
+    pipe.watch(name)
+    old = pipe.get(name, *paths)
+    if len(paths) > 1 and old is None:
+        old = dict.fromkeys(paths)
+    value = copy.deepcopy(old)
+    new = fn(value)
+    if new is None:
+        # changed in place
+        new = value
+
+    if len(paths) == 1:
+        commands = diff(old, new, paths[0])
+    else:
+        commands = []
+        for path in paths:
+            if path in new:
+                commands += diff(old[path], new[path], path)
+    if commands:
+        pipe.multi()
+        for method, args in commands:
+            getattr(pipe, method)(name, *args)
+        pipe.execute()
+    return new
+
+
+def update(feature, stats, name, fn, paths, retries, backoff, max_backoff):
+    """Update `paths` of key `name` with `fn`, see redisplus.json.JSON.update."""
+    paths = _paths(paths)
+    conflicts = 0
+    while True:
+        with feature.pipeline() as pipe:
+            try:
+                new = _attempt(pipe, name, fn, paths)
+            except WatchError:
+                conflicts += 1
+                if conflicts > retries:
+                    stats.record(name, conflicts, committed=False)
+                    raise
+            else:
+                stats.record(name, conflicts, committed=True)
+                return new
+        # exponential backoff, with full jitter
+        delay = min(max_backoff, backoff * 2 ** (conflicts - 1))
+        sleep(random.uniform(0, delay))  # nosec
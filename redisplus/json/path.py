@@ -1,9 +1,105 @@
+import functools
+import re
+
+_NAME = r"[^.\[\]\s()'\",]+"
+_STRING = r"\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*'"
+_INDEX = r"-?\d+"
+_SLICE = r"(?:-?\d+)?\s*:\s*(?:-?\d+)?(?:\s*:\s*-?\d+)?"
+_SELECTOR = r"\*|{s}(?:\s*,\s*{s})*|{i}(?:\s*,\s*{i})*|{sl}".format(
+    s="(?:{})".format(_STRING), i=_INDEX, sl=_SLICE
+)
+# a step after the root: a child, a descendant, or a selector in brackets
+_STEP = re.compile(
+    r"\.\.(?:{n}|(?=\[))|\.{n}|\[\s*(?:{sel})\s*\]".format(n=_NAME, sel=_SELECTOR)
+)
+_LEGACY_NAME = re.compile(_NAME)
+_QUOTED = re.compile(_STRING)
+
+
 def str_path(p):
-    """Return the string representation of a path if it is of class Path."""
+    """Return the string representation of a path if it is of class Path.
+
+    A string is validated (see compile_path) before it is returned.
+    """
+    return compile_path(p).strPath
+
+
+def jsonpath(p):
+    """Return the JSONPath (starting with $) equivalent of the path `p`."""
+    return compile_path(p).jsonpath
+
+
+def compile_path(p):
+    """Return the Path of `p`, a Path or a string, parsed once per string."""
     if isinstance(p, Path):
-        return p.strPath
-    else:
         return p
+    return _compile(p)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile(p):
+    return Path(p)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse(path):
+    """
+    Return the steps of `path`, its root excluded, e.g ('.a', '[0]') for
+    '$.a[0]'. Both JSONPaths ($) and legacy paths are supported: children,
+    descendants (..), wildcards, indexes, slices, unions and filters
+    ([?(...)]), filter expressions only checked to be balanced.
+
+    Raise ValueError if `path` is not a valid path.
+    """
+    if not isinstance(path, str):
+        raise ValueError("Invalid JSON path {!r}, not a string".format(path))
+    if path == Path.rootPath():
+        return ()
+    pos = 0
+    steps = []
+    if path.startswith("$"):
+        pos = 1
+    else:
+        # a legacy path may start with a name, without a dot
+        match = _LEGACY_NAME.match(path)
+        if match is not None:
+            steps.append("." + match.group())
+            pos = match.end()
+        elif not path:
+            raise ValueError("Invalid JSON path, empty")
+
+    while pos < len(path):
+        if path.startswith("[?", pos):
+            end = _filter_end(path, pos)
+        else:
+            match = _STEP.match(path, pos)
+            if match is None:
+                raise ValueError(
+                    "Invalid JSON path {!r}, at position {}".format(path, pos)
+                )
+            end = match.end()
+        steps.append(path[pos:end])
+        pos = end
+    return tuple(steps)
+
+
+def _filter_end(path, pos):
+    """Return the position following the filter [?...] starting at `pos`."""
+    depth = 0
+    index = pos + 2
+    while index < len(path) and depth >= 0:
+        char = path[index]
+        if char in "'\"":
+            match = _QUOTED.match(path, index)
+            if match is None:
+                break
+            index = match.end()
+            continue
+        if char == "]" and depth == 0 and index > pos + 2:
+            return index + 1
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        index += 1
+    raise ValueError("Invalid JSON path {!r}, bad filter at {}".format(path, pos))
 
 
 class Path(object):
@@ -17,5 +113,25 @@ class Path(object):
         return "."
 
     def __init__(self, path):
-        """Make a new path based on the string representation in `path`."""
+        """Make a new path based on the string representation in `path`.
+
+        Raise ValueError if `path` is not a valid path (see parse).
+        """
+        self.steps = parse(path)
         self.strPath = path
+
+    @property
+    def multi(self):
+        """True for a JSONPath ($), replied to with an array of every value
+        matching, False for a legacy path, replied to with a single value."""
+        return self.strPath.startswith("$")
+
+    @property
+    def jsonpath(self):
+        """The JSONPath (starting with $) equivalent of this path."""
+        if self.multi:
+            return self.strPath
+        return "$" + "".join(self.steps)
+
+    def __repr__(self):
+        return "Path({!r})".format(self.strPath)
@@ -0,0 +1,70 @@
+from .. import pipeline
+from .codec import decode_many
+from .schema import decode, decodes_pairs, loader
+
+
+class Raw(object):
+    """A JSON reply read by a pipeline, decoded once the pipeline executes."""
+
+    __slots__ = ("reply", "schema")
+
+    def __init__(self, reply, schema):
+        self.reply = reply
+        self.schema = schema
+
+
+def _get(reply, schema=None, **options):
+    return None if reply is None else Raw(reply, schema)
+
+
+def _mget(replies, schema=None, **options):
+    return [_get(r, schema) for r in replies]
+
+
+class Pipeline(pipeline.Pipeline):
+    """
+    A pipeline of JSON commands, built by redisplus.json.JSON.pipeline.
+
+    Its response callbacks are the ones of the JSON feature that built it,
+    rather than the ones last installed on the client, and the documents
+    JSON.GET and JSON.MGET read are decoded once it executes, all at once
+    (see redisplus.json.codec.decode_many).
+    """
+
+    # the callbacks replacing the feature's, see Raw
+    deferred_callbacks = {"JSON.GET": _get, "JSON.MGET": _mget}
+
+    def immediate_execute_command(self, *args, **options):
+        # sent at once, the pipeline is watching keys
+        return self._decode([super().immediate_execute_command(*args, **options)])[0]
+
+    def execute(self, raise_on_error=True):
+        return self._decode(super().execute(raise_on_error))
+
+    def _decode(self, replies):
+        """Decode the Raw replies found in `replies` (or in the lists in
+        `replies`, for JSON.MGET) in place, and return `replies`."""
+        found = []
+        for index, reply in enumerate(replies):
+            if isinstance(reply, Raw):
+                found.append((replies, index))
+            elif isinstance(reply, list):
+                found += [(reply, i) for i, r in enumerate(reply) if isinstance(r, Raw)]
+        if not found:
+            return replies
+
+        codec = self._feature.codec
+        raws = [values[index] for values, index in found]
+        # documents built from pairs are decoded one by one, the others at once
+        paired = [decodes_pairs(codec, raw.schema) for raw in raws]
+        docs = iter(
+            decode_many(codec, [raw.reply for raw, p in zip(raws, paired) if not p])
+        )
+        for (values, index), raw, p in zip(found, raws, paired):
+            if p:
+                values[index] = decode(codec, raw.reply, raw.schema)
+            elif raw.schema is None:
+                values[index] = next(docs)
+            else:
+                values[index] = loader(raw.schema)(next(docs))
+        return replies
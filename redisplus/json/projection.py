@@ -0,0 +1,76 @@
+from redis.cluster import RedisCluster
+
+from .path import compile_path, jsonpath, str_path
+
+# the cost of a command, in bytes, besides its arguments: header, dispatch
+COMMAND_COST = 64
+
+
+def plan(keys, paths, cluster=False):
+    """
+    Return "mget" to read `paths` from `keys` with one JSON.MGET per path,
+    or "get" with one multi-path JSON.GET per key, whichever sends less.
+
+    On a cluster, keys may hash to different slots, JSON.GET is used.
+    """
+    if cluster:
+        return "get"
+    key_bytes = sum(len(str(k)) for k in keys)
+    path_bytes = sum(len(p) for p in paths)
+    mget = len(paths) * (COMMAND_COST + key_bytes) + path_bytes
+    get = len(keys) * (COMMAND_COST + path_bytes) + key_bytes
+    return "mget" if mget <= get else "get"
+
+
+def _value(path, matches):
+    # a JSONPath reads every match, a legacy path a single value
+    if matches is None or compile_path(path).multi:
+        return matches
+    return matches[0] if matches else None
+
+
+def project(feature, keys, paths, columnar=False):
+    """Read `paths` from `keys` with the JSON `feature`, see
+    redisplus.json.JSON.project."""
+    keys = list(keys)
+    paths = [str_path(p) for p in paths]
+    if not paths:
+        raise ValueError("At least one path is required")
+    if not keys:
+        return {path: [] for path in paths} if columnar else []
+    queries = [jsonpath(p) for p in paths]
+    cluster = isinstance(feature.client, RedisCluster)
+    if cluster:
+        # routes every key to the node owning it
+        pipe = feature.client.pipeline()
+    else:
+        # decodes the values read with the feature's codec, all at once
+        pipe = feature.pipeline(transaction=False)
+
+    if plan(keys, paths, cluster) == "mget":
+        for query in queries:
+            pipe.execute_command("JSON.MGET", *keys, query)
+        # replies per path, then per key
+        columns = pipe.execute()
+        found = [m is not None for m in columns[0]] if columns else []
+    else:
+        for key in keys:
+            pipe.execute_command("JSON.GET", key, *queries)
+        rows = pipe.execute()
+        if cluster:
+            rows = [feature._decode(r) for r in rows]
+        found = [r is not None for r in rows]
+        if len(queries) == 1:
+            rows = [None if r is None else {queries[0]: r} for r in rows]
+        columns = [[None if r is None else r[q] for r in rows] for q in queries]
+
+    columns = [
+        [_value(path, matches) for matches in column]
+        for path, column in zip(paths, columns)
+    ]
+    if columnar:
+        return dict(zip(paths, columns))
+    return [
+        dict(zip(paths, row)) if exists else None
+        for exists, row in zip(found, zip(*columns))
+    ]
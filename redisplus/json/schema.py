@@ -0,0 +1,235 @@
+import typing
+
+try:
+    import dataclasses
+except ImportError:  # Python 3.6
+    dataclasses = None
+
+# the loader of every (class, pairs) compiled, see loader
+_loaders = {}
+
+# the types of JSON values holding no object, loaded as they are
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def decode(codec, data, schema):
+    """
+    Return the JSON `data`, decoded by `codec` and built into `schema`.
+
+    Codecs able to (see StdlibCodec.decode_pairs) decode objects as tuples of
+    (key, value) pairs, records are built from, rather than dictionaries.
+    """
+    if decodes_pairs(codec, schema):
+        return loader(schema, pairs=True)(codec.decode_pairs(data))
+    return loader(schema)(codec.decode(data))
+
+
+def decodes_pairs(codec, schema):
+    """Return whether decode builds `schema` from pairs decoded by `codec`."""
+    if getattr(codec, "pairs_decoder", None) is None:
+        return False
+    return schema is not None and loader(schema) is not _identity
+
+
+def loader(schema, pairs=False):
+    """
+    Return a function turning a decoded JSON value into an instance of
+    `schema`, compiled once per schema from its type annotations. If `pairs`
+    is set, the JSON objects of the value are tuples of (key, value) pairs
+    rather than dictionaries, see decode.
+
+    `schema` is either:
+
+    - a dataclass, built with its fields (unknown keys ignored, missing
+      ones left to their defaults),
+    - a class with __slots__, built without calling __init__, each slot set
+      from the key of the same name (None if missing),
+    - a TypedDict (or any dict subclass with annotations), built as a plain
+      dictionary of its declared keys,
+    - a List, Dict or Optional of the above, or a plain type, left as is.
+
+    Annotations of nested values are followed, e.g a `List[Address]` field
+    is built as a list of Address.
+    """
+    key = (schema, pairs)
+    try:
+        return _loaders[key]
+    except (KeyError, TypeError):
+        pass
+    if isinstance(schema, type):
+        # a class referring to itself, e.g a tree, loads through this until
+        # compiled
+        _loaders[key] = lambda value: _loaders[key](value)
+    load = _compile(schema, pairs)
+    try:
+        _loaders[key] = load
+    except TypeError:
+        # e.g some typing constructs of older Python versions
+        pass
+    return load
+
+
+def _identity(value):
+    return value
+
+
+def _plain(value):
+    """Return `value`, its objects decoded as pairs made dictionaries."""
+    if isinstance(value, tuple):
+        return {k: _plain(v) for k, v in value}
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+def _compile(schema, pairs):
+    untyped = _plain if pairs else _identity
+    origin = getattr(schema, "__origin__", None)
+    if origin is not None:
+        return _compile_generic(origin, getattr(schema, "__args__", ()), pairs)
+    if not isinstance(schema, type):
+        return untyped
+    if schema in _SCALARS:
+        return _identity
+    if dataclasses is not None and dataclasses.is_dataclass(schema):
+        return _compile_dataclass(schema, pairs)
+    if issubclass(schema, dict) and getattr(schema, "__annotations__", None):
+        return _compile_typeddict(schema, pairs)
+    if _slots(schema):
+        return _compile_slots(schema, pairs)
+    return untyped
+
+
+def _compile_generic(origin, args, pairs):
+    untyped = _plain if pairs else _identity
+    if origin is typing.Union:
+        types = [a for a in args if a is not type(None)]  # noqa: E721
+        # a value of several types is left as is
+        return loader(types[0], pairs) if len(types) == 1 else untyped
+    if origin in (list, typing.List) and args:
+        item = loader(args[0], pairs)
+        if item is _identity or item is untyped:
+            return item
+        return lambda value: None if value is None else [item(v) for v in value]
+    if origin in (dict, typing.Dict) and len(args) == 2:
+        item = loader(args[1], pairs)
+        if item is untyped or (item is _identity and not pairs):
+            return item
+        if item is _identity:
+            return lambda value: None if value is None else dict(value)
+        if pairs:
+            return lambda value: (
+                None if value is None else {k: item(v) for k, v in value}
+            )
+        return lambda value: (
+            None if value is None else {k: item(v) for k, v in value.items()}
+        )
+    return untyped
+
+
+def _fields(schema, names, pairs):
+    """Return the loader of every one of `names`, by name, from the
+    annotations of `schema`."""
+    try:
+        hints = typing.get_type_hints(schema)
+    except Exception:
+        # e.g annotations referring to names out of scope
+        hints = {}
+    return {name: loader(hints.get(name), pairs) for name in names}
+
+
+def _compile_dataclass(schema, pairs):
+    names = [f.name for f in dataclasses.fields(schema) if f.init]
+    fields = _fields(schema, names, pairs)
+
+    if pairs:
+
+        def load(value):
+            if value is None:
+                return None
+            return schema(
+                **{name: fields[name](v) for name, v in value if name in fields}
+            )
+
+    else:
+
+        def load(value):
+            if value is None:
+                return None
+            return schema(
+                **{
+                    name: field(value[name])
+                    for name, field in fields.items()
+                    if name in value
+                }
+            )
+
+    return load
+
+
+def _compile_typeddict(schema, pairs):
+    fields = _fields(schema, list(typing.get_type_hints(schema)), pairs)
+
+    if pairs:
+
+        def load(value):
+            if value is None:
+                return None
+            return {name: fields[name](v) for name, v in value if name in fields}
+
+    else:
+
+        def load(value):
+            if value is None:
+                return None
+            return {
+                name: field(value[name])
+                for name, field in fields.items()
+                if name in value
+            }
+
+    return load
+
+
+def _slots(schema):
+    """Return the names of the slots of `schema`, and of its bases."""
+    names = []
+    for cls in reversed(schema.__mro__):
+        slots = cls.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names += [s for s in slots if s not in ("__dict__", "__weakref__")]
+    return names
+
+
+def _compile_slots(schema, pairs):
+    fields = _fields(schema, _slots(schema), pairs)
+    new = schema.__new__
+    setattr_ = object.__setattr__
+
+    if pairs:
+
+        def load(value):
+            if value is None:
+                return None
+            obj = new(schema)
+            for name in fields:
+                setattr_(obj, name, None)
+            for name, item in value:
+                field = fields.get(name)
+                if field is not None:
+                    setattr_(obj, name, None if item is None else field(item))
+            return obj
+
+    else:
+
+        def load(value):
+            if value is None:
+                return None
+            obj = new(schema)
+            for name, field in fields.items():
+                item = value.get(name)
+                setattr_(obj, name, None if item is None else field(item))
+            return obj
+
+    return load
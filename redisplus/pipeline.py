@@ -0,0 +1,218 @@
+from redis.client import Pipeline as RedisPipeline
+
+from .autopipeline import parse
+from .instrumentation import timed_commands
+
+# (name, bases, timed command mixin) -> class
+_composed = {}
+
+
+def composed(name, bases, commands=None):
+    """
+    Return a class named `name` deriving from `bases`, built once and reused.
+
+    If set, the public methods of the command mixin `commands` are wrapped
+    to report the time spent building commands, to the instrumentation of
+    the instance they are called on (see redisplus.instrumentation).
+    """
+    key = (name, bases, commands)
+    try:
+        return _composed[key]
+    except KeyError:
+        pass
+    attrs = {"__module__": __name__}
+    if commands is not None:
+        attrs.update(timed_commands(commands))
+    cls = _composed[key] = type(name, bases, attrs)
+    return cls
+
+
+class PipelineMixin:
+    """
+    Queue module commands to a redis-py pipeline, and parse their replies.
+
+    Every queued command has an entry in `postprocessors`: the function its
+    reply is passed through once the pipeline is executed, or None for
+    replies returned as they are (e.g replies already parsed by a response
+    callback, or native redis commands).
+
+    Commands of any module can be queued together, through the feature
+    namespaces (e.g `pipe.json`, `pipe.tf`, `pipe.ai`), which mirror the ones
+    of redisplus.Client:
+
+    >>> pipe = rc.pipeline(transaction=False)
+    >>> pipe.json.set("doc", ".", {"views": 1})
+    >>> pipe.tf.add("doc:views", "*", 1)
+    >>> pipe.ai.tensorget("doc:embedding")
+    >>> pipe.execute()
+    """
+
+    # the Instrumentation recording the commands queued, None when disabled
+    instrumentation = None
+
+    def __init__(self, *args, **kwargs):
+        self.postprocessors = []
+        super().__init__(*args, **kwargs)
+
+    def pipeline_execute_command(self, *args, **options):
+        self.postprocessors.append(None)
+        return super().pipeline_execute_command(*args, **options)
+
+    def _execute_and_parse(self, parse, *args, **kwargs):
+        """Queue the command, its reply to be passed through `parse`."""
+        if self.instrumentation is not None:
+            parse = self.instrumentation.parser(args[0], parse)
+        queued = len(self.command_stack)
+        reply = self.execute_command(*args, **kwargs)
+        if len(self.command_stack) == queued:
+            # sent at once, the pipeline is watching keys
+            return self._parse_reply(reply, parse)
+        self.postprocessors[-1] = parse
+        return self
+
+    def _execute_by_slot(self, command, keys, build, **options):
+        """Queue the multi-key `command` over `keys`, as a single command."""
+        return self.execute_command(command, *build(range(len(keys))), **options)
+
+    def _parse_reply(self, reply, parse):
+        return parse(reply)
+
+    @staticmethod
+    def _postprocess(replies, postprocessors):
+        """Pass each reply through its post processor, errors aside."""
+        return [
+            (
+                parse(reply)
+                if parse is not None and not isinstance(reply, Exception)
+                else reply
+            )
+            for reply, parse in zip(replies, postprocessors)
+        ]
+
+    def __getattr__(self, name):
+        # the state read by the module commands mixed in (e.g the index name
+        # of search commands), is the one of the feature the pipeline is for
+        feature = self.__dict__.get("_feature")
+        if feature is None:
+            raise AttributeError(
+                "'{}' object has no attribute '{}'".format(type(self).__name__, name)
+            )
+        return getattr(feature, name)
+
+    def feature(self, name):
+        """Return the commands of the client's feature `name`, queued to
+        this pipeline."""
+        client = self.__dict__.get("_client")
+        if client is None:
+            raise AttributeError("Unknown feature {}".format(name))
+        return client.feature(name)._piped(self)
+
+    @property
+    def json(self):
+        """For queueing json commands."""
+        return self.feature("json")
+
+    @property
+    def bf(self):
+        """For queueing bloom commands."""
+        return self.feature("bf")
+
+    @property
+    def cms(self):
+        """For queueing bloom commands."""
+        return self.feature("cms")
+
+    @property
+    def topk(self):
+        """For queueing bloom commands."""
+        return self.feature("topk")
+
+    @property
+    def cf(self):
+        """For queueing bloom commands."""
+        return self.feature("cf")
+
+    @property
+    def tdigest(self):
+        """For queueing bloom commands."""
+        return self.feature("tdigest")
+
+    @property
+    def tf(self):
+        """For queueing timeseries commands."""
+        return self.feature("tf")
+
+    @property
+    def ai(self):
+        """For queueing ai commands."""
+        return self.feature("ai")
+
+    @property
+    def ft(self):
+        """For queueing search commands."""
+        return self.feature("ft")
+
+    @property
+    def graph(self):
+        """For queueing graph commands."""
+        return self.feature("graph")
+
+
+class Pipeline(PipelineMixin, RedisPipeline):
+    """A redis-py pipeline, parsing the replies of module commands."""
+
+    def reset(self):
+        self.postprocessors = []
+        super().reset()
+
+    def execute(self, raise_on_error=True):
+        postprocessors = self.postprocessors
+        cache = self._near_cache()
+        if cache is None:
+            return self._postprocess(super().execute(raise_on_error), postprocessors)
+        written = [args for args, _ in self.command_stack]
+        try:
+            replies = super().execute(raise_on_error)
+        finally:
+            cache.drop_written(written)
+        return self._postprocess(replies, postprocessors)
+
+    def _near_cache(self):
+        """Return the NearCache of the feature, or client, the pipeline was
+        built by, if any."""
+        owner = self.__dict__.get("_feature")
+        if owner is None:
+            owner = self.__dict__.get("_client")
+        return getattr(owner, "cache", None)
+
+
+class Queued(object):
+    """
+    The commands of a feature, queued to a pipeline rather than sent.
+
+    Subclassed together with the feature's command mixin (see
+    AbstractFeature._piped), every other attribute is read from the feature.
+    """
+
+    def __init__(self, pipeline, feature):
+        self._pipe = pipeline
+        self._feature = feature
+
+    def __getattr__(self, name):
+        return getattr(self._feature, name)
+
+    def execute_command(self, *args, **kwargs):
+        # parsed with the feature's callback, the pipeline's are the client's
+        callbacks = getattr(self._feature, "MODULE_CALLBACKS", {})
+        callback = callbacks.get(args[0])
+        if callback is None:
+            return self._pipe.execute_command(*args, **kwargs)
+        return self._pipe._execute_and_parse(
+            lambda reply: parse(callback, reply, kwargs), *args, **kwargs
+        )
+
+    def _execute_and_parse(self, parse, *args, **kwargs):
+        return self._pipe._execute_and_parse(parse, *args, **kwargs)
+
+    def _execute_by_slot(self, command, keys, build, **options):
+        return self.execute_command(command, *build(range(len(keys))), **options)
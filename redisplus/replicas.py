@@ -0,0 +1,165 @@
+import itertools
+import threading
+
+from redis.exceptions import ConnectionError, TimeoutError
+
+# the module commands that only read, and may be served by a replica
+READ_COMMANDS = frozenset(
+    [
+        "JSON.GET",
+        "JSON.MGET",
+        "JSON.TYPE",
+        "JSON.STRLEN",
+        "JSON.ARRLEN",
+        "JSON.ARRINDEX",
+        "JSON.OBJKEYS",
+        "JSON.OBJLEN",
+        "JSON.RESP",
+        "JSON.DEBUG",
+        "TS.GET",
+        "TS.MGET",
+        "TS.RANGE",
+        "TS.REVRANGE",
+        "TS.MRANGE",
+        "TS.MREVRANGE",
+        "TS.INFO",
+        "TS.QUERYINDEX",
+        "FT.SEARCH",
+        "FT.AGGREGATE",
+        "FT.GET",
+        "FT.MGET",
+        "FT.EXPLAIN",
+        "FT.INFO",
+        "FT.TAGVALS",
+        "FT.SPELLCHECK",
+        "FT.SUGGET",
+        "FT.SUGLEN",
+        "FT.DICTDUMP",
+        "FT.SYNDUMP",
+        "BF.EXISTS",
+        "BF.MEXISTS",
+        "BF.INFO",
+        "BF.SCANDUMP",
+        "CF.EXISTS",
+        "CF.COUNT",
+        "CF.INFO",
+        "CF.SCANDUMP",
+        "CMS.QUERY",
+        "CMS.INFO",
+        "TOPK.QUERY",
+        "TOPK.COUNT",
+        "TOPK.LIST",
+        "TOPK.INFO",
+        "TDIGEST.MIN",
+        "TDIGEST.MAX",
+        "TDIGEST.QUANTILE",
+        "TDIGEST.CDF",
+        "TDIGEST.INFO",
+        "GRAPH.RO_QUERY",
+        "GRAPH.EXPLAIN",
+        "AI.TENSORGET",
+        "AI.MODELGET",
+        "AI.SCRIPTGET",
+        "AI.DAGRUN_RO",
+        "AI.DAGEXECUTE_RO",
+    ]
+)
+
+# errors after which a read is sent to the primary instead
+FALLBACK_ERRORS = (ConnectionError, TimeoutError)
+
+
+class ReplicaRouterMixin:
+    """Choose the replica each read is sent to, see ReplicaRouter."""
+
+    strategies = ("round_robin", "least_outstanding")
+
+    def __init__(
+        self, primary, replicas, strategy="round_robin", read_commands=READ_COMMANDS
+    ):
+        if not replicas:
+            raise ValueError("At least one replica is required")
+        if strategy not in self.strategies:
+            raise ValueError(
+                "Unknown strategy {}, expected one of {}".format(
+                    strategy, ", ".join(self.strategies)
+                )
+            )
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.strategy = strategy
+        self.read_commands = read_commands
+        # module replies are parsed by the response callbacks the features
+        # install on the primary, whichever server sent them
+        for replica in self.replicas:
+            replica.response_callbacks = primary.response_callbacks
+
+        # commands in flight, per replica
+        self.outstanding = [0] * len(self.replicas)
+        # reads sent to the primary, after a replica failed
+        self.fallbacks = 0
+        self._next = itertools.count()
+
+    def routes(self, args):
+        """Whether the command `args` is a read, sent to a replica."""
+        command = args[0]
+        if isinstance(command, bytes):
+            command = command.decode()
+        command = command.upper()
+        if command not in self.read_commands:
+            return False
+        # cursors only live on the server that created them, and are read
+        # with FT.CURSOR, which is sent to the primary
+        return not (command == "FT.AGGREGATE" and "WITHCURSOR" in args)
+
+    def _choose(self):
+        """Return the position of the replica the next read goes to."""
+        if self.strategy == "round_robin":
+            return next(self._next) % len(self.replicas)
+        # ties are broken round robin, so idle replicas all get reads
+        n = len(self.replicas)
+        start = next(self._next) % n
+        return min(
+            ((start + k) % n for k in range(n)), key=self.outstanding.__getitem__
+        )
+
+
+class ReplicaRouter(ReplicaRouterMixin):
+    """
+    Send the read-only module commands to replicas, the rest to the primary.
+
+    Reads (see READ_COMMANDS, e.g JSON.GET, TS.MRANGE, FT.SEARCH, BF.EXISTS,
+    or graph queries with read_only=True) are balanced across `replicas`,
+    either in turn ("round_robin"), or to the replica with the fewest
+    commands in flight ("least_outstanding"). A read failing with a
+    connection error, or a timeout, is sent again to the primary.
+
+    Replicas are asynchronous copies of the primary: a read sent right after
+    a write may not see it. Reads that must, can be sent from a pipeline,
+    which always runs on the primary.
+
+    :param primary: The redis client reads fall back to.
+    :param replicas: The redis clients of the replicas. Their response
+                     callbacks are replaced by the primary's.
+    :param strategy: "round_robin" or "least_outstanding".
+    :param read_commands: The names of the commands sent to replicas.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+
+    def execute_command(self, *args, **options):
+        """Send the read `args` to a replica, or to the primary on failure."""
+        with self._lock:
+            i = self._choose()
+            self.outstanding[i] += 1
+        try:
+            return self.replicas[i].execute_command(*args, **options)
+        except FALLBACK_ERRORS:
+            with self._lock:
+                self.fallbacks += 1
+            return self.primary.execute_command(*args, **options)
+        finally:
+            with self._lock:
+                self.outstanding[i] -= 1
@@ -307,7 +307,12 @@ class CommandMixin:
         """
         Load a single document by id.
         """
-        fields = self.client.hgetall(id)
+        return self._execute_and_parse(
+            lambda fields: self._parse_document(id, fields), "HGETALL", id
+        )
+
+    @staticmethod
+    def _parse_document(id, fields):
         if six.PY3:
             f2 = {to_string(k): to_string(v) for k, v in fields.items()}
             fields = f2
@@ -328,9 +333,15 @@ class CommandMixin:
 
         ids : list
             The ids of the saved documents.
-        """
 
-        return self.client.execute_command(MGET_CMD, self.index_name, *ids)
+        On a cluster, documents are fetched with one FT.MGET per hash slot,
+        sent to the node owning the slot.
+        """
+        return self._execute_by_slot(
+            MGET_CMD,
+            ids,
+            lambda positions: [self.index_name] + [ids[i] for i in positions],
+        )
 
     def info(self):
         """
@@ -338,7 +349,10 @@ class CommandMixin:
         For more information see `FT.INFO <https://oss.redis.com/redisearch/master/Commands/#ftinfo>`_.
         """
 
-        res = self.client.execute_command(INFO_CMD, self.index_name)
+        return self._execute_and_parse(self._parse_info, INFO_CMD, self.index_name)
+
+    @staticmethod
+    def _parse_info(res):
         it = six.moves.map(to_string, res)
         return dict(six.moves.zip(it, it))
 
@@ -366,16 +380,18 @@ class CommandMixin:
             or a Query object for complex queries.
         """
         args, query = self._mk_query_args(query)
-        st = time.time()
-        res = self.execute_command(SEARCH_CMD, *args)
-
-        return Result(
-            res,
-            not query._no_content,
-            duration=(time.time() - st) * 1000.0,
-            has_payload=query._with_payloads,
-            with_scores=query._with_scores,
-        )
+        st = time.perf_counter()
+
+        def parse(res):
+            return Result(
+                res,
+                not query._no_content,
+                duration=(time.perf_counter() - st) * 1000.0,
+                has_payload=query._with_payloads,
+                with_scores=query._with_scores,
+            )
+
+        return self._execute_and_parse(parse, SEARCH_CMD, *args)
 
     def explain(self, query):
         """
@@ -412,7 +428,12 @@ class CommandMixin:
         else:
             raise ValueError("Bad query", query)
 
-        raw = self.execute_command(*cmd)
+        return self._execute_and_parse(
+            lambda raw: self._parse_aggregate(query, has_cursor, raw), *cmd
+        )
+
+    @staticmethod
+    def _parse_aggregate(query, has_cursor, raw):
         if has_cursor:
             if isinstance(query, Cursor):
                 query.cid = raw[1]
@@ -457,8 +478,10 @@ class CommandMixin:
         if exclude:
             cmd.extend(["TERMS", "EXCLUDE", exclude])
 
-        raw = self.execute_command(*cmd)
+        return self._execute_and_parse(self._parse_spellcheck, *cmd)
 
+    @staticmethod
+    def _parse_spellcheck(raw):
         corrections = {}
         if raw == 0:
             return corrections
@@ -553,8 +576,7 @@ class CommandMixin:
             A value for the configuration option.
         """
         cmd = [CONFIG_CMD, "SET", option, value]
-        raw = self.execute_command(*cmd)
-        return raw == "OK"
+        return self._execute_and_parse(lambda raw: raw == "OK", *cmd)
 
     def config_get(self, option):
         """
@@ -567,8 +589,11 @@ class CommandMixin:
             The name of the configuration option.
         """
         cmd = [CONFIG_CMD, "GET", option]
+        return self._execute_and_parse(self._parse_config_get, *cmd)
+
+    @staticmethod
+    def _parse_config_get(raw):
         res = {}
-        raw = self.execute_command(*cmd)
         if raw:
             for kvs in raw:
                 res[kvs[0]] = kvs[1]
@@ -640,7 +665,7 @@ class CommandMixin:
 
             pipe.execute_command(*args)
 
-        return pipe.execute()[-1]
+        return self._parse_reply(pipe.execute(), lambda res: res[-1])
 
     def suglen(self, key):
         """
@@ -694,7 +719,12 @@ class CommandMixin:
         if with_payloads:
             args.append(WITHPAYLOADS)
 
-        ret = self.execute_command(*args)
+        return self._execute_and_parse(
+            lambda ret: self._parse_sugget(with_scores, with_payloads, ret), *args
+        )
+
+    @staticmethod
+    def _parse_sugget(with_scores, with_payloads, ret):
         results = []
         if not ret:
             return results
@@ -732,5 +762,8 @@ class CommandMixin:
         Returns a list of synonym terms and their synonym group ids.
         For more information see `FT.SYNDUMP <https://oss.redis.com/redisearch/master/Commands/#ftsyndump>`_.
         """
-        raw = self.execute_command(SYNDUMP_CMD, self.index_name)
-        return {raw[i]: raw[i + 1] for i in range(0, len(raw), 2)}
+        return self._execute_and_parse(
+            lambda raw: {raw[i]: raw[i + 1] for i in range(0, len(raw), 2)},
+            SYNDUMP_CMD,
+            self.index_name,
+        )
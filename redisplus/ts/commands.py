@@ -137,14 +137,19 @@ class CommandMixin:
         Append (or create and append) a new `value` to series `key` with `timestamp`.
         Expects a list of `tuples` as (`key`,`timestamp`, `value`).
         Return value is an array with timestamps of insertions.
+        On a cluster, samples are added with one TS.MADD per hash slot.
         For more information see `TS.MADD <https://oss.redis.com/redistimeseries/master/commands/#tsmadd>`_.
         """
-        params = []
-        for ktv in ktv_tuples:
-            for item in ktv:
-                params.append(item)
+        ktv_tuples = list(ktv_tuples)
+
+        def params(positions):
+            pieces = []
+            for pos in positions:
+                for item in ktv_tuples[pos]:
+                    pieces.append(item)
+            return pieces
 
-        return self.execute_command(MADD_CMD, *params)
+        return self._execute_by_slot(MADD_CMD, [ktv[0] for ktv in ktv_tuples], params)
 
     def incrby(self, key, value, **kwargs):
         """
@@ -1,4 +1,5 @@
 from redis import Redis
+from redis.exceptions import ConnectionError
 import pytest
 
 # to allow us to run all tests that have no markings as -m unmarked
@@ -8,6 +9,43 @@ def pytest_collection_modifyitems(items, config):
             item.add_marker("unmarked")
 
 
+def json_reply(args):
+    """Reply a JSON document to JSON.GET, OK to anything else."""
+    return b'{"a": 1}' if args[0] == "JSON.GET" else b"OK"
+
+
+class FakeRedis(Redis):
+    """
+    Replies to the commands sent without a server, through the client's
+    response callbacks: with `reply(args)` if `reply` is a function, with
+    `reply` itself otherwise. Records the commands sent in `sent`, and fails
+    every command with a connection error while `down`.
+    """
+
+    def __init__(self, reply=json_reply, down=False):
+        super().__init__()
+        self.reply = reply
+        self.down = down
+        self.sent = []
+
+    def execute_command(self, *args, **options):
+        if self.down:
+            raise ConnectionError("down")
+        self.sent.append(args)
+        reply = self.reply(args) if callable(self.reply) else self.reply
+        callback = self.response_callbacks.get(args[0])
+        if callback is None:
+            return reply
+        return callback(reply, **options)
+
+
+@pytest.fixture
+def fake_redis():
+    """Return the FakeRedis class, e.g fake_redis(b'"bar"') for a client
+    replying "bar" to JSON.GET."""
+    return FakeRedis
+
+
 def skip_ifmodversion_lt(min_version: str, module_name: str):
     rc = Redis()
     modules = rc.execute_command("module list")
@@ -0,0 +1,90 @@
+from redis import Redis
+from redis.exceptions import ConnectionError
+from redisplus.graph import Edge, Graph, Node
+from redisplus.graph.bulk import LoadReport
+import pytest
+
+
+class Result:
+    def __init__(self, result_set):
+        self.result_set = result_set
+
+
+class LoadedGraph(Graph):
+    """Creates nodes with increasing ids, failing the query `fail_at`."""
+
+    def __init__(self, fail_at=None):
+        super().__init__(Redis(), "loaded")
+        self.fail_at = fail_at
+        self.queries = []
+        self.next_id = 0
+
+    def query(self, q, params=None, *args, **kwargs):
+        if len(self.queries) == self.fail_at:
+            self.fail_at = None
+            raise ConnectionError()
+        self.queries.append((q, params))
+        if "RETURN id(n)" not in q:
+            return Result([])
+        start, self.next_id = self.next_id, self.next_id + len(params["rows"])
+        return Result([[i] for i in range(start, self.next_id)])
+
+
+def people(g):
+    alice = Node(alias="alice", label="Person", properties={"name": "alice"})
+    bob = Node(alias="bob", label="Person", properties={"name": "bob", "age": 3})
+    paris = Node(alias="paris", label="City")
+    for node in (alice, bob, paris):
+        g.add_node(node)
+    g.add_edge(Edge(alice, "KNOWS", bob, properties={"since": 2020}))
+    g.add_edge(Edge(bob, "LIVES_IN", paris))
+    g.add_edge(Edge(alice, "LIVES_IN", paris))
+
+
+@pytest.mark.graph
+def test_bulk_create():
+    g = LoadedGraph()
+    people(g)
+    report = g.bulk_create(batch_size=2)
+    assert (report.nodes, report.edges, report.batches) == (3, 3, 4)
+    assert report.ids == {"alice": 0, "bob": 1, "paris": 2}
+    assert [q for q, _ in g.queries] == [
+        "UNWIND $rows AS r CREATE (n:`Person` {`age`: r.`age`, `name`: r.`name`}) "
+        "RETURN id(n)",
+        "UNWIND $rows AS r CREATE (n:`City`) RETURN id(n)",
+        "UNWIND $rows AS r MATCH (a), (b) WHERE id(a) = r[0] AND id(b) = r[1] "
+        "CREATE (a)-[:`LIVES_IN`]->(b)",
+        "UNWIND $rows AS r MATCH (a), (b) WHERE id(a) = r[0] AND id(b) = r[1] "
+        "CREATE (a)-[:`KNOWS` {`since`: r[2].`since`}]->(b)",
+    ]
+    assert g.queries[2][1] == {"rows": [[1, 2, {}], [0, 2, {}]]}
+    assert g.queries[3][1] == {"rows": [[0, 1, {"since": 2020}]]}
+
+
+@pytest.mark.graph
+def test_bulk_create_resumes():
+    g = LoadedGraph(fail_at=2)
+    people(g)
+    report = LoadReport()
+    with pytest.raises(ConnectionError):
+        g.bulk_create(batch_size=2, report=report)
+    assert report.batches == 2
+    g.bulk_create(batch_size=2, report=report)
+    assert (report.nodes, report.edges, report.batches) == (3, 3, 4)
+    assert report.ids == {"alice": 0, "bob": 1, "paris": 2}
+    assert len(g.queries) == 4
+    assert report.seconds > 0
+
+
+@pytest.mark.graph
+def test_bulk_create_edges_by_id():
+    g = LoadedGraph()
+    report = g.bulk_create(edges=[Edge(7, "KNOWS", Node(node_id=8))])
+    assert report.edges == 1 and g.queries[0][1] == {"rows": [[7, 8, {}]]}
+
+    with pytest.raises(ValueError):
+        g.bulk_create(edges=[Edge(Node(), "KNOWS", Node())])
+    with pytest.raises(ValueError):
+        g.bulk_create(edges=[Edge(1, None, 2)])
+    with pytest.raises(ValueError):
+        g.bulk_create(nodes=[Node()], batch_size=0)
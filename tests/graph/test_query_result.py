@@ -0,0 +1,180 @@
+from redis import Redis
+from redisplus.graph import Graph, edge, node, path
+from redisplus.graph.query_result import (
+    ColumnarQueryResult,
+    EntityMap,
+    LazyQueryResult,
+    QueryResult,
+)
+import numpy as np
+import pytest
+
+STATISTICS = [b"Nodes created: 2", b"Query internal execution time: 0.5 milliseconds"]
+
+
+@pytest.fixture
+def graph():
+    g = Graph(Redis(), "g")
+    g._labels = ["Person"]
+    g._relationshipTypes = ["KNOWS"]
+    g._properties = ["name", "age"]
+    return g
+
+
+def result(graph, header, rows):
+    return QueryResult(graph, [header, rows, STATISTICS])
+
+
+@pytest.mark.graph
+def test_parse_scalars(graph):
+    header = [[1, b"a"], [1, b"b"], [1, b"c"]]
+    rows = [
+        [[3, 1], [2, b"x"], [5, b"0.5"]],
+        [[4, b"true"], [1, None], [11, [b"1.5", b"2"]]],
+        [[b"3", 2], [0, b"?"], [99, b"?"]],
+    ]
+    res = result(graph, header, rows)
+    assert res.result_set == [
+        [1, "x", 0.5],
+        [True, None, {"latitude": 1.5, "longitude": 2.0}],
+        [2, None, None],
+    ]
+    assert res.nodes_created == 2
+    assert res.run_time_ms == 0.5
+
+
+@pytest.mark.graph
+def test_parse_entities(graph):
+    alice = [0, [0], [[0, 2, b"alice"], [1, 3, 33]]]
+    bob = [1, [], [[0, 2, b"bob"]]]
+    knows = [5, 0, 0, 1, [[1, 3, 2020]]]
+    header = [[1, b"n"], [1, b"e"], [1, b"p"], [1, b"m"]]
+    cells = [
+        [8, alice],
+        [7, knows],
+        [9, [[6, [[8, alice], [8, bob]]], [6, [[7, knows]]]]],
+        [10, [b"k", [6, [[3, 1], [4, b"false"]]]]],
+    ]
+    (row,) = result(graph, header, [cells]).result_set
+
+    expected_alice = node.Node(
+        node_id=0, label="Person", properties={"name": "alice", "age": 33}
+    )
+    expected_knows = edge.Edge(0, "KNOWS", 1, edge_id=5, properties={"age": 2020})
+    assert row[0] == expected_alice
+    assert row[1] == expected_knows
+    assert row[2] == path.Path(
+        [expected_alice, node.Node(node_id=1, properties={"name": "bob"})],
+        [expected_knows],
+    )
+    assert row[3] == {"k": [1, False]}
+
+
+@pytest.mark.graph
+def test_interned_entities(graph):
+    alice = [8, [0, [0], [[0, 2, b"alice"]]]]
+    knows = [7, [5, 0, 0, 1, []]]
+    header = [[1, b"n"], [1, b"e"], [1, b"p"]]
+    path_cell = [9, [[6, [alice, [8, [1, [], []]]]], [6, [knows]]]]
+    rows = [[alice, knows, path_cell], [alice, knows, path_cell]]
+    first, second = result(graph, header, rows).result_set
+    assert first[0] is second[0] is first[2].first_node()
+    assert first[1] is second[1] is first[2].get_relationship(0)
+
+    entities = EntityMap()
+    one = QueryResult(graph, [header, rows[:1], STATISTICS], entities=entities)
+    two = QueryResult(graph, [header, rows[1:], STATISTICS], entities=entities)
+    assert one.result_set[0][0] is two.result_set[0][0]
+    assert len(entities) == 3
+    entities.clear()
+    assert len(entities) == 0
+
+    lazy = LazyQueryResult(graph, [header, [list(r) for r in rows], STATISTICS])
+    assert lazy.entities is None
+    assert next(lazy)[0] is not next(lazy)[0]
+
+    with pytest.raises(AttributeError):
+        first[0].color = "red"
+
+
+@pytest.mark.graph
+def test_parse_unknown_column(graph):
+    with pytest.warns(UserWarning):
+        res = result(graph, [[7, b"a"], [1, b"b"]], [[b"?", [3, 1]]])
+    assert res.result_set == [[None, 1]]
+
+
+@pytest.mark.graph
+def test_lazy_result(graph):
+    rows = [[[3, i]] for i in range(3)]
+    res = LazyQueryResult(graph, [[[1, b"i"]], rows, STATISTICS])
+    assert res.result_set == [] and not res.is_empty()
+    assert next(res) == [0]
+    assert rows[0] is None
+    assert list(res) == [[1], [2]]
+    assert res.is_empty()
+    assert LazyQueryResult(graph, [STATISTICS]).is_empty()
+
+
+class PagedGraph(Graph):
+    """Replies to queries with pages of the numbers below `count`."""
+
+    def __init__(self, count):
+        super().__init__(Redis(), "paged")
+        self.count = count
+        self.queries = []
+
+    def execute_command(self, *args, **kwargs):
+        self.queries.append(args[2])
+        skip, limit = map(int, args[2].split(" SKIP ")[1].split(" LIMIT "))
+        numbers = range(skip, min(skip + limit, self.count))
+        return [[[1, b"n"]], [[[3, n]] for n in numbers], STATISTICS]
+
+
+@pytest.mark.graph
+def test_paginate():
+    g = PagedGraph(5)
+    assert list(g.paginate("MATCH (n) RETURN n", page_size=2)) == [
+        [n] for n in range(5)
+    ]
+    assert g.queries[-1] == "MATCH (n) RETURN n SKIP 4 LIMIT 2"
+    assert isinstance(g.query("RETURN 1 SKIP 0 LIMIT 1", lazy=True), LazyQueryResult)
+
+    g = PagedGraph(4)
+    assert len(list(g.paginate("MATCH (n) RETURN n", page_size=2))) == 4
+    assert len(g.queries) == 3
+    with pytest.raises(ValueError):
+        next(g.paginate("RETURN 1", page_size=0))
+
+
+@pytest.mark.graph
+def test_columnar_result(graph):
+    header = [[1, b"i"], [1, b"d"], [1, b"b"], [1, b"s"], [1, b"m"], [1, b"n"]]
+    rows = [
+        [[3, 1], [5, b"0.5"], [4, b"true"], [2, b"x"], [3, 1], [8, [0, [], []]]],
+        [[3, 2], [1, None], [4, b"false"], [2, b"y"], [2, b"z"], [8, [1, [], []]]],
+    ]
+    res = ColumnarQueryResult(graph, [header, rows, STATISTICS])
+    assert list(res.columns) == ["i", "d", "b", "s", "m", "n"]
+    assert res.columns["i"].dtype == np.int64
+    assert res.columns["i"].tolist() == [1, 2]
+    assert res.columns["d"][0] == 0.5 and np.isnan(res.columns["d"][1])
+    assert res.columns["b"].tolist() == [True, False]
+    assert res.columns["s"] == ["x", "y"]
+    assert res.columns["m"] == [1, "z"]
+    assert [n.id for n in res.columns["n"]] == [0, 1]
+    assert res.result_set == [] and not res.is_empty()
+    assert res.nodes_created == 2
+
+    res = ColumnarQueryResult(graph, [[[1, b"i"]], [], STATISTICS])
+    assert res.columns == {"i": []} and res.is_empty()
+    assert ColumnarQueryResult(graph, [STATISTICS]).is_empty()
+
+
+@pytest.mark.graph
+def test_columnar_query():
+    g = PagedGraph(3)
+    res = g.query("MATCH (n) RETURN n SKIP 0 LIMIT 10", columnar=True)
+    assert res.columns["n"].tolist() == [0, 1, 2]
+    with pytest.raises(ValueError):
+        g.query("RETURN 1", lazy=True, columnar=True)
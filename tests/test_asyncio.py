@@ -0,0 +1,125 @@
+import asyncio
+import pytest
+import redisplus.asyncio.json
+import redisplus.asyncio.search
+from redisplus.asyncio import Client
+from redisplus.graph import Node
+from redisplus.json.path import Path
+from redisplus.search.field import TextField
+from redis.asyncio import Redis
+
+# connections of the asyncio pool are bound to the loop they were made in
+loop = asyncio.new_event_loop()
+run = loop.run_until_complete
+
+
+@pytest.fixture
+def client():
+    rc = Client(Redis())
+    run(rc.flushdb())
+    return rc
+
+
+def test_async_features():
+    c = Client()
+    assert isinstance(c.client, Redis)
+    assert isinstance(c.json, redisplus.asyncio.json.JSON)
+    assert isinstance(c.ft, redisplus.asyncio.search.Search)
+    assert c.json is c.json
+
+
+@pytest.mark.integrations
+@pytest.mark.json
+def test_async_json(client):
+    async def scenario():
+        assert await client.json.set("foo", Path.rootPath(), {"a": [1, 2]})
+        assert await client.json.get("foo") == {"a": [1, 2]}
+        assert await client.json.arrappend("foo", Path("a"), 3) == 3
+        assert await client.json.get("baz") is None
+        assert await client.json.delete("foo") == 1
+
+    run(scenario())
+
+
+@pytest.mark.integrations
+@pytest.mark.json
+@pytest.mark.pipeline
+def test_async_json_pipeline(client):
+    async def scenario():
+        p = client.json.pipeline()
+        p.set("foo", Path.rootPath(), "bar")
+        p.get("foo")
+        p.delete("foo")
+        assert [True, "bar", 1] == await p.execute()
+
+    run(scenario())
+
+
+@pytest.mark.integrations
+@pytest.mark.timeseries
+def test_async_timeseries(client):
+    async def scenario():
+        assert await client.tf.create("ts")
+        await client.tf.add("ts", 1, 2.5)
+        assert await client.tf.get("ts") == (1, 2.5)
+        assert [(1, 2.5)] == await client.tf.range("ts", 0, 10)
+
+    run(scenario())
+
+
+@pytest.mark.integrations
+@pytest.mark.bloom
+def test_async_bloom(client):
+    async def scenario():
+        assert await client.bf.create("bloom", 0.01, 1000)
+        assert 1 == await client.bf.add("bloom", "foo")
+        assert 1 == await client.bf.exists("bloom", "foo")
+        assert 0 == await client.bf.exists("bloom", "bar")
+
+    run(scenario())
+
+
+@pytest.mark.integrations
+@pytest.mark.search
+def test_async_search(client):
+    async def scenario():
+        await client.ft.create_index((TextField("txt"),))
+        await client.ft.add_document("doc1", txt="foo bar")
+        await client.ft.add_document("doc2", txt="foo baz")
+        res = await client.ft.search("foo")
+        assert 2 == res.total
+        assert "foo" in (await client.ft.load_document("doc1")).txt
+
+    run(scenario())
+
+
+@pytest.mark.integrations
+@pytest.mark.graph
+def test_async_graph(client):
+    async def scenario():
+        graph = client.graph
+        graph.add_node(Node(label="person", properties={"name": "John"}))
+        await graph.commit()
+        res = await graph.query("MATCH (p:person) RETURN p")
+        assert res.result_set[0][0].properties == {"name": "John"}
+        assert res.result_set[0][0].label == "person"
+        await graph.delete()
+
+    run(scenario())
+
+
+@pytest.mark.integrations
+@pytest.mark.ai
+def test_async_ai(client):
+    async def scenario():
+        assert "OK" == await client.ai.tensorset("x", (2, 3), dtype="float")
+        values = await client.ai.tensorget("x", as_numpy=False)
+        assert [2.0, 3.0] == values["values"]
+
+        pipe = client.ai.pipeline(transaction=False)
+        pipe.tensorset("y", (4,), dtype="float")
+        pipe.tensorget("y", as_numpy=False)
+        res = await pipe.execute()
+        assert [4.0] == res[1]["values"]
+
+    run(scenario())
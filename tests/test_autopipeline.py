@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+import pytest
+from redis import Redis
+from redis.exceptions import ResponseError
+import redis.asyncio
+from redisplus import Client
+from redisplus.asyncio import Client as AsyncClient
+
+
+def reply(args):
+    """JSON.GET replies with the key as a document, failing for "bad", and
+    not JSON for "garbled"."""
+    if args[1] == "bad":
+        return ResponseError("bad key")
+    if args[1] == "garbled":
+        return "{"
+    return '"{}"'.format(args[1])
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.response_callbacks = client.response_callbacks
+        self.stack = []
+
+    def execute_command(self, *args, **options):
+        self.stack.append((args, options))
+        return self
+
+    def _replies(self):
+        self.client.batches.append(len(self.stack))
+        replies = []
+        for args, options in self.stack:
+            res = reply(args)
+            callback = self.response_callbacks.get(args[0])
+            if callback is not None and not isinstance(res, ResponseError):
+                res = callback(res, **options)
+            replies.append(res)
+        return replies
+
+    def execute(self, raise_on_error=True):
+        # let the other callers queue their commands meanwhile
+        time.sleep(0.01)
+        return self._replies()
+
+
+class FakeRedis(Redis):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return FakePipeline(self)
+
+
+class FakeAsyncPipeline(FakePipeline):
+    async def execute(self, raise_on_error=True):
+        return self._replies()
+
+
+class FakeAsyncRedis(redis.asyncio.Redis):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return FakeAsyncPipeline(self)
+
+
+@pytest.mark.json
+def test_autopipeline_threads():
+    client = Client(FakeRedis(), autopipeline=True)
+    results = {}
+
+    def get(key):
+        try:
+            results[key] = client.json.get(key)
+        except Exception as e:
+            results[key] = e
+
+    keys = ["key{}".format(i) for i in range(50)] + ["bad", "garbled"]
+    threads = [threading.Thread(target=get, args=(key,)) for key in keys]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for key in keys[:-2]:
+        assert results[key] == key
+    assert isinstance(results["bad"], ResponseError)
+    # the reply failing to parse fails its caller only
+    assert isinstance(results["garbled"], ValueError)
+    assert sum(client.client.batches) == len(keys)
+    assert len(client.client.batches) < len(keys) / 5
+    assert client.autopipeline.commands == len(keys)
+
+
+@pytest.mark.json
+def test_autopipeline_max_size():
+    client = Client(FakeRedis(), autopipeline={"window": 0.05, "max_size": 2})
+    assert client.json.get("a") == "a"
+    assert client.client.batches == [1]
+
+
+@pytest.mark.json
+def test_autopipeline_asyncio():
+    client = AsyncClient(FakeAsyncRedis(), autopipeline=True)
+
+    async def get_all():
+        return await asyncio.gather(
+            *[client.json.get(k) for k in ("a", "b", "bad", "garbled", "c")],
+            return_exceptions=True,
+        )
+
+    a, b, bad, garbled, c = asyncio.new_event_loop().run_until_complete(get_all())
+    assert (a, b, c) == ("a", "b", "c")
+    assert isinstance(bad, ResponseError)
+    assert isinstance(garbled, ValueError)
+    assert client.client.batches == [5]
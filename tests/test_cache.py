@@ -0,0 +1,169 @@
+import time
+import pytest
+from redis import Redis
+from redisplus import Client
+from redisplus.cache import NearCache, sizeof
+from redisplus.json.path import Path
+from .test_pipeline import FakePool, reply
+
+
+class UntrackedCache(NearCache):
+    """A NearCache invalidated by hand, rather than by a server, of every
+    key by default."""
+
+    def __init__(self, client, prefixes=("",), **options):
+        super().__init__(client, prefixes=prefixes, **options)
+
+    def _start(self):
+        self._tracking = True
+
+
+@pytest.fixture
+def fake(fake_redis):
+    client = Client(fake_redis())
+    client.cache = UntrackedCache(client.client)
+    return client
+
+
+@pytest.mark.json
+def test_cache_hits(fake):
+    assert fake.json.get("doc") == {"a": 1}
+    assert fake.json.get("doc") == {"a": 1}
+    assert fake.json.get("doc", Path("a")) == {"a": 1}
+    assert (fake.cache.hits, fake.cache.misses) == (1, 2)
+    assert len(fake.client.sent) == 2
+    assert len(fake.cache) == 2
+
+    # writes are not cached
+    fake.json.set("doc", Path.rootPath(), {"a": 2})
+    fake.json.set("doc", Path.rootPath(), {"a": 2})
+    assert len(fake.client.sent) == 4
+
+
+@pytest.mark.json
+def test_cache_dropped_on_write(fake):
+    fake.json.get("doc")
+    fake.json.set("doc", Path.rootPath(), {"a": 2})
+    assert len(fake.cache) == 0
+    fake.json.get("doc")
+    assert len(fake.client.sent) == 3
+
+    fake.cache.execute(lambda *args: 1, ("TS.GET", "b"), {})
+    fake.cache.drop_written([("TS.MADD", "a", 1, 1, "b", 1, 1)])
+    assert len(fake.cache) == 1
+
+    # reads not cached drop nothing
+    fake.cache.execute(lambda *args: 1, ("TS.GET", "b"), {})
+    fake.cache.execute(lambda *args: [], ("FT.SEARCH", "b", "*"), {})
+    fake.cache.drop_written([("TS.MRANGE", "b", "-", "+"), ("FT.AGGREGATE", "b")])
+    assert len(fake.cache) == 2
+
+
+@pytest.mark.json
+def test_cache_returns_copies(fake):
+    # shared, read-only, by default
+    assert fake.json.get("doc") is fake.json.get("doc")
+
+    fake.cache.copy = True
+    fake.cache.clear()
+    fake.json.get("doc")["a"] = 2
+    doc = fake.json.get("doc")
+    assert doc == {"a": 1}
+    doc["a"] = 3
+    assert fake.json.get("doc") == {"a": 1}
+
+
+@pytest.mark.json
+@pytest.mark.pipeline
+def test_cache_dropped_on_pipeline_write():
+    client = Client(Redis(connection_pool=FakePool(reply)))
+    client.cache = UntrackedCache(client.client)
+    client.cache.execute(lambda *args: {"a": 1}, ("JSON.GET", "doc", "."), {})
+    pipe = client.json.pipeline(transaction=False)
+    pipe.set("doc", Path.rootPath(), {"a": 2})
+    pipe.execute()
+    assert len(client.cache) == 0
+
+
+@pytest.mark.json
+def test_cache_invalidation(fake):
+    fake.json.get("doc")
+    fake.json.get("other")
+    fake.cache.invalidate([b"doc"])
+    assert len(fake.cache) == 1
+    assert fake.cache._index == {b"other": {(("JSON.GET", "other", "."), frozenset())}}
+
+    fake.json.get("doc")
+    assert fake.cache.misses == 3
+    fake.cache.invalidate(None)
+    assert len(fake.cache) == 0 and fake.cache.bytes == 0
+
+
+def test_cache_invalidated_while_fetching(fake_redis):
+    cache = UntrackedCache(fake_redis())
+
+    def execute(*args):
+        cache.invalidate(["doc"])
+        return "stale"
+
+    assert cache.execute(execute, ("JSON.GET", "doc"), {}) == "stale"
+    assert len(cache) == 0
+    assert cache._pending == {} and cache._index == {}
+
+
+def test_cache_eviction(fake_redis):
+    cache = UntrackedCache(fake_redis(), max_entries=2)
+    for key in ("a", "b", "a", "c"):
+        cache.execute(lambda *args: args[1], ("JSON.GET", key), {})
+    assert [args[1] for args, _ in cache._entries] == ["a", "c"]
+    assert cache.evictions == 1
+    assert set(cache._index) == {b"a", b"c"}
+
+    cache = UntrackedCache(fake_redis(), max_bytes=sizeof("x" * 100) * 2)
+    for key in ("a", "b", "c"):
+        cache.execute(lambda *args: "x" * 100, ("JSON.GET", key), {})
+    assert len(cache) == 2 and cache.bytes <= cache.max_bytes
+
+
+def test_cache_prefixes(fake_redis):
+    with pytest.raises(ValueError):
+        NearCache(fake_redis())
+
+    cache = UntrackedCache(fake_redis(), prefixes=["user:", b"doc"])
+    for key in ("user:1", "user:1", "doc", "other", "other"):
+        cache.execute(lambda *args: 1, ("JSON.GET", key), {})
+    cache.execute(lambda *args: [1], ("JSON.MGET", "doc", "other", "."), {})
+    assert [args[1] for args, _ in cache._entries] == ["user:1", "doc"]
+    assert cache.hits == 1
+
+
+def test_cache_ttl(fake_redis):
+    cache = UntrackedCache(fake_redis())
+    cache.execute(lambda *args: 1, ("FT.INFO", "idx"), {})
+    cache.execute(lambda *args: 1, ("FT.INFO", "idx"), {})
+    assert cache.hits == 0
+
+    cache = UntrackedCache(fake_redis(), ttl=0.01)
+    cache.execute(lambda *args: 1, ("FT.INFO", "idx"), {})
+    cache.execute(lambda *args: 1, ("FT.INFO", "idx"), {})
+    time.sleep(0.02)
+    cache.execute(lambda *args: 1, ("FT.INFO", "idx"), {})
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.integrations
+@pytest.mark.json
+def test_cache_tracking():
+    client = Client(Redis(), cache={"prefixes": ["doc"]})
+    client.json.set("doc", Path.rootPath(), {"a": 1})
+    assert client.json.get("doc") == {"a": 1}
+    assert client.json.get("doc") == {"a": 1}
+    assert client.cache.hits == 1
+
+    Client(Redis()).json.set("doc", Path.rootPath(), {"a": 2})
+    for _ in range(100):
+        if len(client.cache) == 0:
+            break
+        time.sleep(0.01)
+    assert client.json.get("doc") == {"a": 2}
+    client.cache.close()
@@ -1,4 +1,7 @@
+import json
+import pytest
 from redisplus import Client
+from redisplus.json.codec import StdlibCodec
 from redis import Redis
 from redis.client import Pipeline, bool_ok
 
@@ -27,6 +30,32 @@ def test_client_pipeline():
         bool_ok == p.execute()
 
 
+def test_client_features_are_cached():
+    c = Client()
+    assert c.json is c.json
+    assert c.ft is c.ft
+    assert c.feature("ft", index_name="other") is c.feature("ft", index_name="other")
+    assert c.feature("ft", index_name="other") is not c.ft
+    assert c.feature("ft", index_name="other").index_name == "other"
+
+
+def test_client_callbacks_not_installed():
+    c = Client()
+    callbacks = dict(c.client.response_callbacks)
+    c.tf, c.json
+    assert dict(c.client.response_callbacks) == callbacks
+
+
+@pytest.mark.json
+def test_client_features_decode_with_their_codec(fake_redis):
+    c = Client(fake_redis(b'{"a": 1}'))
+    tens = StdlibCodec(decoder=json.JSONDecoder(parse_int=lambda s: int(s) * 10))
+    a = c.feature("json", codec=tens)
+    assert c.json.get("doc") == {"a": 1}
+    assert a.get("doc") == {"a": 10}
+    assert c.json.get("doc") == {"a": 1}
+
+
 # TODO
 def test_integrated_pipeline():
     pass
@@ -0,0 +1,76 @@
+import json
+import pytest
+from redis.cluster import RedisCluster
+from redis.exceptions import RedisClusterException
+import redisplus.bf
+import redisplus.json
+import redisplus.ts
+
+
+class FakeClusterPipeline:
+    def __init__(self, cluster):
+        self.cluster = cluster
+        self.commands = []
+
+    def execute_command(self, *args, target_nodes=None):
+        self.commands.append((args, target_nodes))
+        return self
+
+    def execute(self):
+        self.cluster.pipelines.append(self.commands)
+        return [self.cluster.reply(args) for args, _ in self.commands]
+
+
+class FakeCluster(RedisCluster):
+    """Keys hash to the slot given by their first character."""
+
+    def __init__(self, reply):
+        self.cluster_response_callbacks = {}
+        self.pipelines = []
+        self.reply = reply
+
+    def keyslot(self, key):
+        return ord(key[0])
+
+    def get_node_from_key(self, key, replica=False):
+        return "node-" + key[0]
+
+    def pipeline(self, transaction=None, shard_hint=None):
+        return FakeClusterPipeline(self)
+
+
+@pytest.mark.json
+def test_json_mget_by_slot():
+    cluster = FakeCluster(lambda args: [json.dumps(k.upper()) for k in args[1:-1]])
+    rj = redisplus.json.JSON(cluster)
+    assert rj.mget(".", "a1", "b1", "a2", "c1") == ["A1", "B1", "A2", "C1"]
+
+    (commands,) = cluster.pipelines
+    assert sorted(commands) == [
+        (("JSON.MGET", "a1", "a2", "."), "node-a"),
+        (("JSON.MGET", "b1", "."), "node-b"),
+        (("JSON.MGET", "c1", "."), "node-c"),
+    ]
+
+
+@pytest.mark.timeseries
+def test_ts_madd_by_slot():
+    cluster = FakeCluster(lambda args: list(args[2::3]))
+    ts = redisplus.ts.TimeSeries(cluster)
+    assert ts.madd([("a", 1, 1.0), ("b", 2, 2.0), ("a", 3, 3.0)]) == [1, 2, 3]
+    assert len(cluster.pipelines[0]) == 2
+
+
+@pytest.mark.bloom
+def test_merge_requires_one_slot():
+    cms = redisplus.bf.CMSBloom(FakeCluster(None))
+    with pytest.raises(RedisClusterException):
+        cms.merge("a", 2, ["a1", "b1"])
+
+
+@pytest.mark.json
+def test_json_project_on_cluster():
+    cluster = FakeCluster(lambda args: json.dumps([args[1].upper()]))
+    rj = redisplus.json.JSON(cluster)
+    assert rj.project(["a1", "b1"], ["name"]) == [{"name": "A1"}, {"name": "B1"}]
+    assert [args[0] for args, _ in cluster.pipelines[0]] == ["JSON.GET"] * 2
@@ -32,3 +32,10 @@ def test_stringify_param_value():
     for param, expected in cases:
         observed = helpers.stringify_param_value(param)
         assert observed == expected
+
+
+def test_per_match():
+    parse = helpers.per_match(int)
+    assert parse(b"3") == 3
+    assert parse([b"3", None, 4]) == [3, None, 4]
+    assert parse(None) is None
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+import redisplus
+
+# the most time importing redisplus' own modules may take, redis aside
+IMPORT_BUDGET = 0.05
+
+
+def importtime(statement):
+    """Return {module: seconds spent importing it alone}, for `statement`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line.split(":", 1)[1].split("|")
+        modules[name.strip()] = int(self_us) / 1e6
+    return modules
+
+
+def test_import_is_lazy():
+    modules = importtime("import redisplus; redisplus.Client()")
+    for heavy in ("pkg_resources", "numpy", "deprecated", "redisplus.ai"):
+        assert heavy not in modules
+
+    spent = sum(t for name, t in modules.items() if name.startswith("redisplus"))
+    assert spent < IMPORT_BUDGET
+
+
+def test_ai_import_defers_numpy():
+    modules = importtime("import redisplus.ai")
+    assert "redisplus.ai" in modules
+    assert "numpy" not in modules
+    assert "deprecated" not in modules
+
+
+def test_version():
+    assert isinstance(redisplus.version(), str)
@@ -0,0 +1,112 @@
+import gc
+import weakref
+import pytest
+from redisplus import Client
+from redisplus.instrumentation import Histogram, Instrumentation, request_size
+
+
+def test_histogram_quantiles():
+    h = Histogram()
+    for value in range(1, 1001):
+        h.record(value / 1000.0)
+    assert h.count == 1000
+    assert h.quantile(0.5) == pytest.approx(0.5, rel=0.03)
+    assert h.quantile(0.99) == pytest.approx(0.99, rel=0.03)
+    assert Histogram().quantile(0.5) is None
+
+    h.record(0)
+    assert h.quantile(0) == 0.0
+
+
+def test_request_size():
+    assert request_size(("GET", "foo")) == len(b"*2\r\n$3\r\nGET\r\n$3\r\nfoo\r\n")
+    assert request_size(("INCRBY", b"k", 10)) == len(
+        b"*3\r\n$6\r\nINCRBY\r\n$1\r\nk\r\n$2\r\n10\r\n"
+    )
+
+
+@pytest.mark.json
+def test_instrumented_json(fake_redis):
+    instrumentation = Instrumentation()
+    client = Client(fake_redis(b'{"a": 1}'), instrumentation=instrumentation)
+    assert client.json.get("foo") == {"a": 1}
+    assert client.json.get("foo") == {"a": 1}
+
+    stages = instrumentation.percentiles("JSON.GET")
+    assert sorted(stages) == [
+        "build_seconds",
+        "parse_seconds",
+        "request_bytes",
+        "response_bytes",
+        "roundtrip_seconds",
+    ]
+    assert instrumentation.histograms["JSON.GET", "parse_seconds"].count == 2
+    assert stages["request_bytes"][0.5] == pytest.approx(
+        request_size(("JSON.GET", "foo", ".")), rel=0.03
+    )
+
+
+@pytest.mark.search
+def test_instrumented_search(fake_redis):
+    instrumentation = Instrumentation()
+    client = Client(
+        fake_redis([1, b"doc1", [b"f", b"v"]]), instrumentation=instrumentation
+    )
+    assert client.ft.search("hello").total == 1
+    assert instrumentation.histograms["FT.SEARCH", "parse_seconds"].count == 1
+    assert instrumentation.histograms["FT.SEARCH", "build_seconds"].count == 1
+
+
+@pytest.mark.json
+def test_instrumented_features_do_not_share_callbacks(fake_redis):
+    redis = fake_redis(b'{"a": 1}')
+    instrumentation = Instrumentation()
+    instrumented = Client(redis, instrumentation=instrumentation)
+    instrumented.json.get("foo")
+    assert "JSON.GET" not in redis.response_callbacks
+    assert instrumented.json.__client__ is redis
+
+    # a client sharing the connection records nothing
+    Client(redis).json.get("foo")
+    assert instrumentation.histograms["JSON.GET", "parse_seconds"].count == 1
+
+    # and building its features leaves the instrumented ones timed
+    instrumented.json.get("foo")
+    assert instrumentation.histograms["JSON.GET", "parse_seconds"].count == 2
+
+
+@pytest.mark.json
+def test_instrumented_pipeline_classes_are_shared(fake_redis):
+    first, second = Instrumentation(), Instrumentation()
+    piped = Client(fake_redis(), instrumentation=first).json.pipeline()
+    other = Client(fake_redis(), instrumentation=second).json.pipeline()
+    assert type(piped) is type(other)
+    del other
+
+    # the classes cached keep no instrumentation alive
+    collected = weakref.ref(second)
+    del second
+    gc.collect()
+    assert collected() is None
+
+
+def test_uninstrumented(fake_redis):
+    client = Client(fake_redis(b'"bar"'))
+    assert client.json.get("foo") == "bar"
+    assert client.json.instrumentation is None
+    assert "get" not in vars(client.json)
+
+
+@pytest.mark.json
+def test_prometheus(fake_redis):
+    instrumentation = Instrumentation()
+    client = Client(fake_redis(b"1"), instrumentation=instrumentation)
+    client.json.get("foo")
+
+    text = instrumentation.prometheus()
+    assert "# TYPE redisplus_command_roundtrip_seconds summary" in text
+    assert 'redisplus_command_parse_seconds{command="JSON.GET",quantile="0.99"}' in text
+    assert 'redisplus_command_request_bytes_count{command="JSON.GET"} 1' in text
+
+    instrumentation.reset()
+    assert instrumentation.prometheus() == "\n"
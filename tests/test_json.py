@@ -1,10 +1,24 @@
+import io
+import json
+import dataclasses
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
 import pytest
 import redis
 from redis import Redis
 import redisplus.json
 from redisplus import Client
-from redisplus.json.path import Path
+from redisplus.json.bulk import chunks, load_chunk, pairs
+from redisplus.json.codec import BATCH_BYTES, OrjsonCodec, StdlibCodec, decode_many
+from redisplus.json.projection import plan
+from redisplus.json.diff import diff
+from redisplus.json.memory import Throttle, key_prefix
+from redisplus.json.optimistic import UpdateStats
+from redisplus.json.path import Path, compile_path, parse
+from redisplus.json.schema import decode, loader
 from .conftest import skip_ifmodversion_lt
+from .test_pipeline import FakePool
 
 
 @pytest.fixture
@@ -15,6 +29,580 @@ def client():
     return rc
 
 
+@pytest.mark.json
+def test_stdlib_codec():
+    assert_codec(StdlibCodec())
+
+
+@pytest.mark.json
+def test_orjson_codec():
+    pytest.importorskip("orjson")
+    assert_codec(OrjsonCodec())
+
+
+def assert_codec(codec):
+    doc = {"a": [1, 2.5, None, True], "b": "\u00e9", 1: {"big": 2**70}}
+    expected = {"a": [1, 2.5, None, True], "b": "\u00e9", "1": {"big": 2**70}}
+    encoded = codec.encode(doc)
+    assert codec.decode(encoded) == expected
+    if isinstance(encoded, str):
+        encoded = encoded.encode()
+    assert codec.decode(encoded) == expected
+    with pytest.raises(ValueError):
+        codec.decode(b"{")
+
+
+@pytest.mark.json
+def test_codec_selection():
+    pytest.importorskip("orjson")
+    rc = Client(Redis())
+    assert rc.json.codec.name == "orjson"
+    assert rc.json._decode(b'{"a": 1}') == {"a": 1}
+
+    decoder = redisplus.json.json.JSONDecoder(parse_float=str)
+    custom = redisplus.json.JSON(Redis(), decoder=decoder)
+    assert custom.codec.name == "json"
+    assert custom._decode(b"1.5") == "1.5"
+
+
+@pytest.mark.json
+def test_decode_many():
+    codec = StdlibCodec()
+    assert decode_many(codec, [b"1", b'{"a": 2}']) == [1, {"a": 2}]
+    assert decode_many(codec, ["[1]", b"null"]) == [[1], None]
+    big = json.dumps("x" * BATCH_BYTES * 2)
+    assert decode_many(codec, [big, big]) == [json.loads(big)] * 2
+
+
+@pytest.mark.json
+@pytest.mark.parametrize(
+    "path, steps",
+    [
+        (".", ()),
+        ("a.b[0]", (".a", ".b", "[0]")),
+        ("$..x[\"a b\", 'c']", ("..x", "[\"a b\", 'c']")),
+        ("$.a[*][1:-1:2][0,2]", (".a", "[*]", "[1:-1:2]", "[0,2]")),
+        ('$.a[?(@.x > 1 && @.s == "])")]', (".a", '[?(@.x > 1 && @.s == "])")]')),
+    ],
+)
+def test_path_parse(path, steps):
+    assert parse(path) == steps
+    assert Path(path).multi is path.startswith("$")
+
+
+@pytest.mark.json
+@pytest.mark.parametrize("path", ["", "$.", "a..", "$..", "$.a[", "$.a[]", "$[?(@.x]"])
+def test_path_invalid(path):
+    with pytest.raises(ValueError):
+        Path(path)
+
+
+@pytest.mark.json
+def test_compile_path():
+    assert compile_path("a.b") is compile_path("a.b")
+    assert compile_path("a.b").jsonpath == "$.a.b"
+    assert compile_path("[0]").jsonpath == "$[0]"
+    path = Path("$.x")
+    assert compile_path(path) is path
+
+
+def match_reply(args):
+    if args[2].startswith("$"):
+        return {"JSON.OBJKEYS": [[b"a"], None], "JSON.TOGGLE": [1, None]}.get(
+            args[0], [2, None]
+        )
+    return {"JSON.OBJKEYS": [b"a"], "JSON.TOGGLE": b"true"}.get(args[0], 2)
+
+
+@pytest.mark.json
+def test_jsonpath_replies():
+    fake = Client(Redis(connection_pool=FakePool(match_reply)))
+    pipe = fake.pipeline(transaction=False)
+    for path in (".x", "$..x"):
+        pipe.json.arrlen("doc", path)
+        pipe.json.objkeys("doc", path)
+        pipe.json.toggle("doc", path)
+    assert pipe.execute() == [2, ["a"], True, [2, None], [["a"], None], [True, None]]
+    with pytest.raises(ValueError):
+        pipe.json.arrlen("doc", "$.x[")
+    assert pipe.command_stack == []
+
+
+@pytest.mark.json
+def test_diff():
+    unchanged = {"field{}".format(i): i for i in range(10)}
+    old = {
+        **unchanged,
+        "name": "doc",
+        "views": 1,
+        "tags": ["a"],
+        "gone": True,
+        "meta": {"x y": 1.5, "flag": True},
+        "items": [1, 2, 3],
+    }
+    new = {
+        **unchanged,
+        "name": "document",
+        "views": 3,
+        "tags": ["a", "b", "c"],
+        "meta": {"x y": 2.5, "flag": True},
+        "items": [1, 5, 3],
+        "added": {"k": None},
+    }
+    assert diff(old, new) == [
+        ("delete", (".gone",)),
+        ("strappend", ("ument", ".name")),
+        ("numincrby", (".views", 2)),
+        ("arrappend", (".tags", "b", "c")),
+        ("set", ('.meta["x y"]', 2.5)),
+        ("numincrby", (".items[1]", 3)),
+        ("set", (".added", {"k": None})),
+    ]
+    assert diff(old, old) == []
+    assert diff([1, 2], [3, 4]) == [("set", (".", [3, 4]))]
+    assert diff({"a": 1}, {"a": True}, Path("doc")) == [("set", ("doc.a", True))]
+    assert diff([["a"]], [["b"]]) == [("set", ("[0][0]", "b"))]
+    assert diff([1], [True, 2]) == [("set", (".", [True, 2]))]
+    # keys of dictionaries are strings once encoded, even integers
+    assert diff({1: "a"}, {1: "b"}) == [("set", ('["1"]', "b"))]
+    assert diff({"a": [{2: 0}]}, {"a": [{2: 1}]}) == [("numincrby", ('.a[0]["2"]', 1))]
+
+
+@pytest.mark.integrations
+@pytest.mark.json
+def test_patch(client):
+    old = {"name": "doc", "views": 1, "tags": ["a"], "meta": {"a": 1, "b": 2}}
+    new = {"name": "docs", "views": 2, "tags": ["a", "b"], "meta": {"a": 1}}
+    client.json.set("doc", Path.rootPath(), old)
+    assert client.json.patch("doc", old, old) == []
+    assert len(client.json.patch("doc", old, new)) == 4
+    assert client.json.get("doc") == new
+
+
+@pytest.mark.json
+def test_bulk_pairs():
+    codec = StdlibCodec()
+    assert list(pairs({"a": 1}, None, codec)) == [("a", 1)]
+    assert list(pairs([("a", 1)], None, codec)) == [("a", 1)]
+    assert list(pairs([{"id": "a"}], "id", codec)) == [("a", {"id": "a"})]
+    ndjson = io.BytesIO(b'{"id": "a"}\n\n{"id": "b", "v": 1}\n')
+    assert list(pairs(ndjson, lambda doc: doc["id"], codec)) == [
+        ("a", b'{"id": "a"}'),
+        ("b", b'{"id": "b", "v": 1}'),
+    ]
+    lines = ['{"id": 1}\n', b'{"id": 2}']
+    assert list(pairs(lines, "id", codec)) == [(1, b'{"id": 1}'), (2, b'{"id": 2}')]
+    assert list(pairs(iter(lines), "id", codec))[1] == (2, b'{"id": 2}')
+    assert list(pairs([], "id", codec)) == []
+    with pytest.raises(ValueError):
+        list(pairs(io.StringIO("{}"), None, codec))
+    assert list(chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+@pytest.mark.json
+def test_bulk_failures_per_document():
+    codec = StdlibCodec()
+    docs = pairs([{"id": "a"}, {"name": "b"}, {"id": "c", "tags": {1}}], "id", codec)
+    pool = FakePool(lambda args: b"OK")
+    docs, size, skipped, failures = load_chunk(
+        Redis(connection_pool=pool), codec, ".", (), list(docs)
+    )
+    assert (docs, skipped) == (3, 0)
+    assert isinstance(failures.pop(1), KeyError)
+    assert isinstance(failures.pop("c"), TypeError)
+    assert failures == {}
+    assert [args[1] for args in pool.connection.sent] == ["a"]
+
+    ndjson = io.BytesIO(b'{"id": "a"}\n{"id": \n')
+    assert [k for k, _ in pairs(ndjson, "id", codec)] == ["a", 1]
+
+
+@pytest.mark.integrations
+@pytest.mark.json
+def test_bulk_set(client):
+    docs = {"doc:{}".format(i): {"i": i} for i in range(250)}
+    report = client.json.bulk_set(docs, chunk_size=100, workers=2)
+    assert (report.docs, report.failures) == (250, {})
+    assert report.docs_per_sec > 0
+    assert client.json.get("doc:249") == {"i": 249}
+
+    client.set("notjson", 1)
+    report = client.json.bulk_set({"notjson": {}, "doc:250": {}})
+    assert list(report.failures) == ["notjson"]
+    assert client.json.get("doc:250") == {}
+    assert client.json.bulk_set(docs, nx=True).skipped == 250
+
+
+class ArrayRedis(Redis):
+    """Holds the array `items`, answering JSON.ARRLEN and sliced JSON.GET."""
+
+    def __init__(self, items, matches=1):
+        super().__init__()
+        self.items = items
+        self.matches = matches
+        self.sent = []
+
+    def execute_command(self, *args, **options):
+        self.sent.append(args)
+        if args[0] == "JSON.ARRLEN":
+            if args[2].startswith("$"):
+                return [len(self.items)] * self.matches
+            return len(self.items)
+        start, stop = map(int, args[2].split("[")[-1].rstrip("]").split(":"))
+        reply = json.dumps(self.items[start:stop])
+        callback = self.response_callbacks.get(args[0])
+        return reply if callback is None else callback(reply, **options)
+
+
+@pytest.mark.json
+def test_iter_array():
+    fake = Client(ArrayRedis(list(range(5))))
+    assert list(fake.json.iter_array("arr", Path("a.b"), window=2)) == [0, 1, 2, 3, 4]
+    assert [args[2] for args in fake.client.sent] == [
+        "a.b",
+        "$.a.b[0:2]",
+        "$.a.b[2:4]",
+        "$.a.b[4:6]",
+    ]
+    assert list(Client(ArrayRedis([])).json.iter_array("arr")) == []
+
+    fake = Client(ArrayRedis(list(range(3))))
+    assert list(fake.json.iter_array("arr", "$.a", window=2)) == [0, 1, 2]
+    assert [args[2] for args in fake.client.sent[1:]] == ["$.a[0:2]", "$.a[2:4]"]
+    with pytest.raises(ValueError):
+        list(Client(ArrayRedis([1], matches=2)).json.iter_array("arr", "$..a"))
+
+
+@pytest.mark.integrations
+@pytest.mark.json
+def test_iter_array_server(client):
+    client.json.set("arr", Path.rootPath(), {"a": list(range(25))})
+    assert list(client.json.iter_array("arr", Path("a"), window=10)) == list(range(25))
+
+
+DOCS = {"a": {"x": 1, "y": {"z": 2}}, "b": {"x": 3}}
+
+
+def matches(doc, path):
+    """Evaluate the JSONPath `path` ($ and fields only) on `doc`."""
+    for field in path.split(".")[1:]:
+        if not isinstance(doc, dict) or field not in doc:
+            return []
+        doc = doc[field]
+    return [doc]
+
+
+def json_reply(args):
+    if args[0] == "JSON.MGET":
+        keys, path = args[1:-1], args[-1]
+        return [json.dumps(matches(DOCS[k], path)) if k in DOCS else None for k in keys]
+    key, paths = args[1], args[2:]
+    if key not in DOCS:
+        return None
+    if len(paths) == 1:
+        return json.dumps(matches(DOCS[key], paths[0]))
+    return json.dumps({p: matches(DOCS[key], p) for p in paths})
+
+
+@pytest.mark.json
+def test_projection_plan():
+    keys = ["doc:{}".format(i) for i in range(500)]
+    assert plan(keys, [".a", ".b", ".c", ".d", ".e"]) == "mget"
+    assert plan(keys[:2], [".field{}".format(i) for i in range(50)]) == "get"
+    assert plan(keys, [".a"], cluster=True) == "get"
+
+
+@pytest.mark.json
+@pytest.mark.parametrize("keys", [["a", "b", "missing"], ["a"] * 200])
+def test_project(keys):
+    fake = Client(Redis(connection_pool=FakePool(json_reply)))
+    rows = fake.json.project(keys, ["x", Path("y.z"), "$.x"])
+    sent = fake.client.connection_pool.connection.sent
+    assert {args[0] for args in sent} == {"JSON.GET" if len(keys) == 3 else "JSON.MGET"}
+    assert rows[0] == {"x": 1, "y.z": 2, "$.x": [1]}
+    if len(keys) == 3:
+        assert rows[1:] == [{"x": 3, "y.z": None, "$.x": [3]}, None]
+        assert fake.json.project(keys, [".x"], columnar=True) == {".x": [1, 3, None]}
+
+
+@pytest.mark.json
+def test_project_decodes_with_feature_codec():
+    fake = Client(Redis(connection_pool=FakePool(json_reply)))
+    tens = StdlibCodec(decoder=json.JSONDecoder(parse_int=lambda s: int(s) * 10))
+    feature = fake.feature("json", codec=tens)
+    # another JSON feature, sharing the connection
+    assert fake.json is not feature
+    assert feature.project(["a", "b"], ["x"]) == [{"x": 10}, {"x": 30}]
+    assert feature.project(["a"] * 200, ["x"])[0] == {"x": 10}
+
+
+@pytest.mark.integrations
+@pytest.mark.json
+def test_project_server(client):
+    for key, doc in DOCS.items():
+        client.json.set(key, Path.rootPath(), doc)
+    assert client.json.project(["a", "b", "c"], ["x", "y.z"]) == [
+        {"x": 1, "y.z": 2},
+        {"x": 3, "y.z": None},
+        None,
+    ]
+
+
+@dataclass
+class Address:
+    city: str
+    zip: Optional[str] = None
+
+
+@dataclass
+class User:
+    name: str
+    addresses: List[Address] = dataclasses.field(default_factory=list)
+
+
+class Point:
+    __slots__ = ("x", "y")
+    x: int
+    y: int
+
+
+class Named(dict):
+    name: str
+
+
+USER = {"name": "ann", "age": 7, "addresses": [{"city": "Paris"}]}
+
+
+@pytest.mark.json
+def test_schema_loader():
+    assert loader(User)(USER) == User("ann", [Address("Paris")])
+    assert loader(List[User])([USER, None]) == [User("ann", [Address("Paris")]), None]
+    point = loader(Point)({"x": 1, "z": 3})
+    assert (point.x, point.y) == (1, None)
+    assert not hasattr(point, "__dict__")
+    assert loader(Named)(USER) == {"name": "ann"}
+    assert loader(int)(1) == 1
+    assert loader(User) is loader(User)
+
+
+def user_reply(args):
+    if args[0] == "JSON.MGET":
+        return [json.dumps(USER) if k == "user" else None for k in args[1:-1]]
+    return json.dumps(USER)
+
+
+@pytest.mark.json
+def test_get_schema():
+    fake = Client(Redis(connection_pool=FakePool(user_reply)))
+    user = User("ann", [Address("Paris")])
+    pipe = fake.pipeline(transaction=False)
+    pipe.json.get("user", schema=User)
+    pipe.json.get("user")
+    pipe.json.mget(".", "user", "missing", schema=User)
+    assert pipe.execute() == [user, USER, [user, None]]
+
+
+@pytest.mark.json
+def test_schema_from_pairs():
+    codec = StdlibCodec()
+    assert codec.decode_pairs('{"a": {"b": [{}]}}') == (("a", (("b", [()]),)),)
+    user = User("ann", [Address("Paris")])
+    assert decode(codec, json.dumps(USER).encode(), User) == user
+    point = decode(codec, '{"x": 1, "z": 3}', Point)
+    assert (point.x, point.y) == (1, None)
+    assert decode(codec, json.dumps(USER), Named) == {"name": "ann"}
+    assert decode(codec, '{"a": {"b": {}}}', Dict[str, dict]) == {"a": {"b": {}}}
+    assert decode(codec, '{"a": 1}', Dict[str, int]) == {"a": 1}
+
+    # a decoder with hooks of its own decodes dictionaries
+    hooked = StdlibCodec(decoder=json.JSONDecoder(object_hook=dict))
+    assert hooked.pairs_decoder is None
+    assert decode(hooked, json.dumps(USER), User) == user
+
+    feature = redisplus.json.JSON(
+        Redis(connection_pool=FakePool(user_reply)), codec=codec
+    )
+    assert feature._decode(json.dumps(USER), schema=User) == user
+    pipe = feature.pipeline(transaction=False)
+    pipe.get("user", schema=User)
+    pipe.get("user")
+    pipe.mget(".", "user", "missing", schema=User)
+    assert pipe.execute() == [user, USER, [user, None]]
+
+
+MEMORY_DOCS = {
+    "user:1": {"name": "ann", "bio": "x" * 100},
+    "user:2": {"name": "bob", "bio": "y"},
+    "order:1": [1, 2],
+}
+
+
+def memory_reply(args):
+    doc = MEMORY_DOCS.get(args[-2])
+    if args[0] == "JSON.OBJKEYS":
+        if not isinstance(doc, dict):
+            return redis.ResponseError("WRONGTYPE")
+        return [k.encode() for k in doc]
+    if doc is None:
+        return None
+    path = args[-1]
+    return len(json.dumps(doc if path == "." else doc[path[1:]]))
+
+
+class ScanRedis(Redis):
+    """Scans the keys of MEMORY_DOCS, and a key since deleted."""
+
+    def scan_iter(self, match=None, count=None, _type=None, **kwargs):
+        assert _type == "ReJSON-RL"
+        return iter(list(MEMORY_DOCS) + ["user:gone"])
+
+
+@pytest.mark.json
+@pytest.mark.parametrize("workers", [1, 2])
+def test_profile_memory(workers):
+    fake = Client(ScanRedis(connection_pool=FakePool(memory_reply)))
+    report = fake.json.profile_memory(batch_size=2, workers=workers)
+    assert (report.keys, report.sampled) == (4, 3)
+    assert report.bytes == sum(len(json.dumps(d)) for d in MEMORY_DOCS.values())
+    (prefix, keys, size), order = report.top(2)
+    assert (prefix, keys, order[0]) == ("user", 2, "order")
+    assert report.top(1, paths=True)[0][0] == ("user", ".")
+    assert report.top(2, paths=True)[1][0] == ("user", ".bio")
+
+    sampled = fake.json.profile_memory(sample=2, subpaths=False)
+    assert (sampled.keys, sampled.sampled, sampled.paths.keys()) == (
+        4,
+        2,
+        {("user", "."), ("order", ".")},
+    )
+
+
+@pytest.mark.json
+def test_memory_helpers():
+    assert key_prefix(b"app:user:1") == "app:user"
+    assert key_prefix("plain") == "plain"
+    throttle = Throttle(rate=1000)
+    throttle.wait(10)
+    throttle.wait(10)
+    assert throttle._next > throttle.interval * 20
+
+
+class WatchedPipeline:
+    """Reads the document `doc`, its transactions aborted `conflicts`
+    times, as if changed concurrently, and records the commands sent."""
+
+    def __init__(self, doc, conflicts, sent):
+        self.doc, self.conflicts, self.sent = doc, conflicts, sent
+        self.queued = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def watch(self, name):
+        pass
+
+    def get(self, name, *paths):
+        values = {p: self.doc[p.lstrip(".")] for p in paths}
+        return values if len(paths) > 1 else values[paths[0]]
+
+    def multi(self):
+        pass
+
+    def __getattr__(self, method):
+        return lambda *args: self.queued.append((method,) + args)
+
+    def execute(self):
+        if self.conflicts:
+            self.conflicts.pop()
+            raise redis.WatchError("changed")
+        self.sent.extend(self.queued)
+
+
+@pytest.mark.json
+def test_update():
+    fake = Client(Redis()).json
+    doc = {"n": 1, "tags": ["a"], "big": "x" * 10}
+    conflicts, sent = [1, 1], []
+    fake.pipeline = lambda: WatchedPipeline(doc, conflicts, sent)
+
+    def bump(value):
+        value[".n"] += 1
+        value[".tags"].append("b")
+
+    assert fake.update("doc", bump, paths=[".n", ".tags"], backoff=0) == {
+        ".n": 2,
+        ".tags": ["a", "b"],
+    }
+    assert sent == [("numincrby", "doc", ".n", 1), ("arrappend", "doc", ".tags", "b")]
+    assert doc["n"] == 1
+    assert (fake.update_stats.updates, fake.update_stats.retries) == (1, 2)
+
+    conflicts.extend([1, 1])
+    with pytest.raises(redis.WatchError):
+        fake.update("doc", lambda n: n + 1, paths=".n", retries=1, backoff=0)
+    assert fake.update_stats.hot_keys() == [("doc", 4)]
+    assert fake.update_stats.failures == 1
+    with pytest.raises(ValueError):
+        fake.update("doc", bump, paths="$.n")
+
+
+@pytest.mark.json
+def test_update_stats():
+    stats = UpdateStats()
+    stats.record("a", 0, committed=True)
+    stats.record("b", 3, committed=False)
+    assert (stats.updates, stats.conflicts, stats.retries) == (1, 3, 2)
+    assert stats.hot_keys(1) == [("b", 3)]
+
+
+@pytest.mark.integrations
+@pytest.mark.json
+def test_update_server(client):
+    client.json.set("doc", Path.rootPath(), {"n": 1, "s": "a"})
+    client.json.update("doc", lambda doc: dict(doc, n=2))
+    assert client.json.update("doc", lambda s: s + "b", paths="s") == "ab"
+    assert client.json.get("doc") == {"n": 2, "s": "ab"}
+
+
+def pipeline_reply(args):
+    if args[0] == "JSON.SET":
+        return b"OK"
+    return user_reply(args)
+
+
+@pytest.mark.json
+def test_pipeline_codec():
+    r = Redis(connection_pool=FakePool(pipeline_reply))
+    plain = redisplus.json.JSON(r)
+    tagged = redisplus.json.JSON(
+        r, decoder=json.JSONDecoder(object_hook=lambda d: ("tagged", d))
+    )
+    assert plain.pipeline().transaction is True
+    pipe = plain.pipeline(transaction=False)
+    assert pipe.transaction is False
+    pipe.get("user").get("user", schema=User).set("user", ".", 1)
+    pipe.mget(".", "user", "missing")
+    user = User("ann", [Address("Paris")])
+    assert pipe.execute() == [USER, user, True, [USER, None]]
+    assert tagged.pipeline(transaction=False).get("user").execute()[0][0] == "tagged"
+
+
+@pytest.mark.json
+def test_codec_per_feature(fake_redis):
+    r = fake_redis(user_reply)
+    plain = redisplus.json.JSON(r)
+    tagged = redisplus.json.JSON(
+        r, decoder=json.JSONDecoder(object_hook=lambda d: ("tagged", d))
+    )
+    assert tagged.get("user")[0] == "tagged"
+    assert plain.get("user") == USER
+    assert plain.mget(".", "user", "missing") == [USER, None]
+    assert tagged.mget(".", "user")[0][0] == "tagged"
+
+
 @pytest.mark.integrations
 @pytest.mark.json
 def test_json_setbinarykey(client):
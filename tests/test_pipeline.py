@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+from redis import Redis
+from redis.retry import Retry
+from redis.backoff import NoBackoff
+from redisplus import Client
+from redisplus.json.path import Path
+from redisplus.pipeline import Pipeline
+
+
+class FakeConnection:
+    """Replies to the commands sent with `reply(args)`, raising the replies
+    that are errors."""
+
+    host, port, db = "localhost", 6379, 0
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.retry = Retry(NoBackoff(), 0)
+        self.sent = []
+        self.replies = []
+
+    def pack_commands(self, commands):
+        return list(commands)
+
+    def send_packed_command(self, commands, check_health=True):
+        self.sent.extend(commands)
+        self.replies.extend(self.reply(args) for args in commands)
+
+    def read_response(self, **kwargs):
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+class FakePool:
+    def __init__(self, reply):
+        self.connection = FakeConnection(reply)
+        self.connection_kwargs = {}
+
+    def get_connection(self, *args, **kwargs):
+        return self.connection
+
+    def release(self, connection):
+        pass
+
+    def get_encoder(self):
+        return None
+
+
+def reply(args):
+    if args[0] == "JSON.GET":
+        return b'{"views": 1}'
+    if args[0] == "AI.TENSORGET":
+        return [b"dtype", b"INT64", b"shape", [2], b"values", [1, 2]]
+    if args[0] == "FT.SEARCH":
+        return [1, b"doc1", [b"title", b"hello"]]
+    return b"OK"
+
+
+@pytest.fixture
+def fake():
+    return Client(Redis(connection_pool=FakePool(reply)))
+
+
+@pytest.mark.pipeline
+def test_pipeline_parses_each_module(fake):
+    pipe = fake.pipeline(transaction=False)
+    assert isinstance(pipe, Pipeline)
+    pipe.json.get("doc")
+    pipe.set("native", 1)
+    pipe.ai.tensorget("tensor", as_numpy=False)
+    pipe.ft.search("hello")
+    pipe.tf.add("doc:views", 1, 1)
+    doc, native, tensor, result, added = pipe.execute()
+
+    assert doc == {"views": 1}
+    assert native is True
+    assert tensor["values"] == [1, 2]
+    assert result.total == 1 and result.docs[0].title == "hello"
+    assert added == b"OK"
+    assert [args[0] for args in fake.client.connection_pool.connection.sent] == [
+        "JSON.GET",
+        "SET",
+        "AI.TENSORGET",
+        "FT.SEARCH",
+        "TS.ADD",
+    ]
+    assert pipe.postprocessors == []
+
+
+@pytest.mark.pipeline
+def test_pipeline_classes_are_cached(fake):
+    assert type(fake.pipeline()) is type(fake.pipeline())
+    assert type(fake.pipeline().json) is type(fake.pipeline().json)
+    assert type(fake.json.pipeline()) is type(fake.json.pipeline())
+    assert type(fake.ai.pipeline()) is not type(fake.json.pipeline())
+
+
+@pytest.mark.pipeline
+def test_feature_pipeline_reads_feature_state(fake):
+    pipe = fake.feature("ft", index_name="other").pipeline()
+    pipe.search("hello")
+    assert pipe.command_stack[0][0][:2] == ("FT.SEARCH", "other")
+    assert len(pipe.postprocessors) == 1
+
+
+@pytest.mark.integrations
+@pytest.mark.pipeline
+@pytest.mark.json
+@pytest.mark.timeseries
+@pytest.mark.bloom
+def test_multi_module_pipeline():
+    client = Client(Redis())
+    client.flushdb()
+
+    pipe = client.pipeline()
+    pipe.json.set("doc", Path.rootPath(), {"views": 1})
+    pipe.json.numincrby("doc", Path("views"), 1)
+    pipe.bf.create("doc:seen", 0.01, 1000)
+    pipe.bf.add("doc:seen", "user1")
+    pipe.tf.add("doc:views", 1, 2)
+    pipe.json.get("doc")
+    assert pipe.execute() == [True, 2, True, 1, 1, {"views": 2}]
+
+
+@pytest.mark.integrations
+@pytest.mark.pipeline
+@pytest.mark.ai
+def test_multi_module_pipeline_ai():
+    client = Client(Redis())
+    client.flushdb()
+
+    pipe = client.pipeline(transaction=False)
+    pipe.ai.tensorset("a", np.array([1, 2], dtype=np.int64))
+    pipe.json.set("doc", Path.rootPath(), {"tensor": "a"})
+    pipe.ai.tensorget("a", meta_only=True)
+    pipe.ai.tensorget("a")
+    ok, stored, meta, tensor = pipe.execute()
+    assert (ok, stored) == ("OK", True)
+    assert meta["shape"] == [2]
+    assert (tensor == np.array([1, 2])).all()
@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+import redis.asyncio
+from redisplus import Client
+from redisplus.asyncio import Client as AsyncClient
+from redisplus.json.path import Path
+from redisplus.replicas import ReplicaRouter
+
+
+def test_routes_reads_only(fake_redis):
+    router = ReplicaRouter(fake_redis(), [fake_redis()])
+    assert router.routes(("JSON.GET", "doc"))
+    assert router.routes((b"ts.mrange", 0, 1))
+    assert router.routes(("GRAPH.RO_QUERY", "g", "MATCH (n) RETURN n"))
+    assert not router.routes(("JSON.SET", "doc", ".", "1"))
+    assert not router.routes(("GRAPH.QUERY", "g", "MATCH (n) RETURN n"))
+    assert not router.routes(("FT.AGGREGATE", "idx", "*", "WITHCURSOR"))
+
+    with pytest.raises(ValueError):
+        ReplicaRouter(fake_redis(), [])
+    with pytest.raises(ValueError):
+        ReplicaRouter(fake_redis(), [fake_redis()], strategy="random")
+
+
+@pytest.mark.json
+def test_reads_go_to_replicas(fake_redis):
+    primary, replicas = fake_redis(), [fake_redis(), fake_redis()]
+    client = Client(primary, replicas=replicas)
+    for _ in range(4):
+        assert client.json.get("doc") == {"a": 1}
+    assert client.json.set("doc", Path.rootPath(), {"a": 1})
+
+    assert [args[0] for args in primary.sent] == ["JSON.SET"]
+    assert [[args[0] for args in r.sent] for r in replicas] == [["JSON.GET"] * 2] * 2
+
+    pipe = client.pipeline()
+    assert pipe.json.get("doc") is pipe
+
+
+def test_least_outstanding(fake_redis):
+    router = ReplicaRouter(
+        fake_redis(), [fake_redis(), fake_redis()], "least_outstanding"
+    )
+    router.outstanding[0] = 1
+    assert {router._choose() for _ in range(4)} == {1}
+    router.outstanding[0] = 0
+    assert {router._choose() for _ in range(4)} == {0, 1}
+
+
+@pytest.mark.json
+def test_fallback_to_primary(fake_redis):
+    primary = fake_redis()
+    client = Client(primary, replicas=[fake_redis(down=True)])
+    assert client.json.get("doc") == {"a": 1}
+    assert [args[0] for args in primary.sent] == ["JSON.GET"]
+    assert client.router.fallbacks == 1
+    assert client.router.outstanding == [0]
+
+
+@pytest.mark.json
+def test_async_reads_go_to_replicas():
+    class AsyncFakeRedis(redis.asyncio.Redis):
+        def __init__(self):
+            super().__init__()
+            self.sent = []
+
+        async def execute_command(self, *args, **options):
+            self.sent.append(args[0])
+            callback = self.response_callbacks.get(args[0])
+            if callback is None:
+                return b'{"a": 1}'
+            return callback(b'{"a": 1}', **options)
+
+    primary, replica = AsyncFakeRedis(), AsyncFakeRedis()
+    client = AsyncClient(primary, replicas=[replica], routing="least_outstanding")
+    assert asyncio.run(client.json.get("doc")) == {"a": 1}
+    assert (primary.sent, replica.sent) == ([], ["JSON.GET"])